@@ -1,8 +1,22 @@
-from flask import Flask, request, jsonify, render_template, session, redirect, url_for
+from flask import Flask, request, jsonify, render_template, make_response, send_file, session, redirect, url_for, g
 from flask_cors import CORS
-from database import Database
+from werkzeug.middleware.proxy_fix import ProxyFix
+import click
+from markupsafe import Markup, escape
+from database import Database, BookingConflict, SlotFull
+from cache import LRUCache
+from session_store import SessionStore
+from rate_limit import RateLimiter
+from file_store import FileStore, UploadTooLarge, MAX_UPLOAD_SIZE
+from assignment import run_assignment
+import jobs
+import assets
 import hashlib
+import io
+import os
 from datetime import datetime
+from functools import wraps
+from urllib.parse import unquote_to_bytes, urlsplit
 
 app = Flask(__name__)
 app.secret_key = 'your-super-secret-key-change-this-in-production'
@@ -10,37 +24,148 @@ app.secret_key = 'your-super-secret-key-change-this-in-production'
 # Enable CORS
 CORS(app)
 
-# Initialize database
-db = Database()
+# Hashed static URLs, precompressed assets and response compression
+assets.init_app(app)
+
+# Behind a reverse proxy, take the client address from X-Forwarded-For.
+# TRUSTED_PROXIES is the number of proxies in front of the app; headers are
+# ignored unless it is set, so clients cannot spoof their address.
+TRUSTED_PROXIES = int(os.environ.get('TRUSTED_PROXIES', 0))
+if TRUSTED_PROXIES:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXIES, x_proto=TRUSTED_PROXIES)
+
+# Initialize database (DATABASE_PATH overrides the file, e.g. ':memory:' in
+# tests). Heavy reporting reads go to a snapshot refreshed by the job pool
+# (see jobs.py) or on demand, and back to the live database once the
+# snapshot has missed a refresh.
+SNAPSHOT_PATH = 'analytics.db'
+SNAPSHOT_MAX_AGE = 2 * (int(os.environ.get('SNAPSHOT_INTERVAL', 0)) or jobs.SNAPSHOT_INTERVAL)
+db = Database(os.environ.get('DATABASE_PATH', 'database.db'), snapshot_path=SNAPSHOT_PATH,
+              snapshot_max_age=SNAPSHOT_MAX_AGE)
+
+# Content-addressed storage for uploaded reports and forms
+file_store = FileStore()
+
+# Server-side sessions; the signed cookie only carries the session token
+session_store = SessionStore(db)
+
+SUPERVISOR_ROLES = ('school_supervisor', 'university_supervisor', 'industry_supervisor')
+ADMIN_ROLES = ('admin', 'coordinator')
+USER_ROLES = ('student',) + SUPERVISOR_ROLES + ADMIN_ROLES
+
+def get_session_token():
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header.startswith('Bearer '):
+        return auth_header[len('Bearer '):]
+    return session.get('session_token')
+
+def get_current_session():
+    if 'current_session' not in g:
+        g.current_session = session_store.get(get_session_token())
+    return g.current_session
+
+def login_required(*roles):
+    """Resolve the current user into g.user, optionally restricted to roles"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            current = get_current_session()
+            if current is None:
+                return jsonify({'error': 'Authentication required'}), 401
+            if roles and current['user']['role'] not in roles:
+                return jsonify({'error': 'Access denied'}), 403
+            g.user = current['user']
+            return view(*args, **kwargs)
+        return wrapped
+    return decorator
+
+# Per-endpoint, per-role token buckets shared across workers
+rate_limiter = RateLimiter()
+
+@app.before_request
+def apply_rate_limit():
+    if request.endpoint is None:
+        return None
+    
+    current = get_current_session()
+    if current:
+        role, identity = current['user']['role'], f"user:{current['user']['id']}"
+    else:
+        role, identity = None, f'ip:{request.remote_addr}'
+    
+    checks = [(request.endpoint, identity)]
+    if request.endpoint == 'login':
+        # Failed logins count against the account being tried from this
+        # address, so users sharing an address do not lock each other out,
+        # plus a looser per-address bucket against guessing across accounts
+        email = (request.get_json(silent=True) or {}).get('email')
+        if isinstance(email, str):
+            checks = [('login', f'{identity}:email:{email.strip().lower()}'), ('login_address', identity)]
+    
+    retry_after = None
+    for endpoint, key in checks:
+        retry_after = rate_limiter.check(endpoint, role, key)
+        if retry_after:
+            break
+    if retry_after:
+        response = jsonify({'error': 'Too many requests, please retry later'})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(retry_after)
+        return response
+    return None
 
 # Frontend Routes
+# Pages without per-request data are rendered once per worker and served
+# with an ETag, so repeat hits skip Jinja entirely
+page_cache = LRUCache(max_entries=64)
+
+def precompile_templates():
+    """Compile every template up front so no request pays for parsing"""
+    for name in app.jinja_env.list_templates():
+        if name.endswith('.html'):
+            app.jinja_env.get_template(name)
+
+def render_static_page(template_name):
+    cache_key = (template_name, request.script_root)
+    cached = page_cache.get(cache_key)
+    if cached is None:
+        html = render_template(template_name)
+        cached = (html, hashlib.sha256(html.encode()).hexdigest()[:32])
+        page_cache.set(cache_key, cached)
+    
+    html, etag = cached
+    response = make_response(html)
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
 @app.route('/')
 def login_page():
-    return render_template('login.html')
+    return render_static_page('login.html')
 
 @app.route('/login')
 def login_page_alt():
-    return render_template('login.html')
+    return render_static_page('login.html')
 
 @app.route('/register')
 def register_page():
-    return render_template('register.html')
+    return render_static_page('register.html')
 
 @app.route('/student')
 def student_dashboard():
-    return render_template('dashboard.html')
+    return render_static_page('dashboard.html')
 
 @app.route('/supervisor')
 def university_supervisor_dashboard():
-    return render_template('dashboard.html')
+    return render_static_page('dashboard.html')
 
 @app.route('/industry')
 def industrial_supervisor_dashboard():
-    return render_template('dashboard.html')
+    return render_static_page('dashboard.html')
 
 @app.route('/admin')
 def coordinator_dashboard():
-    return render_template('dashboard.html')
+    return render_static_page('dashboard.html')
 
 # API Routes
 @app.route('/api/register', methods=['POST'])
@@ -55,6 +180,15 @@ def register():
         if not all([name, email, password, role]):
             return jsonify({'error': 'All fields are required'}), 400
         
+        if role not in USER_ROLES:
+            return jsonify({'error': 'Unknown role'}), 400
+        
+        # Admin accounts can only be created by a logged-in admin
+        if role in ADMIN_ROLES:
+            current = get_current_session()
+            if current is None or current['user']['role'] != 'admin':
+                return jsonify({'error': 'Only an admin can create admin accounts'}), 403
+        
         # Hash the password
         hashed_password = hashlib.sha256(password.encode()).hexdigest()
         
@@ -93,12 +227,13 @@ def login():
             return jsonify({'error': 'Invalid credentials'}), 401
         
         # Set session
-        session['user_id'] = user['id']
-        session['user_email'] = user['email']
-        session['user_role'] = user['role']
+        token = session_store.create(user)
+        session.clear()
+        session['session_token'] = token
         
         return jsonify({
             'message': 'Login successful',
+            'session_token': token,
             'user': {
                 'id': user['id'],
                 'name': user['name'],
@@ -110,6 +245,40 @@ def login():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/logout', methods=['POST'])
+@login_required()
+def logout():
+    try:
+        session_store.delete(get_session_token())
+        session.clear()
+        return jsonify({'message': 'Logged out'}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sessions/expire', methods=['POST'])
+@login_required(*ADMIN_ROLES)
+def expire_sessions():
+    try:
+        data = request.get_json(silent=True) or {}
+        user_ids = data.get('user_ids')
+        role = data.get('role')
+        
+        # An empty filter would log everyone out, so that has to be asked for
+        if user_ids is None and role is None and data.get('all') is not True:
+            return jsonify({'error': 'Give user_ids or role, or all: true to expire every session'}), 400
+        if user_ids is not None and not (
+            isinstance(user_ids, list) and all(type(user_id) is int for user_id in user_ids)
+        ):
+            return jsonify({'error': 'user_ids must be a list of integers'}), 400
+        
+        removed = session_store.expire(user_ids=user_ids, role=role)
+        return jsonify({
+            'message': 'Sessions expired',
+            'expired': removed
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/slots', methods=['GET'])
 def get_slots():
     try:
@@ -119,25 +288,32 @@ def get_slots():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/book', methods=['POST'])
+@login_required()
 def book_slot():
     try:
         data = request.get_json()
-        user_id = data.get('user_id')
         slot_id = data.get('slot_id')
         
-        if not all([user_id, slot_id]):
-            return jsonify({'error': 'User ID and slot ID are required'}), 400
+        # Coordinators may book on a student's behalf; everyone else books for themselves
+        user_id = g.user['id']
+        if g.user['role'] in ADMIN_ROLES and data.get('user_id'):
+            user_id = data.get('user_id')
         
-        # Check if slot is available
+        if not slot_id:
+            return jsonify({'error': 'Slot ID is required'}), 400
+        
+        # Check if slot exists
         slot = db.get_slot_by_id(slot_id)
         if not slot:
             return jsonify({'error': 'Slot not found'}), 404
         
-        if slot['booked_count'] >= slot['max_capacity']:
-            return jsonify({'error': 'Slot is full'}), 400
-        
-        # Book the slot
-        booking_id = db.create_booking(user_id, slot_id)
+        # Book the slot; capacity is checked inside the booking transaction
+        try:
+            booking_id = db.create_booking(user_id, slot_id)
+        except SlotFull as e:
+            return jsonify({'error': str(e)}), 400
+        except BookingConflict as e:
+            return jsonify({'error': str(e), 'conflict': e.slot}), 409
         
         return jsonify({
             'message': 'Slot booked successfully',
@@ -147,7 +323,25 @@ def book_slot():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/schedule', methods=['GET'])
+@login_required()
+def my_schedule():
+    """The user's booked slots with overlapping bookings flagged"""
+    try:
+        user_id = g.user['id']
+        if g.user['role'] != 'student':
+            user_id = request.args.get('user_id', user_id, type=int)
+        
+        schedule = db.get_schedule(user_id, start=request.args.get('from'), end=request.args.get('to'))
+        return jsonify({
+            'schedule': schedule,
+            'conflicts': sum(1 for entry in schedule if entry['conflicts'])
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/attendance', methods=['POST'])
+@login_required(*SUPERVISOR_ROLES, *ADMIN_ROLES)
 def mark_attendance():
     try:
         data = request.get_json()
@@ -159,6 +353,11 @@ def mark_attendance():
         if not all([user_id, slot_id, date]):
             return jsonify({'error': 'User ID, slot ID, and date are required'}), 400
         
+        try:
+            datetime.strptime(date, '%Y-%m-%d')
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Date must be in YYYY-MM-DD format'}), 400
+        
         # Mark attendance
         attendance_id = db.mark_attendance(user_id, slot_id, date, status)
         
@@ -170,6 +369,580 @@ def mark_attendance():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/logbooks', methods=['POST'])
+@login_required('student')
+def create_logbook_entry():
+    try:
+        data = request.get_json()
+        week = data.get('week')
+        entry = data.get('entry')
+        
+        if not all([week, entry]):
+            return jsonify({'error': 'Week and entry are required'}), 400
+        
+        entry_id = db.create_logbook_entry(g.user['id'], week, entry)
+        
+        return jsonify({
+            'message': 'Logbook entry saved',
+            'entry_id': entry_id
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/logbooks/<int:entry_id>/verify', methods=['POST'])
+@login_required(*SUPERVISOR_ROLES, *ADMIN_ROLES)
+def verify_logbook_entry(entry_id):
+    try:
+        if not db.verify_logbook_entry(entry_id, g.user['id']):
+            return jsonify({'error': 'Logbook entry not found'}), 404
+        return jsonify({'message': 'Logbook entry verified'}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/logbooks/search', methods=['GET'])
+@login_required(*SUPERVISOR_ROLES, *ADMIN_ROLES)
+def search_logbooks():
+    """Full-text search over logbook entries.
+    
+    Takes q plus optional student_id, week, verified, page, per_page and
+    order ('rank' or 'recent'). Ranked results only cover the newest
+    matches; truncated is true when older ones were left out, in which case
+    order=recent pages through every match.
+    """
+    try:
+        text = request.args.get('q', '').strip()
+        if not text:
+            return jsonify({'error': 'Search query is required'}), 400
+        
+        verified = request.args.get('verified')
+        if verified is not None:
+            verified = verified.lower() in ('1', 'true', 'yes')
+        
+        results = db.search_logbooks(
+            text,
+            student_id=request.args.get('student_id', type=int),
+            week=request.args.get('week', type=int),
+            verified=verified,
+            page=max(1, request.args.get('page', 1, type=int)),
+            per_page=min(max(1, request.args.get('per_page', 20, type=int)), 100),
+            order=request.args.get('order', 'rank')
+        )
+        return jsonify(results), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/uploads', methods=['POST'])
+@login_required()
+def upload_file():
+    """Store an upload, sent either as the raw request body or as a multipart 'file' field"""
+    try:
+        if request.content_length and request.content_length > MAX_UPLOAD_SIZE:
+            return jsonify({'error': 'File too large'}), 413
+        
+        if request.mimetype == 'multipart/form-data':
+            upload = request.files.get('file')
+            if upload is None:
+                return jsonify({'error': 'File is required'}), 400
+            stream, filename, content_type = upload.stream, upload.filename, upload.mimetype
+        else:
+            stream = request.stream
+            filename = request.headers.get('X-Filename')
+            content_type = request.mimetype or 'application/octet-stream'
+        
+        digest, size = file_store.save_stream(stream)
+        if size == 0:
+            return jsonify({'error': 'File is empty'}), 400
+        db.create_upload(digest, size, filename, content_type, g.user['id'])
+        
+        return jsonify({
+            'message': 'File uploaded successfully',
+            'digest': digest,
+            'size': size
+        }), 201
+        
+    except UploadTooLarge:
+        return jsonify({'error': 'File too large'}), 413
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/uploads/<digest>', methods=['GET'])
+@login_required()
+def download_file(digest):
+    try:
+        # Students only see their own files; staff can see any
+        uploaded_by = g.user['id'] if g.user['role'] == 'student' else None
+        upload = db.get_upload(digest, uploaded_by)
+        if upload is None or not file_store.exists(digest):
+            return jsonify({'error': 'File not found'}), 404
+        
+        response = send_file(
+            file_store.path_for(digest),
+            mimetype=upload['content_type'],
+            as_attachment=True,
+            download_name=upload['filename'] or digest,
+            etag=digest,
+            conditional=True
+        )
+        response.cache_control.private = True
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/final-reports', methods=['POST'])
+@login_required('student')
+def submit_final_report():
+    try:
+        data = request.get_json()
+        report_file = data.get('report_file')
+        logbook_file = data.get('logbook_file')
+        
+        if not all([report_file, logbook_file]):
+            return jsonify({'error': 'Report file and logbook file are required'}), 400
+        
+        for digest in (report_file, logbook_file):
+            if db.get_upload(digest, g.user['id']) is None:
+                return jsonify({'error': f'Unknown upload: {digest}'}), 400
+        
+        report_id = db.create_final_report(g.user['id'], report_file, logbook_file)
+        
+        return jsonify({
+            'message': 'Final report submitted successfully',
+            'report_id': report_id
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/return-forms', methods=['POST'])
+@login_required('student')
+def submit_return_form():
+    try:
+        data = request.get_json()
+        company = data.get('company')
+        location = data.get('location')
+        supervisor_name = data.get('supervisor_name')
+        supervisor_email = data.get('supervisor_email')
+        insurance_form = data.get('insurance_form')
+        
+        if not all([company, location, supervisor_name, supervisor_email]):
+            return jsonify({'error': 'Company, location and supervisor details are required'}), 400
+        
+        if insurance_form and db.get_upload(insurance_form, g.user['id']) is None:
+            return jsonify({'error': f'Unknown upload: {insurance_form}'}), 400
+        
+        form_id = db.create_return_form(
+            g.user['id'], company, location, supervisor_name, supervisor_email,
+            data.get('supervisor_phone'), insurance_form
+        )
+        
+        return jsonify({
+            'message': 'Return form submitted successfully',
+            'form_id': form_id
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/notifications', methods=['GET'])
+@login_required()
+def list_notifications():
+    try:
+        limit = min(max(1, request.args.get('limit', 20, type=int)), 100)
+        notifications = db.get_notifications(
+            g.user['id'],
+            before_id=request.args.get('before_id', type=int),
+            limit=limit,
+            unread_only=request.args.get('unread', '').lower() in ('1', 'true', 'yes')
+        )
+        
+        return jsonify({
+            'notifications': notifications,
+            'unread_count': db.get_unread_count(g.user['id']),
+            'next_before_id': notifications[-1]['id'] if len(notifications) == limit else None
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/notifications/unread-count', methods=['GET'])
+@login_required()
+def unread_notification_count():
+    try:
+        return jsonify({'unread_count': db.get_unread_count(g.user['id'])}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/notifications/<int:notification_id>/read', methods=['POST'])
+@login_required()
+def mark_notification_read(notification_id):
+    try:
+        if not db.mark_notification_read(notification_id, g.user['id']):
+            return jsonify({'error': 'Notification not found'}), 404
+        return jsonify({'message': 'Notification marked as read'}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/notifications/read-all', methods=['POST'])
+@login_required()
+def mark_all_notifications_read():
+    try:
+        data = request.get_json(silent=True) or {}
+        updated = db.mark_all_notifications_read(g.user['id'], data.get('up_to_id'))
+        return jsonify({
+            'message': 'Notifications marked as read',
+            'updated': updated
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/notifications/broadcast', methods=['POST'])
+@login_required(*SUPERVISOR_ROLES, *ADMIN_ROLES)
+def broadcast_notification():
+    try:
+        data = request.get_json()
+        message = data.get('message')
+        user_ids = data.get('user_ids')
+        role = data.get('role')
+        
+        if not message or not (user_ids or role):
+            return jsonify({'error': 'Message and recipients (user_ids or role) are required'}), 400
+        if user_ids is not None and not (
+            isinstance(user_ids, list) and all(type(user_id) is int for user_id in user_ids)
+        ):
+            return jsonify({'error': 'user_ids must be a list of integers'}), 400
+        
+        # Supervisors can message chosen users; broadcasting to a whole role is for admins
+        if role and g.user['role'] not in ADMIN_ROLES:
+            return jsonify({'error': 'Only admins can broadcast to a role'}), 403
+        
+        sent = db.broadcast_notification(message, user_ids=user_ids or None, role=role)
+        
+        return jsonify({
+            'message': 'Notification sent',
+            'recipients': sent
+        }), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/clusters', methods=['POST'])
+@login_required(*ADMIN_ROLES)
+def create_cluster():
+    try:
+        data = request.get_json()
+        name = data.get('name')
+        capacity = data.get('capacity')
+        
+        if not name or capacity is None:
+            return jsonify({'error': 'Name and capacity are required'}), 400
+        
+        cluster_id = db.create_cluster(name, data.get('location'), capacity, data.get('coordinator_id'))
+        
+        return jsonify({
+            'message': 'Cluster created successfully',
+            'cluster_id': cluster_id
+        }), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/supervisors/<int:user_id>/capacity', methods=['PUT'])
+@login_required(*ADMIN_ROLES)
+def set_supervisor_capacity(user_id):
+    try:
+        data = request.get_json()
+        capacity = data.get('capacity')
+        
+        if capacity is None:
+            return jsonify({'error': 'Capacity is required'}), 400
+        
+        db.set_supervisor_capacity(user_id, capacity, data.get('location'))
+        
+        return jsonify({'message': 'Supervisor capacity updated'}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/assignments/run', methods=['POST'])
+@login_required(*ADMIN_ROLES)
+def run_assignments():
+    """Place unassigned students and move fallbacks home, or everyone with {"rebalance": true}"""
+    try:
+        data = request.get_json(silent=True) or {}
+        summary = run_assignment(db, rebalance=bool(data.get('rebalance')))
+        
+        return jsonify({
+            'message': 'Assignments updated',
+            'summary': summary
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def attendance_analytics(scope, scope_id=None):
+    period = request.args.get('period', 'week')
+    if period not in ('day', 'week'):
+        return jsonify({'error': 'Period must be day or week'}), 400
+    
+    rollups = db.get_attendance_rollups(
+        scope,
+        period=period,
+        scope_id=scope_id,
+        start=request.args.get('from'),
+        end=request.args.get('to'),
+        limit=min(max(1, request.args.get('limit', 100, type=int)), 1000),
+        offset=max(0, request.args.get('offset', 0, type=int))
+    )
+    return jsonify({
+        'scope': scope,
+        'period': period,
+        'results': rollups
+    }), 200
+
+@app.route('/api/analytics/attendance', methods=['GET'])
+@login_required(*SUPERVISOR_ROLES, *ADMIN_ROLES)
+def attendance_summary():
+    try:
+        return attendance_analytics('all', 0)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/analytics/attendance/students', methods=['GET'])
+@app.route('/api/analytics/attendance/students/<int:user_id>', methods=['GET'])
+@login_required()
+def student_attendance_analytics(user_id=None):
+    try:
+        # Students only see their own attendance
+        if g.user['role'] == 'student':
+            if user_id not in (None, g.user['id']):
+                return jsonify({'error': 'Access denied'}), 403
+            user_id = g.user['id']
+        return attendance_analytics('student', user_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/analytics/attendance/slots', methods=['GET'])
+@app.route('/api/analytics/attendance/slots/<int:slot_id>', methods=['GET'])
+@login_required(*SUPERVISOR_ROLES, *ADMIN_ROLES)
+def slot_attendance_analytics(slot_id=None):
+    try:
+        return attendance_analytics('slot', slot_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def can_access_job(job):
+    return g.user['role'] != 'student' or job['params'].get('student_id') == g.user['id']
+
+def job_response(job):
+    return {
+        'job_id': job['id'],
+        'kind': job['kind'],
+        'status': job['status'],
+        'attempts': job['attempts'],
+        'error': job['error'],
+        'result_url': url_for('job_result', job_id=job['id']) if job['status'] == 'done' else None
+    }
+
+@app.route('/api/jobs', methods=['POST'])
+@login_required()
+def submit_job():
+    """Queue a report compilation, or reuse one whose input data is unchanged"""
+    try:
+        data = request.get_json()
+        kind = data.get('kind')
+        student_id = data.get('student_id', g.user['id'])
+        
+        if kind not in jobs.JOB_HANDLERS:
+            return jsonify({'error': f"Kind must be one of: {', '.join(jobs.JOB_HANDLERS)}"}), 400
+        if g.user['role'] == 'student' and student_id != g.user['id']:
+            return jsonify({'error': 'Access denied'}), 403
+        
+        job, created = jobs.submit_job(db, file_store, kind, {'student_id': int(student_id)}, g.user['id'])
+        
+        return jsonify(job_response(job)), 202 if created else 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<int:job_id>', methods=['GET'])
+@login_required()
+def job_status(job_id):
+    try:
+        job = db.get_job(job_id)
+        if job is None or not can_access_job(job):
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job_response(job)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<int:job_id>/result', methods=['GET'])
+@login_required()
+def job_result(job_id):
+    try:
+        job = db.get_job(job_id)
+        if job is None or not can_access_job(job):
+            return jsonify({'error': 'Job not found'}), 404
+        if job['status'] != 'done':
+            return jsonify({'error': 'Job has not finished', 'status': job['status']}), 409
+        
+        result = job['result']
+        if not file_store.exists(result['digest']):
+            return jsonify({'error': 'Result no longer available, please resubmit the job'}), 410
+        
+        response = send_file(
+            file_store.path_for(result['digest']),
+            mimetype=result['content_type'],
+            as_attachment=True,
+            download_name=result['filename'],
+            etag=result['digest'],
+            conditional=True
+        )
+        response.cache_control.private = True
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/snapshots/refresh', methods=['POST'])
+@login_required(*ADMIN_ROLES)
+def refresh_snapshot():
+    try:
+        elapsed = db.refresh_snapshot()
+        return jsonify({
+            'message': 'Analytics snapshot refreshed',
+            'seconds': round(elapsed, 3)
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/terms', methods=['GET'])
+@login_required(*ADMIN_ROLES)
+def list_terms():
+    try:
+        return jsonify({'terms': db.get_terms()}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/terms', methods=['POST'])
+@login_required(*ADMIN_ROLES)
+def create_term():
+    try:
+        data = request.get_json()
+        name = data.get('name')
+        start_date = data.get('start_date')
+        end_date = data.get('end_date')
+        
+        if not all([name, start_date, end_date]):
+            return jsonify({'error': 'Name, start date and end date are required'}), 400
+        
+        try:
+            datetime.strptime(start_date, '%Y-%m-%d')
+            datetime.strptime(end_date, '%Y-%m-%d')
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Dates must be in YYYY-MM-DD format'}), 400
+        
+        try:
+            term_id = db.create_term(name, start_date, end_date)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'message': 'Term created successfully',
+            'term_id': term_id
+        }), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def history_user_id():
+    """Students only see their own history; staff may filter by ?user_id="""
+    if g.user['role'] == 'student':
+        return g.user['id']
+    return request.args.get('user_id', type=int)
+
+@app.route('/api/bookings/history', methods=['GET'])
+@login_required()
+def booking_history():
+    try:
+        return jsonify({'bookings': db.get_booking_history(history_user_id())}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/attendance/history', methods=['GET'])
+@login_required()
+def attendance_history():
+    try:
+        attendance = db.get_attendance_history(
+            history_user_id(),
+            start=request.args.get('from'),
+            end=request.args.get('to')
+        )
+        return jsonify({'attendance': attendance}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Dashboards bootstrap with one /api/batch call instead of a request per panel
+MAX_BATCH_REQUESTS = 20
+
+def run_sub_request(path):
+    """Dispatch a GET sub-request with the caller's credentials.
+    
+    The sub-request gets a copy of the batch request's WSGI environ with
+    only the method, path and query string changed, so it carries the same
+    headers, client address and server details as a standalone call.
+    Headers that would compress the body, make it partial or turn it into
+    a 304 are dropped, since the body is embedded in the batch response.
+    """
+    url = urlsplit(path)
+    environ = dict(request.environ)
+    for key in ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_CONTENT_TYPE', 'HTTP_CONTENT_LENGTH',
+                'REQUEST_URI', 'RAW_URI', 'HTTP_ACCEPT_ENCODING', 'HTTP_RANGE', 'HTTP_IF_RANGE',
+                'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE'):
+        environ.pop(key, None)
+    environ.update({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': unquote_to_bytes(url.path).decode('latin-1'),
+        'QUERY_STRING': url.query,
+        'wsgi.input': io.BytesIO()
+    })
+    with app.app_context(), app.request_context(environ):
+        response = app.full_dispatch_request()
+        result = {
+            'path': path,
+            'status': response.status_code,
+            'body': response.get_json(silent=True) if response.is_json else None
+        }
+        response.close()
+    return result
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """Run a list of GET API requests in one read transaction.
+    
+    Takes {"requests": [{"path": "/api/slots"}, ...]} and returns each
+    sub-response's status and JSON body in order. Sub-requests are
+    authenticated and rate limited like standalone calls.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        sub_requests = data.get('requests')
+        
+        if not isinstance(sub_requests, list) or not sub_requests:
+            return jsonify({'error': 'A list of requests is required'}), 400
+        if len(sub_requests) > MAX_BATCH_REQUESTS:
+            return jsonify({'error': f'At most {MAX_BATCH_REQUESTS} requests per batch'}), 400
+        
+        paths = []
+        for sub_request in sub_requests:
+            if not isinstance(sub_request, dict):
+                return jsonify({'error': 'Each request must be an object with a path'}), 400
+            path = sub_request.get('path')
+            method = str(sub_request.get('method', 'GET')).upper()
+            if method != 'GET' or not isinstance(path, str) or not path.startswith('/api/') \
+                    or path.split('?')[0] == '/api/batch':
+                return jsonify({'error': 'Only GET /api/ requests can be batched'}), 400
+            paths.append(path)
+        
+        with db.read_transaction():
+            responses = [run_sub_request(path) for path in paths]
+        
+        return jsonify({'responses': responses}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/reports', methods=['GET'])
 def get_reports():
     try:
@@ -190,65 +963,93 @@ def test_database():
     except Exception as e:
         return jsonify({'error': f'Database test failed: {str(e)}'}), 500
 
+ADMIN_VIEW_SECTIONS = [
+    ('users', 'Users'),
+    ('slots', 'Slots'),
+    ('bookings', 'Bookings'),
+    ('attendance', 'Attendance')
+]
+ADMIN_VIEW_PER_PAGE = 25
+ADMIN_VIEW_MAX_PER_PAGE = 100
+
+# Rendered admin view tables, keyed by table version so any write to a
+# table invalidates its cached fragments
+admin_view_cache = LRUCache(max_entries=256)
+
+def render_admin_table(table, title, per_page):
+    args = request.args.to_dict()
+    version = db.get_table_version(table)
+    cache_key = (table, version, per_page, tuple(sorted(args.items())))
+    
+    html = admin_view_cache.get(cache_key)
+    if html is None:
+        data = db.get_table_page(
+            table,
+            per_page=per_page,
+            sort=request.args.get(f'{table}_sort', 'id'),
+            order=request.args.get(f'{table}_order', 'asc'),
+            after=request.args.get(f'{table}_after', type=int),
+            before=request.args.get(f'{table}_before', type=int)
+        )
+        
+        def page_url(sort, order, after=None, before=None):
+            params = {
+                key: value for key, value in args.items()
+                if key not in (f'{table}_after', f'{table}_before')
+            }
+            params.update({
+                f'{table}_sort': sort,
+                f'{table}_order': order
+            })
+            if after is not None:
+                params[f'{table}_after'] = after
+            if before is not None:
+                params[f'{table}_before'] = before
+            return url_for('admin_view', **params)
+        
+        html = render_template('admin_view_table.html', data=data, title=title, page_url=page_url)
+        admin_view_cache.set(cache_key, html)
+    
+    return Markup(html)
+
 @app.route('/admin-view')
+@login_required(*ADMIN_ROLES)
 def admin_view():
-    email = request.args.get('email')
-    if email != 'admin@example.com':
-        return "Access denied", 403
-    
     try:
-        users = db.get_all_users()
-        slots = db.get_all_slots()
-        bookings = db.get_all_bookings()
-        attendance = db.get_all_attendance()
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Database Admin View</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                table {{ border-collapse: collapse; width: 100%; margin-bottom: 30px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                th {{ background-color: #f2f2f2; }}
-                h2 {{ color: #333; }}
-            </style>
-        </head>
-        <body>
-            <h1>Database Admin View</h1>
-            
-            <h2>Users ({len(users)} total)</h2>
-            <table>
-                <tr><th>ID</th><th>Name</th><th>Email</th><th>Role</th><th>Created</th></tr>
-                {''.join([f'<tr><td>{u["id"]}</td><td>{u["name"]}</td><td>{u["email"]}</td><td>{u["role"]}</td><td>{u["created_at"]}</td></tr>' for u in users])}
-            </table>
-            
-            <h2>Slots ({len(slots)} total)</h2>
-            <table>
-                <tr><th>ID</th><th>Name</th><th>Date</th><th>Time</th><th>Max Capacity</th><th>Booked Count</th></tr>
-                {''.join([f'<tr><td>{s["id"]}</td><td>{s["name"]}</td><td>{s["date"]}</td><td>{s["time"]}</td><td>{s["max_capacity"]}</td><td>{s["booked_count"]}</td></tr>' for s in slots])}
-            </table>
-            
-            <h2>Bookings ({len(bookings)} total)</h2>
-            <table>
-                <tr><th>ID</th><th>User ID</th><th>Slot ID</th><th>Booked At</th></tr>
-                {''.join([f'<tr><td>{b["id"]}</td><td>{b["user_id"]}</td><td>{b["slot_id"]}</td><td>{b["booked_at"]}</td></tr>' for b in bookings])}
-            </table>
-            
-            <h2>Attendance ({len(attendance)} total)</h2>
-            <table>
-                <tr><th>ID</th><th>User ID</th><th>Slot ID</th><th>Date</th><th>Status</th></tr>
-                {''.join([f'<tr><td>{a["id"]}</td><td>{a["user_id"]}</td><td>{a["slot_id"]}</td><td>{a["date"]}</td><td>{a["status"]}</td></tr>' for a in attendance])}
-            </table>
-        </body>
-        </html>
-        """
-        
-        return html
-        
-    except Exception as e:
-        return f"Error: {str(e)}", 500
+        per_page = request.args.get('per_page', ADMIN_VIEW_PER_PAGE, type=int)
+        per_page = min(max(1, per_page), ADMIN_VIEW_MAX_PER_PAGE)
+        
+        sections = [
+            render_admin_table(table, title, per_page)
+            for table, title in ADMIN_VIEW_SECTIONS
+        ]
+        
+        return render_template('admin_view.html', sections=sections)
+        
+    except Exception as e:
+        return f"Error: {escape(str(e))}", 500
+
+@app.cli.command('backfill-rollups')
+def backfill_rollups():
+    """Rebuild the attendance rollups from the attendance table"""
+    start = datetime.now()
+    rows = db.rebuild_attendance_rollups()
+    print(f"Rebuilt {rows} rollup rows in {(datetime.now() - start).total_seconds():.1f}s")
+
+@app.cli.command('refresh-snapshot')
+def refresh_snapshot_command():
+    """Refresh the read-only analytics snapshot"""
+    print(f"Snapshot refreshed in {db.refresh_snapshot():.2f}s")
+
+@app.cli.command('archive-term')
+@click.argument('name')
+@click.option('--batch-size', default=5000, help='Rows moved per transaction')
+def archive_term_command(name, batch_size):
+    """Move a term's bookings and attendance into its archive database"""
+    moved = db.archive_term(name, batch_size=batch_size)
+    print(f"Archived term {name}: {moved['bookings']} bookings, {moved['attendance']} attendance records")
+
+precompile_templates()
 
 if __name__ == '__main__':
     db.initialize_database()
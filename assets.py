@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Static asset caching and response compression.
+
+Static URLs built with url_for('static', ...) carry a content hash, and
+requests for the current hash are served with a far-future, immutable
+Cache-Control header. Precompressed .gz (and .br when the brotli package
+is installed) variants are generated at build time by running this module
+and are picked according to Accept-Encoding. JSON and HTML responses above
+COMPRESS_MIN_SIZE are compressed on the fly.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 6
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.ico', '.html', '.json', '.txt')
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html')
+
+# Content hashes of static files, filled lazily. Each worker computes a
+# file's hash once; deploys restart the workers and so pick up new hashes.
+# Only files that exist under the static folder are cached, so requests for
+# made-up names cannot grow it.
+_asset_hashes = {}
+
+
+def asset_hash(static_folder, filename):
+    """Content hash of a file under static_folder, or None if there is no such file"""
+    path = safe_join(static_folder, filename)
+    if path is None:
+        return None
+    if path not in _asset_hashes:
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                _asset_hashes[path] = hashlib.sha256(f.read()).hexdigest()[:12]
+        except OSError:
+            return None
+    return _asset_hashes[path]
+
+
+def precompress_static(static_folder):
+    """Write .gz/.br variants of compressible static files. Returns the paths written."""
+    written = []
+    encoders = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.append(('.br', lambda data: brotli.compress(data, quality=11)))
+    
+    for root, _, files in os.walk(static_folder):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            for suffix, encode in encoders:
+                compressed = encode(data)
+                # Only keep variants that actually save bytes
+                if len(compressed) >= len(data):
+                    continue
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed)
+                written.append(path + suffix)
+    return written
+
+
+def _preferred_encoding():
+    if brotli is not None and 'br' in request.accept_encodings:
+        return 'br'
+    if 'gzip' in request.accept_encodings:
+        return 'gzip'
+    return None
+
+
+def init_app(app):
+    static_folder = app.static_folder
+    
+    @app.url_defaults
+    def add_asset_version(endpoint, values):
+        if endpoint == 'static' and 'v' not in values:
+            version = asset_hash(static_folder, values.get('filename', ''))
+            if version:
+                values['v'] = version
+    
+    def send_static(filename):
+        immutable = request.args.get('v') is not None and \
+            request.args.get('v') == asset_hash(static_folder, filename)
+        max_age = STATIC_MAX_AGE if immutable else None
+        
+        response = None
+        path = safe_join(static_folder, filename)
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if path and encoding in request.accept_encodings and os.path.isfile(path + suffix):
+                response = send_from_directory(
+                    static_folder, filename + suffix,
+                    mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                    max_age=max_age
+                )
+                response.headers['Content-Encoding'] = encoding
+                break
+        if response is None:
+            response = send_from_directory(static_folder, filename, max_age=max_age)
+        
+        response.vary.add('Accept-Encoding')
+        if immutable:
+            response.cache_control.public = True
+            response.cache_control.immutable = True
+        return response
+    
+    app.view_functions['static'] = send_static
+    
+    @app.after_request
+    def compress_response(response):
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES or response.direct_passthrough:
+            return response
+        response.vary.add('Accept-Encoding')
+        if response.status_code in (204, 304) or 'Content-Encoding' in response.headers:
+            return response
+        
+        data = response.get_data()
+        encoding = _preferred_encoding()
+        if len(data) < COMPRESS_MIN_SIZE or encoding is None:
+            return response
+        
+        if encoding == 'br':
+            response.set_data(brotli.compress(data, quality=5))
+        else:
+            response.set_data(gzip.compress(data, compresslevel=COMPRESS_LEVEL))
+        response.headers['Content-Encoding'] = encoding
+        # The encoded body is not byte-identical to the one the ETag was
+        # computed from, so only a weak validator still holds
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+if __name__ == '__main__':
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    paths = precompress_static(folder)
+    print(f"Precompressed {len(paths)} static variants{'' if brotli else ' (brotli not installed, gzip only)'}")
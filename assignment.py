@@ -0,0 +1,127 @@
+"""
+Assignment of students to clusters and university supervisors.
+
+Greedy in two passes. First every student with a location goes to the
+least-loaded target (by load / capacity) in that location. Only then are
+the rest, students whose location is full or has no targets and students
+with no location at all, placed on the least-loaded target anywhere, so a
+fallback never takes a place a local student could have had. Targets sit
+in lazily updated heaps, so a run costs O((students + targets) log targets).
+
+Incremental runs also repair earlier fallbacks: a student placed outside
+their location, typically before their return form arrived, moves to a
+local target once one has room and otherwise stays where they are.
+"""
+
+import heapq
+from collections import defaultdict
+
+
+def normalize_location(location):
+    return (location or '').strip().lower()
+
+
+def assign(students, targets, current=None):
+    """Assign students to targets without exceeding capacity.
+
+    students is a list of (student_id, location); targets a list of dicts
+    with id, location, capacity and load (students already assigned).
+    current maps students in that list who already sit on a fallback
+    target to it; they are only moved to a local target, which frees
+    their place for others. Returns a dict with the 'assignments'
+    {student_id: target_id} plus the 'local', 'fallback', 'unassigned'
+    and 'repaired' (fallbacks moved to a local target) counts.
+    """
+    current = current or {}
+    loads = {t['id']: t['load'] for t in targets}
+    capacities = {t['id']: t['capacity'] for t in targets}
+    location_heaps = defaultdict(list)
+    global_heap = []
+    target_locations = {}
+    
+    def push(target_id):
+        if loads[target_id] < capacities[target_id]:
+            entry = (loads[target_id] / capacities[target_id], target_id, loads[target_id])
+            heapq.heappush(location_heaps[target_locations[target_id]], entry)
+            heapq.heappush(global_heap, entry)
+    
+    def pop_best(heap):
+        # Entries go stale when the target's load changes after they were pushed
+        while heap:
+            _, target_id, load = heap[0]
+            if load == loads[target_id] and load < capacities[target_id]:
+                return target_id
+            heapq.heappop(heap)
+        return None
+    
+    def place(student_id, target_id):
+        assignments[student_id] = target_id
+        loads[target_id] += 1
+        push(target_id)
+    
+    for t in targets:
+        target_locations[t['id']] = normalize_location(t['location'])
+        push(t['id'])
+    
+    located = sorted((student_id, normalize_location(location)) for student_id, location in students)
+    
+    assignments = {}
+    unplaced = []
+    for student_id, location in located:
+        target_id = pop_best(location_heaps[location]) if location else None
+        if target_id is not None:
+            place(student_id, target_id)
+            if student_id in current:
+                loads[current[student_id]] -= 1
+                push(current[student_id])
+        elif student_id not in current:
+            unplaced.append(student_id)
+    local = len(assignments)
+    repaired = sum(1 for student_id in assignments if student_id in current)
+    
+    for student_id in unplaced:
+        target_id = pop_best(global_heap)
+        if target_id is None:
+            break
+        place(student_id, target_id)
+    fallback = len(assignments) - local
+    
+    return {
+        'assignments': assignments,
+        'local': local,
+        'fallback': fallback,
+        'unassigned': len(located) - len(current) - (len(assignments) - repaired),
+        'repaired': repaired
+    }
+
+
+def run_assignment(db, rebalance=False):
+    """Assign students to clusters and supervisors and save both in one transaction.
+
+    By default students without a cluster or supervisor are placed on top
+    of the existing loads, and students on a fallback target are moved to
+    a local one that has room. With rebalance=True everyone is placed
+    again from scratch.
+    """
+    results = {}
+    for kind, targets in (('clusters', db.get_cluster_targets(ignore_current_load=rebalance)),
+                          ('supervisors', db.get_supervisor_targets(ignore_current_load=rebalance))):
+        students = db.get_students_for_assignment(kind, only_unassigned=not rebalance)
+        current = {}
+        if not rebalance:
+            for student_id, location, target_id in db.get_fallback_assignments(kind):
+                students.append((student_id, location))
+                current[student_id] = target_id
+        results[kind] = assign(students, targets, current)
+    db.save_assignments(results['clusters']['assignments'], results['supervisors']['assignments'], rebalance)
+    
+    return {
+        name: {
+            'assigned': len(result['assignments']) - result['repaired'],
+            'local': result['local'],
+            'fallback': result['fallback'],
+            'unassigned': result['unassigned'],
+            'repaired': result['repaired']
+        }
+        for name, result in results.items()
+    }
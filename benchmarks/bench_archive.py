@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark current-term reads before and after archiving past terms, and
+create_booking latency while a term is being archived.
+
+Run from the repository root: python benchmarks/bench_archive.py [rows_per_term]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+TERMS = [
+    ('2024 T3', date(2024, 9, 2)),
+    ('2025 T1', date(2025, 1, 6)),
+    ('2025 T2', date(2025, 5, 5)),
+    ('2025 T3', date(2025, 9, 1)),
+]
+TERM_DAYS = 100
+
+
+def populate(db, rows_per_term):
+    conn = db.get_connection()
+    for name, start in TERMS:
+        db.create_term(name, start.isoformat(), (start + timedelta(days=TERM_DAYS - 1)).isoformat())
+        conn.executemany(
+            'INSERT INTO attendance (user_id, slot_id, date, status) VALUES (?, ?, ?, ?)',
+            ((i % 5000 + 1, i // 5000 % 20 + 1, (start + timedelta(days=i // 100000 % TERM_DAYS)).isoformat(),
+              'present') for i in range(rows_per_term))
+        )
+        slot_ids = []
+        for day in range(0, TERM_DAYS, 7):
+            conn.execute('INSERT INTO slots (name, date, time, max_capacity) VALUES (?, ?, ?, ?)',
+                         ('Session', (start + timedelta(days=day)).isoformat(), '09:00-12:00', 1000))
+            slot_ids.append(conn.execute('SELECT last_insert_rowid()').fetchone()[0])
+        conn.executemany('INSERT INTO bookings (user_id, slot_id) VALUES (?, ?)',
+                         ((i % 5000 + 1, slot_ids[i % len(slot_ids)]) for i in range(rows_per_term // 10)))
+        conn.commit()
+    # The latency run books sample slot 1 over and over
+    conn.execute('UPDATE slots SET max_capacity = 1000000 WHERE id = 1')
+    conn.commit()
+    conn.close()
+
+
+def timed(label, fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<45} {best * 1000:10.2f} ms")
+
+
+def read_benchmarks(db, phase):
+    timed(f'get_all_attendance ({phase})', db.get_all_attendance)
+    timed(f'get_all_bookings ({phase})', db.get_all_bookings)
+    timed(f'get_reports ({phase})', db.get_reports)
+
+
+if __name__ == '__main__':
+    rows_per_term = int(sys.argv[1]) if len(sys.argv) > 1 else 250000
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'), archive_dir=os.path.join(tmp, 'archives'))
+        populate(db, rows_per_term)
+        print(f"{len(TERMS)} terms x {rows_per_term} attendance rows")
+        read_benchmarks(db, 'all terms hot')
+
+        latencies = []
+        done = threading.Event()
+
+        def book():
+            while not done.is_set():
+                start = time.perf_counter()
+                db.create_booking(len(latencies) + 1, 1)
+                latencies.append(time.perf_counter() - start)
+                time.sleep(0.005)
+
+        booker = threading.Thread(target=book)
+        booker.start()
+        start = time.perf_counter()
+        for name, _ in TERMS[:-1]:
+            db.archive_term(name)
+        elapsed = time.perf_counter() - start
+        done.set()
+        booker.join()
+        latencies.sort()
+        print(f"archived {len(TERMS) - 1} terms in {elapsed:.2f}s; create_booking meanwhile: "
+              f"p50 {statistics.median(latencies) * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms "
+              f"({len(latencies)} bookings)")
+
+        read_benchmarks(db, 'current term hot')
+        timed('get_attendance_history(user 42)', lambda: db.get_attendance_history(42))
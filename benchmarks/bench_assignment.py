@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark a full assignment run: reading inputs, placing students into
+clusters and with supervisors, and the bulk write-back.
+
+Run from the repository root: python benchmarks/bench_assignment.py [students]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assignment import run_assignment
+from database import Database
+
+LOCATIONS = ['Nairobi', 'Mombasa', 'Kisumu', 'Nakuru', 'Eldoret', 'Thika', 'Nyeri', 'Machakos']
+
+
+def populate(db, students, rng):
+    conn = db.get_connection()
+    conn.executemany(
+        'INSERT INTO users (name, email, password, role) VALUES (?, ?, ?, ?)',
+        ((f'Student {i}', f'student{i}@example.com', 'hash', 'student') for i in range(students))
+    )
+    conn.executemany(
+        '''INSERT INTO return_forms (student_id, company, location, supervisor_name, supervisor_email)
+           SELECT id, 'Acme', ?, 'Boss', 'boss@acme.com' FROM users WHERE email = ?''',
+        ((rng.choice(LOCATIONS), f'student{i}@example.com') for i in range(students))
+    )
+    conn.executemany(
+        'INSERT INTO users (name, email, password, role) VALUES (?, ?, ?, ?)',
+        ((f'Supervisor {i}', f'supervisor{i}@example.com', 'hash', 'university_supervisor')
+         for i in range(students // 80))
+    )
+    conn.executemany(
+        'INSERT INTO clusters (name, location, capacity) VALUES (?, ?, ?)',
+        ((f'Cluster {i}', LOCATIONS[i % len(LOCATIONS)], students // 40) for i in range(48))
+    )
+    conn.commit()
+    supervisor_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'university_supervisor'")]
+    conn.close()
+    for supervisor_id in supervisor_ids:
+        db.set_supervisor_capacity(supervisor_id, 90, rng.choice(LOCATIONS))
+
+
+if __name__ == '__main__':
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        populate(db, students, rng)
+        
+        start = time.perf_counter()
+        summary = run_assignment(db)
+        print(f"initial run, {students} students: {time.perf_counter() - start:.2f} s  {summary}")
+        
+        populate_extra = db.get_connection()
+        populate_extra.executemany(
+            'INSERT INTO users (name, email, password, role) VALUES (?, ?, ?, ?)',
+            ((f'Late {i}', f'late{i}@example.com', 'hash', 'student') for i in range(200))
+        )
+        populate_extra.commit()
+        populate_extra.close()
+        
+        start = time.perf_counter()
+        summary = run_assignment(db)
+        print(f"incremental run, 200 new students: {time.perf_counter() - start:.2f} s  {summary}")
+        
+        start = time.perf_counter()
+        summary = run_assignment(db, rebalance=True)
+        print(f"full rebalance: {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark the attendance rollup backfill and rollup reads against
+computing rates from get_all_attendance.
+
+Run from the repository root: python benchmarks/bench_attendance_rollups.py [rows]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, ATTENDED_STATUSES
+
+STATUSES = ['present'] * 8 + ['late', 'absent']
+
+
+def populate(db, rows, rng):
+    users, slots = 5000, 20
+    days = max(1, rows // (users * slots))
+    first_day = date(2025, 1, 6)
+    conn = db.get_connection()
+    conn.executemany(
+        'INSERT INTO attendance (user_id, slot_id, date, status) VALUES (?, ?, ?, ?)',
+        (
+            (user_id, slot_id, (first_day + timedelta(days=day)).isoformat(), rng.choice(STATUSES))
+            for day in range(days) for user_id in range(1, users + 1) for slot_id in range(1, slots + 1)
+        )
+    )
+    conn.commit()
+    count = conn.execute('SELECT COUNT(*) FROM attendance').fetchone()[0]
+    conn.close()
+    return count
+
+
+def timed(label, fn, repeat=1):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<50} {best * 1000:10.2f} ms")
+    return result
+
+
+def rate_from_raw(db, user_id):
+    counts = Counter(r['status'] for r in db.get_all_attendance() if r['user_id'] == user_id)
+    return sum(counts[s] for s in ATTENDED_STATUSES) / sum(counts.values())
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        count = populate(db, rows, rng)
+        print(f"{count} attendance rows")
+        
+        rollup_rows = timed('backfill (rebuild_attendance_rollups)', db.rebuild_attendance_rollups)
+        print(f"  -> {rollup_rows} rollup rows")
+        timed('one student, all weeks (rollups)',
+              lambda: db.get_attendance_rollups('student', 'week', scope_id=42), repeat=5)
+        timed('all students, one week, first 100 (rollups)',
+              lambda: db.get_attendance_rollups('student', 'week', start='2025-01-06', end='2025-01-06'), repeat=5)
+        timed('system-wide, daily (rollups)',
+              lambda: db.get_attendance_rollups('all', 'day'), repeat=5)
+        timed('one student rate from get_all_attendance', lambda: rate_from_raw(db, 42))
+        timed('mark_attendance with rollup maintenance (x200)',
+              lambda: [db.mark_attendance(i, 1, '2025-09-01', 'present') for i in range(1, 201)])
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark dashboard time-to-data: one request per panel against a single
+/api/batch call.
+
+Server time is measured in-process with the Flask test client; the network
+estimate adds one round trip per request, as the dashboard fetches in turn.
+
+Run from the repository root: python benchmarks/bench_batch.py [rtt_ms]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+from database import Database
+from rate_limit import RateLimiter
+from session_store import SessionStore
+
+PANELS = ['/api/slots', '/api/reports', '/api/bookings/history', '/api/attendance/history']
+LOADS = 200
+
+
+def populate(db):
+    conn = db.get_connection()
+    conn.executemany('INSERT INTO slots (name, date, time, max_capacity) VALUES (?, ?, ?, ?)',
+                     ((f'Session {i}', f'2025-09-{i % 28 + 1:02d}', '09:00-12:00', 30) for i in range(200)))
+    conn.executemany('INSERT INTO bookings (user_id, slot_id) VALUES (?, ?)',
+                     ((i % 500 + 1, i % 200 + 1) for i in range(20000)))
+    conn.executemany('INSERT INTO attendance (user_id, slot_id, date, status) VALUES (?, ?, ?, ?)',
+                     ((i % 500 + 1, i // 500 % 200 + 1, f'2025-09-{i // 100000 % 28 + 1:02d}', 'present')
+                      for i in range(50000)))
+    conn.commit()
+    conn.close()
+
+
+def per_panel(client):
+    for path in PANELS:
+        response = client.get(path)
+        assert response.status_code == 200
+        response.get_json()
+
+
+def batched(client):
+    response = client.post('/api/batch', json={'requests': [{'path': path} for path in PANELS]})
+    assert all(r['status'] == 200 for r in response.get_json()['responses'])
+
+
+def measure(label, load, requests, client, rtt):
+    start = time.perf_counter()
+    for _ in range(LOADS):
+        load(client)
+    server = (time.perf_counter() - start) / LOADS
+    print(f"{label:<22} {requests} request(s)   server {server * 1000:7.2f} ms"
+          f"   with {rtt * 1000:.0f} ms RTT {(server + requests * rtt) * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    rtt = (float(sys.argv[1]) if len(sys.argv) > 1 else 50) / 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        app_module.rate_limiter = RateLimiter(os.path.join(tmp, 'ratelimit.db'),
+                                              limits={'*': {'*': (10 ** 9, 10 ** 9)}})
+        db = Database(os.path.join(tmp, 'bench.db'), archive_dir=os.path.join(tmp, 'archives'))
+        populate(db)
+        app_module.db = db
+        app_module.session_store = SessionStore(db)
+
+        client = app_module.app.test_client()
+        client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+        per_panel(client)
+        batched(client)
+
+        measure('one request per panel', per_panel, len(PANELS), client, rtt)
+        measure('/api/batch', batched, 1, client, rtt)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark bytes on the wire and latency of a cold and a warm dashboard load.
+
+A small browser cache is simulated on top of the Flask test client: fresh
+entries (within Cache-Control max-age) are not requested again, stale ones
+are revalidated with If-None-Match / If-Modified-Since.
+
+Run from the repository root: python benchmarks/bench_dashboard_load.py
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+
+ASSET_PATTERN = re.compile(r'(?:href|src)="(/static/[^"]+)"')
+
+
+class BrowserCache:
+    def __init__(self):
+        self.entries = {}
+
+    def fetch(self, client, url, accept_encoding):
+        """Return (bytes transferred, requests made) for one resource"""
+        entry = self.entries.get(url)
+        if entry and entry['expires'] > time.time():
+            return 0, 0, entry['body']
+        
+        headers = {'Accept-Encoding': accept_encoding} if accept_encoding else {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        
+        response = client.get(url, headers=headers)
+        raw = response.get_data()
+        response.close()
+        if response.status_code == 304:
+            return len(raw), 1, entry['body']
+        
+        max_age = response.cache_control.max_age or 0
+        self.entries[url] = {
+            'expires': time.time() + max_age,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body': raw
+        }
+        return len(raw), 1, raw
+
+
+def load_dashboard(client, cache, accept_encoding):
+    start = time.perf_counter()
+    total_bytes, total_requests, html = cache.fetch(client, '/student', accept_encoding)
+    if html[:2] == b'\x1f\x8b':
+        import gzip
+        html = gzip.decompress(html)
+    for url in ASSET_PATTERN.findall(html.decode()):
+        size, requests, _ = cache.fetch(client, url.replace('&amp;', '&'), accept_encoding)
+        total_bytes += size
+        total_requests += requests
+    return total_bytes, total_requests, (time.perf_counter() - start) * 1000
+
+
+def run(label, accept_encoding, rounds=200):
+    client = app.test_client()
+    cold = []
+    warm = []
+    for _ in range(rounds):
+        cache = BrowserCache()
+        cold.append(load_dashboard(client, cache, accept_encoding))
+        warm.append(load_dashboard(client, cache, accept_encoding))
+    
+    for name, results in (('cold', cold), ('warm', warm)):
+        size, requests, _ = results[-1]
+        latencies = sorted(r[2] for r in results)
+        print(f"{label:<10} {name:<5} {size:>8} bytes {requests:>3} requests "
+              f"median {latencies[len(latencies) // 2]:.2f} ms")
+
+
+if __name__ == '__main__':
+    run('identity', None)
+    run('gzip', 'gzip')
+    run('gzip, br', 'gzip, br')
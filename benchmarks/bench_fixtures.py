@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-test database setup: initializing a fresh file against
+copying a migrated template with the backup API.
+
+Run from the repository root: python benchmarks/bench_fixtures.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+
+def per_call_ms(fn, number=50):
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number * 1000
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, 'template.db')
+        Database(template)
+        paths = iter(range(10 ** 6))
+
+        def path():
+            return os.path.join(tmp, f'test-{next(paths)}.db')
+
+        print(f"fresh file, initialize_database     {per_call_ms(lambda: Database(path())):8.3f} ms")
+        print(f"fresh :memory:, initialize_database  {per_call_ms(lambda: Database(':memory:')):8.3f} ms")
+        print(f"template copy to file                {per_call_ms(lambda: Database(path(), template=template)):8.3f} ms")
+        print(f"template copy to :memory:            "
+              f"{per_call_ms(lambda: Database(':memory:', template=template), number=500):8.3f} ms")
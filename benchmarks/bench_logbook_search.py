@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark FTS5 logbook search against a LIKE scan.
+
+Usage, from the repository root:
+    python benchmarks/bench_logbook_search.py [entries]    (default 1,000,000)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+WORDS = (
+    'configured installed network server database backup router switch printer '
+    'firewall documentation meeting client report testing deployment migration '
+    'supervisor training payroll inventory audit cabling laptop software update '
+    'troubleshooting security monitoring website design invoice accounts survey'
+).split()
+RARE_WORDS = ['kubernetes', 'oscilloscope', 'hydrology', 'photogrammetry']
+
+
+def populate(db, count, batch=50000):
+    rng = random.Random(42)
+    conn = db.get_connection()
+    for start in range(0, count, batch):
+        rows = []
+        for i in range(start, min(count, start + batch)):
+            words = rng.choices(WORDS, k=rng.randint(20, 60))
+            if i % 1000 == 0:
+                words.append(rng.choice(RARE_WORDS))
+            rows.append((i % 5000 + 1, i % 12 + 1, ' '.join(words)))
+        conn.executemany('INSERT INTO logbooks (student_id, week, entry) VALUES (?, ?, ?)', rows)
+        conn.commit()
+    conn.close()
+
+
+def time_ms(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def like_search(db, word, student_id=None):
+    conn = db.get_connection()
+    sql = 'SELECT id FROM logbooks WHERE entry LIKE ?'
+    params = [f'%{word}%']
+    if student_id is not None:
+        sql += ' AND student_id = ?'
+        params.append(student_id)
+    rows = conn.execute(sql + ' LIMIT 20', params).fetchall()
+    conn.close()
+    return rows
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        start = time.perf_counter()
+        populate(db, count)
+        print(f"Inserted {count} entries (FTS kept in sync by triggers) in {time.perf_counter() - start:.1f} s")
+        
+        cases = [
+            ('rare term', lambda: db.search_logbooks('kubernetes'), lambda: like_search(db, 'kubernetes')),
+            ('rare term, page 5', lambda: db.search_logbooks('kubernetes', page=5), None),
+            ('two rare terms', lambda: db.search_logbooks('kubernetes hydrology'), None),
+            ('prefix', lambda: db.search_logbooks('photogram*'), lambda: like_search(db, 'photogram')),
+            ('rare term, one student', lambda: db.search_logbooks('oscilloscope', student_id=1),
+             lambda: like_search(db, 'oscilloscope', student_id=1)),
+            ('absent term', lambda: db.search_logbooks('blockchain'), lambda: like_search(db, 'blockchain')),
+            ('common term', lambda: db.search_logbooks('firewall'), lambda: like_search(db, 'firewall')),
+            ('common term, recent', lambda: db.search_logbooks('firewall', order='recent'), None),
+            ('common term, one student', lambda: db.search_logbooks('firewall', student_id=1),
+             lambda: like_search(db, 'firewall', student_id=1)),
+        ]
+        for label, fts, like in cases:
+            line = f"{label:<24} FTS5 {time_ms(fts):9.2f} ms"
+            if like:
+                line += f"   LIKE {time_ms(like, repeat=1):9.2f} ms"
+            print(line)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark notification broadcasts, unread counts and mark-all-read.
+
+Run from the repository root: python benchmarks/bench_notifications.py [recipients]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<42} {(time.perf_counter() - start) * 1000:9.2f} ms")
+    return result
+
+
+if __name__ == '__main__':
+    recipients = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        conn = db.get_connection()
+        conn.executemany(
+            'INSERT INTO users (name, email, password, role) VALUES (?, ?, ?, ?)',
+            ((f'Student {i}', f'student{i}@example.com', 'hash', 'student') for i in range(recipients))
+        )
+        conn.commit()
+        user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE role = 'student'")]
+        conn.close()
+        
+        timed(f'broadcast to {len(user_ids)} user_ids (executemany)',
+              lambda: db.broadcast_notification('Logbooks due Friday', user_ids=user_ids))
+        timed(f'broadcast to role=student ({len(user_ids)} rows)',
+              lambda: db.broadcast_notification('Term starts Monday', role='student'))
+        for _ in range(20):
+            db.broadcast_notification('Reminder', user_ids=user_ids[:1])
+        timed('unread count for one user', lambda: db.get_unread_count(user_ids[0]))
+        timed('first page for one user', lambda: db.get_notifications(user_ids[0]))
+        timed('mark all read for one user', lambda: db.mark_all_notifications_read(user_ids[0]))
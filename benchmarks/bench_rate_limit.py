@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request overhead of the token bucket rate limiter.
+
+Run from the repository root: python benchmarks/bench_rate_limit.py
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+from rate_limit import RateLimiter
+
+ROUNDS = 5000
+
+
+def per_call_us(fn, number=ROUNDS):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+class NoLimit:
+    def check(self, endpoint, role, identity):
+        return None
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        limiter = RateLimiter(os.path.join(tmp, 'ratelimit.db'), limits={'*': {'*': (10 ** 9, 10 ** 9)}})
+        consume = per_call_us(lambda: limiter.check('slots', None, 'ip:127.0.0.1'))
+        many_keys = iter(range(10 ** 9))
+        consume_new = per_call_us(lambda: limiter.check('slots', None, f'ip:{next(many_keys)}'))
+        
+        client = app_module.app.test_client()
+        app_module.rate_limiter = NoLimit()
+        without = per_call_us(lambda: client.get('/api/slots').close(), number=1000)
+        app_module.rate_limiter = limiter
+        with_limit = per_call_us(lambda: client.get('/api/slots').close(), number=1000)
+    
+    print(f"RateLimiter.check, existing bucket   {consume:8.1f} us")
+    print(f"RateLimiter.check, new bucket        {consume_new:8.1f} us")
+    print(f"GET /api/slots without limiter       {without:8.1f} us")
+    print(f"GET /api/slots with limiter          {with_limit:8.1f} us")
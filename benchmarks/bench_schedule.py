@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark the booking overlap check against scanning the user's booking
+history, and get_schedule for a student with a long history.
+
+Run from the repository root: python benchmarks/bench_schedule.py [slots] [bookings_per_user]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+TIMES = ['08:00-10:00', '09:00-12:00', '11:00-13:00', '14:00-17:00', '18:00-21:00']
+USERS = 200
+
+HISTORY_SCAN = '''
+    SELECT s.id FROM bookings b
+    JOIN slots s ON s.id = b.slot_id
+    WHERE b.user_id = ?
+'''
+
+
+def populate(db, slots, bookings_per_user, rng):
+    conn = db.get_connection()
+    conn.executemany('INSERT INTO slots (name, date, time, max_capacity) VALUES (?, ?, ?, ?)', (
+        (f'Session {i}', (date(2024, 1, 1) + timedelta(days=i // len(TIMES))).isoformat(), TIMES[i % len(TIMES)], 50)
+        for i in range(slots)
+    ))
+    conn.executemany('INSERT INTO bookings (user_id, slot_id) VALUES (?, ?)', (
+        (user_id, rng.randrange(1, slots + 1))
+        for user_id in range(1, USERS + 1) for _ in range(bookings_per_user)
+    ))
+    conn.commit()
+    conn.close()
+
+
+def per_call_ms(fn, number=200):
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number * 1000
+
+
+def history_scan(conn, user_id, start_at, end_at):
+    """The check without the interval index: load every booked slot, compare in Python"""
+    slot_ids = [row[0] for row in conn.execute(HISTORY_SCAN, (user_id,))]
+    placeholders = ','.join('?' * len(slot_ids))
+    rows = conn.execute(f'SELECT start_at, end_at FROM slots WHERE id IN ({placeholders})', slot_ids)
+    return any(s < end_at and e > start_at for s, e in rows)
+
+
+def indexed_check(conn, user_id, start_at, end_at):
+    return conn.execute('''
+        SELECT s.id FROM slots s
+        CROSS JOIN bookings b ON b.slot_id = s.id AND b.user_id = ?
+        WHERE s.start_at > datetime(?, '-1 day') AND s.start_at < ? AND s.end_at > ?
+        LIMIT 1
+    ''', (user_id, start_at, end_at, start_at)).fetchone() is not None
+
+
+if __name__ == '__main__':
+    slots = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    bookings_per_user = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        populate(db, slots, bookings_per_user, rng)
+        print(f"{slots} slots, {USERS} users x {bookings_per_user} bookings")
+
+        conn = db.get_connection()
+        probes = conn.execute('SELECT start_at, end_at FROM slots ORDER BY random() LIMIT 200').fetchall()
+        probe = iter(probes * 10)
+
+        def run(check):
+            start_at, end_at = next(probe)
+            return check(conn, rng.randrange(1, USERS + 1), start_at, end_at)
+
+        print(f"overlap check, history scan       {per_call_ms(lambda: run(history_scan)):8.3f} ms")
+        print(f"overlap check, interval index     {per_call_ms(lambda: run(indexed_check)):8.3f} ms")
+        conn.close()
+        print(f"get_schedule, {bookings_per_user} bookings        "
+              f"{per_call_ms(lambda: db.get_schedule(rng.randrange(1, USERS + 1)), number=50):8.3f} ms")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark create_booking latency while reporting threads run
+get_all_attendance: rollback journal vs WAL vs the analytics snapshot.
+
+Run from the repository root: python benchmarks/bench_snapshot.py [rows] [readers]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+BOOKINGS = 200
+
+
+def populate(db, rows, rng):
+    conn = db.get_connection()
+    conn.executemany(
+        'INSERT INTO attendance (user_id, slot_id, date, status) VALUES (?, ?, ?, ?)',
+        ((i % 5000 + 1, i // 5000 % 20 + 1, (date(2025, 1, 6) + timedelta(days=i // 100000)).isoformat(),
+          rng.choice(['present', 'late', 'absent'])) for i in range(rows))
+    )
+    # The latency runs book sample slot 1 over and over
+    conn.execute('UPDATE slots SET max_capacity = 1000000 WHERE id = 1')
+    conn.commit()
+    conn.close()
+
+
+def booking_latencies(db, readers, first_user):
+    stop = threading.Event()
+    reads = []
+
+    def report():
+        while not stop.is_set():
+            db.get_all_attendance()
+            reads.append(1)
+
+    threads = [threading.Thread(target=report) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+
+    latencies = []
+    for i in range(BOOKINGS):
+        start = time.perf_counter()
+        db.create_booking(first_user + i, 1)
+        latencies.append(time.perf_counter() - start)
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return latencies, len(reads)
+
+
+def report_line(label, latencies, reads):
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<20} p50 {statistics.median(latencies) * 1000:8.2f} ms"
+          f"   p95 {p95 * 1000:8.2f} ms   max {latencies[-1] * 1000:8.2f} ms   reports {reads}")
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        db = Database(path)
+        populate(db, rows, rng)
+        print(f"{rows} attendance rows, {readers} reporting threads, {BOOKINGS} bookings")
+
+        conn = db.get_connection()
+        conn.execute('PRAGMA journal_mode=DELETE')
+        conn.close()
+        report_line('rollback journal', *booking_latencies(db, readers, 1))
+
+        conn = db.get_connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.close()
+        report_line('WAL', *booking_latencies(db, readers, 1 + BOOKINGS))
+
+        snapshot_db = Database(path, snapshot_path=os.path.join(tmp, 'analytics.db'))
+        elapsed = snapshot_db.refresh_snapshot()
+        print(f"snapshot refresh: {elapsed * 1000:.2f} ms")
+        report_line('WAL + snapshot', *booking_latencies(snapshot_db, readers, 1 + 2 * BOOKINGS))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request cost of the dashboard route with and without the
+rendered page cache.
+
+Run from the repository root: python benchmarks/bench_template_render.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import render_template
+
+import app as app_module
+
+ROUNDS = 2000
+
+
+def per_call_us(fn):
+    return min(timeit.repeat(fn, number=ROUNDS, repeat=5)) / ROUNDS * 1e6
+
+
+if __name__ == '__main__':
+    flask_app = app_module.app
+    client = flask_app.test_client()
+    
+    with flask_app.test_request_context('/student'):
+        jinja_render = per_call_us(lambda: render_template('dashboard.html'))
+        app_module.page_cache.clear()
+        app_module.render_static_page('dashboard.html')
+        cached_render = per_call_us(lambda: app_module.render_static_page('dashboard.html'))
+    
+    def uncached_request():
+        app_module.page_cache.clear()
+        client.get('/student').close()
+    
+    etag = client.get('/student').headers['ETag']
+    uncached = per_call_us(uncached_request)
+    cached = per_call_us(lambda: client.get('/student').close())
+    not_modified = per_call_us(lambda: client.get('/student', headers={'If-None-Match': etag}).close())
+    
+    print(f"render_template('dashboard.html')   {jinja_render:8.1f} us")
+    print(f"render_static_page (cache hit)      {cached_render:8.1f} us")
+    print(f"GET /student, cache cleared         {uncached:8.1f} us")
+    print(f"GET /student, cache hit             {cached:8.1f} us")
+    print(f"GET /student, If-None-Match -> 304  {not_modified:8.1f} us")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Measure peak Python memory and throughput while streaming a large upload.
+
+Run from the repository root: python benchmarks/bench_upload_memory.py [megabytes]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+from database import Database
+from file_store import FileStore
+from session_store import SessionStore
+
+
+class GeneratedBody:
+    """A request body produced on the fly, so the client holds none of it"""
+
+    def __init__(self, size):
+        self.size = size
+        self.position = 0
+        self.block = os.urandom(1024 * 1024)
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=0):
+        self.position = offset if whence == 0 else self.size + offset
+
+    def read(self, n=-1):
+        remaining = self.size - self.position
+        n = remaining if n < 0 else min(n, remaining)
+        n = min(n, len(self.block))
+        self.position += n
+        return self.block[:n]
+
+
+if __name__ == '__main__':
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 45
+    size = megabytes * 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        app_module.db = db
+        app_module.session_store = SessionStore(db)
+        app_module.file_store = FileStore(os.path.join(tmp, 'uploads'))
+        client = app_module.app.test_client()
+        client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+        
+        tracemalloc.start()
+        start = time.perf_counter()
+        response = client.post('/api/uploads', input_stream=GeneratedBody(size),
+                               content_type='application/octet-stream',
+                               headers={'Content-Length': str(size)})
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    
+    print(f"status {response.status_code}, {megabytes} MB in {elapsed:.2f} s "
+          f"({megabytes / elapsed:.0f} MB/s), peak traced memory {peak / 1024 / 1024:.2f} MB "
+          f"(includes the 1 MB generator block)")
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+# Keep the app's module-level database off database.db
+os.environ.setdefault('DATABASE_PATH', ':memory:')
+
+import app as app_module
+from database import Database
+from rate_limit import RateLimiter
+from session_store import SessionStore
+
+
+@pytest.fixture(autouse=True)
+def rate_limiter(tmp_path, monkeypatch):
+    """Give every test its own empty set of rate limit buckets"""
+    limiter = RateLimiter(str(tmp_path / 'ratelimit.db'))
+    monkeypatch.setattr(app_module, 'rate_limiter', limiter)
+    return limiter
+
+
+@pytest.fixture(scope='session')
+def template_db(tmp_path_factory):
+    """A migrated database with sample data, built once per test process"""
+    path = str(tmp_path_factory.mktemp('template') / 'template.db')
+    Database(path)
+    return path
+
+
+def install_database(monkeypatch, db):
+    monkeypatch.setattr(app_module, 'db', db)
+    monkeypatch.setattr(app_module, 'session_store', SessionStore(db))
+    return db
+
+
+@pytest.fixture
+def db(template_db, tmp_path, monkeypatch):
+    """A private in-memory copy of the template, installed as the app's database"""
+    return install_database(monkeypatch, Database(
+        ':memory:', snapshot_path=str(tmp_path / 'analytics.db'),
+        archive_dir=str(tmp_path / 'archives'), template=template_db
+    ))
+
+
+@pytest.fixture
+def file_db(template_db, tmp_path, monkeypatch):
+    """Like db, but on disk, for tests that share it with other connections or processes"""
+    return install_database(monkeypatch, Database(
+        str(tmp_path / 'test.db'), snapshot_path=str(tmp_path / 'analytics.db'),
+        archive_dir=str(tmp_path / 'archives'), template=template_db
+    ))
+
+
+@pytest.fixture
+def client(db):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def login(db):
+    """Log in and return the test client, a new one unless client is given.
+    
+    Passing client switches an existing client to another user.
+    """
+    def login(email='john@student.com', password='password123', client=None):
+        client = client or app_module.app.test_client()
+        response = client.post('/api/login', json={'email': email, 'password': password})
+        assert response.status_code == 200, response.get_json()
+        return client
+    return login
@@ -1,19 +1,274 @@
 import sqlite3
 import hashlib
-from datetime import datetime
+import html
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from urllib.parse import quote
+from datetime import datetime, date as date_type, timedelta
+
+# Attendance statuses that count as attending when computing rates
+ATTENDED_STATUSES = ('present', 'late')
+
+# How long revoked sessions stay in the revocation log before purge_sessions
+# drops them. A worker that has not looked at the log for longer than this
+# drops its whole session cache.
+SESSION_REVOCATION_RETENTION = 24 * 60 * 60
+
+
+def _slot_clock_sql(part):
+    """SQL for the 'HH:MM:SS' of one side of a slot time, NULL if it does not parse.
+    
+    Accepts 24-hour 'HH:MM' and the usual hand-typed variants: single-digit
+    hours ('9:00'), bare hours ('9'), '.' for ':' ('9.30') and am/pm
+    ('9am', '2:30 PM').
+    """
+    text = f"lower(trim({part}))"
+    bare = f"trim(replace(replace(replace({text}, 'am', ''), 'pm', ''), '.', ':'))"
+    padded = f"({bare} || CASE WHEN instr({bare}, ':') THEN '' ELSE ':00' END)"
+    clock = f"time(CASE WHEN instr({padded}, ':') = 2 THEN '0' || {padded} ELSE {padded} END)"
+    return (f"time({clock}, CASE WHEN {text} LIKE '%pm' AND {clock} < '12:00' THEN '+12 hours' "
+            f"WHEN {text} LIKE '%am' AND {clock} >= '12:00' THEN '-12 hours' ELSE '+0 hours' END)")
+
+
+# Slot start and end datetimes parsed from date and an 'HH:MM-HH:MM' time,
+# see _slot_clock_sql. Both are NULL unless both sides parse. {row} is
+# 'NEW.' inside triggers. Bump SLOT_INTERVAL_VERSION whenever the parsing
+# changes so existing databases rebuild their triggers and re-parse slots.
+SLOT_INTERVAL_VERSION = 2
+_SLOT_START_CLOCK = _slot_clock_sql("substr({row}time, 1, instr({row}time, '-') - 1)")
+_SLOT_END_CLOCK = _slot_clock_sql("substr({row}time, instr({row}time, '-') + 1)")
+SLOT_START_SQL = (f"CASE WHEN instr({{row}}time, '-') AND {_SLOT_END_CLOCK} IS NOT NULL "
+                  f"THEN datetime({{row}}date || ' ' || {_SLOT_START_CLOCK}) END")
+SLOT_END_SQL = (f"CASE WHEN instr({{row}}time, '-') AND {_SLOT_START_CLOCK} IS NOT NULL "
+                f"THEN datetime({{row}}date || ' ' || {_SLOT_END_CLOCK}) END")
+
+
+class BookingConflict(Exception):
+    """Raised by create_booking when the user already holds an overlapping slot"""
+    
+    def __init__(self, slot):
+        super().__init__(f"Overlaps your booking for {slot['name']} on {slot['date']} at {slot['time']}")
+        self.slot = slot
+
+
+class SlotFull(Exception):
+    """Raised by create_booking when the slot has no places left"""
+    
+    def __init__(self):
+        super().__init__('Slot is full')
+
+
+class _BorrowedConnection:
+    """The read_transaction connection as handed to Database methods.
+    
+    Methods commit and close the connection they are given, which must not
+    end the shared transaction, so those calls are no-ops here.
+    """
+    
+    def __init__(self, conn):
+        object.__setattr__(self, '_conn', conn)
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        pass
+    
+    def close(self):
+        self._conn.row_factory = None
+
 
 class Database:
-    def __init__(self, db_path='database.db'):
+    # Relevance-ordered logbook searches rank at most this many of the newest
+    # matches, see search_logbooks
+    LOGBOOK_RANK_CANDIDATES = 1000
+    
+    # Columns shown in the admin view, keyed by table. Only these columns can
+    # be selected or sorted on, so table and column names never come from the
+    # request directly.
+    ADMIN_TABLES = {
+        'users': ('id', 'name', 'email', 'role', 'created_at'),
+        'slots': ('id', 'name', 'date', 'time', 'max_capacity', 'booked_count'),
+        'bookings': ('id', 'user_id', 'slot_id', 'booked_at'),
+        'attendance': ('id', 'user_id', 'slot_id', 'date', 'status')
+    }
+    
+    # The admin view columns that lead an index, so every page is an index
+    # range scan whichever of them the table is sorted on
+    ADMIN_SORT_COLUMNS = {
+        'users': ('id', 'email', 'created_at'),
+        'slots': ('id', 'date'),
+        'bookings': ('id', 'booked_at'),
+        'attendance': ('id', 'date')
+    }
+
+    def __init__(self, db_path='database.db', snapshot_path=None, archive_dir='archives', template=None,
+                 seed=True, snapshot_max_age=None):
+        """Open the database at db_path, creating and migrating it as needed.
+        
+        db_path may be ':memory:' for a private in-memory database. Given a
+        template, the database starts as a copy of it instead of being
+        initialized, see copy_from. seed=False skips the sample data, for
+        processes such as job workers that only use an existing database.
+        """
         self.db_path = db_path
-        self.initialize_database()
+        self._uri = None
+        if db_path == ':memory:':
+            # A named shared-cache database, so every connection this instance
+            # opens sees the same data. It lives as long as _keeper is open.
+            self._uri = f'file:memdb-{uuid.uuid4().hex}?mode=memory&cache=shared'
+            self._keeper = self._connect()
+        # Read-only copy of the database for heavy reporting queries, see
+        # refresh_snapshot. None sends every read to the live database, as
+        # does a snapshot older than snapshot_max_age seconds.
+        self.snapshot_path = snapshot_path
+        self.snapshot_max_age = snapshot_max_age
+        # Archive database written by archive_term, shared by every term
+        self.archive_dir = archive_dir
+        self.archive_path = os.path.join(archive_dir, 'archive.db')
+        # Per-thread pooled connection and active read_transaction
+        self._local = threading.local()
+        if template:
+            self.copy_from(template)
+        else:
+            self.initialize_database(seed=seed)
     
-    def get_connection(self):
+    def _connect(self):
+        if self._uri:
+            return sqlite3.connect(self._uri, uri=True)
         return sqlite3.connect(self.db_path)
     
+    def get_connection(self):
+        transaction = getattr(self._local, 'transaction', None)
+        if transaction is not None:
+            return transaction
+        return self._connect()
+    
+    def copy_from(self, path):
+        """Overwrite this database with the one at path using SQLite's backup API.
+        
+        Copying a migrated template is much cheaper than running
+        initialize_database, which is what test fixtures rely on.
+        """
+        source = sqlite3.connect(path)
+        target = self._connect()
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+    
+    @contextmanager
+    def read_transaction(self):
+        """Run every Database call in the block in one read transaction.
+        
+        Calls share this thread's pooled connection, so they all see the
+        same committed state. Reads that go to the snapshot (see
+        get_read_connection) share a second read transaction on it, so a
+        batch reads from the same places as standalone calls and neither
+        source changes under it. Anything written inside the block is
+        rolled back.
+        """
+        if getattr(self._local, 'transaction', None) is not None:
+            yield
+            return
+        
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn = self._local.connection = self._connect()
+        self._attach_archives(conn)
+        conn.execute('BEGIN')
+        snapshot = self._connect_snapshot()
+        if snapshot is not None:
+            snapshot.execute('BEGIN')
+            # Take the read lock now rather than at the first snapshot read
+            snapshot.execute('SELECT 1 FROM sqlite_master LIMIT 1').fetchall()
+        self._local.transaction = _BorrowedConnection(conn)
+        self._local.snapshot_transaction = snapshot and _BorrowedConnection(snapshot)
+        try:
+            yield
+        finally:
+            self._local.transaction = None
+            self._local.snapshot_transaction = None
+            conn.rollback()
+            if snapshot is not None:
+                snapshot.close()
+    
+    def get_read_connection(self):
+        """Connection for heavy read-only queries.
+        
+        This is the snapshot when there is one recent enough. When the
+        snapshot is missing, or older than snapshot_max_age (for example
+        because its refresher has stopped), reads go to the live database.
+        Inside read_transaction it is that transaction's connection to
+        whichever of the two it started on.
+        """
+        if getattr(self._local, 'transaction', None) is not None:
+            return self._local.snapshot_transaction or self._local.transaction
+        return self._connect_snapshot() or self.get_connection()
+    
+    def _connect_snapshot(self):
+        """Read-only connection to the snapshot, or None if it is missing or too old"""
+        age = self.snapshot_age()
+        if age is None or (self.snapshot_max_age is not None and age > self.snapshot_max_age):
+            return None
+        try:
+            return sqlite3.connect(f'file:{quote(os.path.abspath(self.snapshot_path))}?mode=ro', uri=True)
+        except sqlite3.OperationalError:
+            # Removed since snapshot_age looked
+            return None
+    
+    def refresh_snapshot(self):
+        """Copy the live database to the snapshot with SQLite's online backup API.
+        
+        The live database is in WAL mode, so the copy reads one consistent
+        state without blocking writers. It is written to a temporary file
+        and renamed over the snapshot, so readers see either the old or the
+        new copy and never a partial one. Returns the time taken in seconds.
+        """
+        if not self.snapshot_path:
+            raise ValueError('No snapshot path configured')
+        
+        start = time.perf_counter()
+        tmp_path = f'{self.snapshot_path}.{os.getpid()}.tmp'
+        source = self.get_connection()
+        target = sqlite3.connect(tmp_path)
+        try:
+            source.backup(target)
+            # The copy is a standalone file that is only ever opened read-only
+            target.execute('PRAGMA journal_mode=DELETE')
+        finally:
+            target.close()
+            source.close()
+        os.replace(tmp_path, self.snapshot_path)
+        return time.perf_counter() - start
+    
+    def snapshot_age(self):
+        """Seconds since the snapshot was refreshed, or None if there is none"""
+        if not self.snapshot_path:
+            return None
+        try:
+            return time.time() - os.path.getmtime(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+    
     def create_tables(self):
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        # WAL lets readers, including snapshot backups, run alongside writers
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
         # Users table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -64,13 +319,371 @@ class Database:
             )
         ''')
         
+        # Indexes backing the ORDER BY columns used by listings and the admin view
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_created_at ON users (created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_slots_date_time ON slots (date, time)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_bookings_booked_at ON bookings (booked_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance (date)')
+        
+        # Slot intervals for overlap checks. Triggers keep them in step with
+        # date and time; overnight slots end on the next day.
+        self._add_column(cursor, 'slots', 'start_at', 'TEXT')
+        self._add_column(cursor, 'slots', 'end_at', 'TEXT')
+        set_interval = (
+            f'UPDATE slots SET start_at = {SLOT_START_SQL.format(row="")}, '
+            f'end_at = {SLOT_END_SQL.format(row="")} WHERE {{where}}',
+            "UPDATE slots SET end_at = datetime(end_at, '+1 day') WHERE ({where}) AND end_at <= start_at"
+        )
+        # The trigger names carry SLOT_INTERVAL_VERSION, so they are only
+        # rebuilt, and every slot re-parsed, when the parser changes. Checking
+        # and rebuilding under one write lock lets every worker open the
+        # database at once without racing or leaving slots unparsed.
+        triggers = {f'slots_interval_{event.split()[0].lower()}_v{SLOT_INTERVAL_VERSION}': event
+                    for event in ('INSERT', 'UPDATE OF date, time')}
+        conn.commit()
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name GLOB 'slots_interval_*'")
+        existing = {row[0] for row in cursor.fetchall()}
+        if existing != set(triggers):
+            for name in existing - set(triggers):
+                cursor.execute(f'DROP TRIGGER {name}')
+            for name, event in triggers.items():
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {name}
+                    AFTER {event} ON slots
+                    BEGIN
+                        {'; '.join(statement.format(where='id = NEW.id') for statement in set_interval)};
+                    END
+                ''')
+            for statement in set_interval:
+                cursor.execute(statement.format(where='1'))
+        conn.commit()
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_slots_interval ON slots (start_at, end_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_bookings_slot_user ON bookings (slot_id, user_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_bookings_user ON bookings (user_id)')
+        
+        # Table versions, bumped by triggers on every write so cached views
+        # can tell when a table changed, whichever worker wrote to it. Row
+        # counts are kept the same way so the admin view never runs COUNT(*).
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS table_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0,
+                row_count INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        for table in self.ADMIN_TABLES:
+            cursor.execute(f'''
+                INSERT OR IGNORE INTO table_versions (name, version, row_count)
+                VALUES (?, 0, (SELECT COUNT(*) FROM {table}))
+            ''', (table,))
+            for event, delta in (('INSERT', '+ 1'), ('DELETE', '- 1')):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {table}_row_count_{event.lower()}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE table_versions SET row_count = row_count {delta}
+                        WHERE name = '{table}';
+                    END
+                ''')
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE table_versions SET version = version + 1
+                        WHERE name = '{table}';
+                    END
+                ''')
+        
+        # Logbooks table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS logbooks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                student_id INTEGER NOT NULL,
+                week INTEGER NOT NULL,
+                entry TEXT NOT NULL,
+                verified_by INTEGER,
+                verified_on TIMESTAMP NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (student_id) REFERENCES users (id),
+                FOREIGN KEY (verified_by) REFERENCES users (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_logbooks_student_week ON logbooks (student_id, week)')
+        
+        # Full-text index over logbook entries, kept in sync by triggers.
+        # Entries written before the index existed are indexed by a rebuild.
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'logbooks_fts'")
+        fts_exists = cursor.fetchone() is not None
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS logbooks_fts USING fts5(
+                entry,
+                content='logbooks',
+                content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        ''')
+        if not fts_exists:
+            cursor.execute("INSERT INTO logbooks_fts (logbooks_fts) VALUES ('rebuild')")
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS logbooks_fts_insert AFTER INSERT ON logbooks
+            BEGIN
+                INSERT INTO logbooks_fts (rowid, entry) VALUES (new.id, new.entry);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS logbooks_fts_delete AFTER DELETE ON logbooks
+            BEGIN
+                INSERT INTO logbooks_fts (logbooks_fts, rowid, entry) VALUES ('delete', old.id, old.entry);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS logbooks_fts_update AFTER UPDATE OF entry ON logbooks
+            BEGIN
+                INSERT INTO logbooks_fts (logbooks_fts, rowid, entry) VALUES ('delete', old.id, old.entry);
+                INSERT INTO logbooks_fts (rowid, entry) VALUES (new.id, new.entry);
+            END
+        ''')
+        
+        # Uploaded files. Content lives in the file store under its sha256
+        # digest; each upload of it gets its own row.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS uploads (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                filename TEXT,
+                content_type TEXT,
+                uploaded_by INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (uploaded_by) REFERENCES users (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_uploads_digest_user ON uploads (digest, uploaded_by)')
+        
+        # Final reports; report_file and logbook_file hold upload digests
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS final_reports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                student_id INTEGER NOT NULL,
+                report_file TEXT NOT NULL,
+                logbook_file TEXT NOT NULL,
+                submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (student_id) REFERENCES users (id)
+            )
+        ''')
+        
+        # Return forms; insurance_form holds an upload digest
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS return_forms (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                student_id INTEGER NOT NULL,
+                company TEXT NOT NULL,
+                location TEXT NOT NULL,
+                supervisor_name TEXT NOT NULL,
+                supervisor_email TEXT NOT NULL,
+                supervisor_phone TEXT,
+                insurance_form TEXT,
+                submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (student_id) REFERENCES users (id)
+            )
+        ''')
+        
+        # Notifications
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notifications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                message TEXT NOT NULL,
+                is_read INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            )
+        ''')
+        # Listing walks (user_id, id) newest first; unread counts and
+        # mark-all-read only touch the partial index of unread rows
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications (user_id, id)')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_notifications_unread
+            ON notifications (user_id, id) WHERE is_read = 0
+        ''')
+        
+        # Clusters/zones, with the location and number of students they take
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS clusters (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                location TEXT,
+                capacity INTEGER NOT NULL DEFAULT 0,
+                coordinator_id INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (coordinator_id) REFERENCES users (id)
+            )
+        ''')
+        
+        # Student-cluster assignment
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS student_clusters (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                student_id INTEGER NOT NULL UNIQUE,
+                cluster_id INTEGER NOT NULL,
+                assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (student_id) REFERENCES users (id),
+                FOREIGN KEY (cluster_id) REFERENCES clusters (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_student_clusters_cluster ON student_clusters (cluster_id)')
+        
+        # Supervisor mapping for students
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS supervisors (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                student_id INTEGER NOT NULL UNIQUE,
+                university_supervisor_id INTEGER,
+                industry_supervisor_id INTEGER,
+                assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (student_id) REFERENCES users (id),
+                FOREIGN KEY (university_supervisor_id) REFERENCES users (id),
+                FOREIGN KEY (industry_supervisor_id) REFERENCES users (id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_supervisors_university
+            ON supervisors (university_supervisor_id)
+        ''')
+        
+        # How many students each university supervisor takes, and where
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS supervisor_capacity (
+                user_id INTEGER PRIMARY KEY,
+                location TEXT,
+                capacity INTEGER NOT NULL,
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_return_forms_student ON return_forms (student_id)')
+        
+        # Attendance rollups: counts per status for each student, slot and the
+        # whole system, by day and by week (period_start is the Monday).
+        # Maintained by mark_attendance, rebuilt by rebuild_attendance_rollups.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS attendance_rollups (
+                scope TEXT NOT NULL,
+                scope_id INTEGER NOT NULL,
+                period TEXT NOT NULL,
+                period_start TEXT NOT NULL,
+                status TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (scope, scope_id, period, period_start, status)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_attendance_rollups_period
+            ON attendance_rollups (scope, period, period_start)
+        ''')
+        
+        # Background jobs. Times are unix timestamps; cache_key identifies the
+        # job kind, parameters and version of the input data.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                result TEXT,
+                error TEXT,
+                requested_by INTEGER,
+                available_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (requested_by) REFERENCES users (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, available_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_cache_key ON jobs (cache_key, status)')
+        
+        # Server-side sessions. expires_at is a unix timestamp.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sessions (
+                token TEXT PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                expires_at INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions (user_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)')
+        
+        # Academic terms. Once a term is archived its bookings and attendance
+        # live in archive_path; status goes open -> archiving -> archived.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS terms (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'open',
+                archive_path TEXT,
+                archived_at TIMESTAMP
+            )
+        ''')
+        
+        # Session revocations, one row per revoked token or changed user,
+        # numbered in order. Each worker reads past the last version it saw
+        # and drops just those entries from its session cache. A row with
+        # neither token nor user_id revokes every session.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS session_revocations (
+                version INTEGER PRIMARY KEY AUTOINCREMENT,
+                token TEXT,
+                user_id INTEGER,
+                revoked_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_revocations_revoked_at ON session_revocations (revoked_at)')
+        for event, row in (('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS users_session_revocations_{event.lower()}
+                AFTER {event} ON users
+                BEGIN
+                    INSERT INTO session_revocations (user_id) VALUES ({row}.id);
+                END
+            ''')
+        
         conn.commit()
         conn.close()
     
+    @staticmethod
+    def _add_column(cursor, table, column, definition):
+        """Add a column to an existing table unless it is already there.
+        
+        Returns True if the column was added.
+        """
+        cursor.execute(f'PRAGMA table_info({table})')
+        if column in [row[1] for row in cursor.fetchall()]:
+            return False
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+        return True
+    
     def add_sample_data(self):
+        """Seed sample users and slots into a new database.
+        
+        Tables that already have rows are left alone, so opening an existing
+        database again never adds duplicate slots.
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        cursor.execute('SELECT EXISTS (SELECT 1 FROM users), EXISTS (SELECT 1 FROM slots)')
+        has_users, has_slots = cursor.fetchone()
+        
         # Add sample users if they don't exist
         sample_users = [
             ('John Doe', 'john@student.com', hashlib.sha256('password123'.encode()).hexdigest(), 'student'),
@@ -79,11 +692,11 @@ class Database:
             ('Admin User', 'admin@example.com', hashlib.sha256('admin123'.encode()).hexdigest(), 'admin')
         ]
         
-        for user in sample_users:
-            cursor.execute('''
+        if not has_users:
+            cursor.executemany('''
                 INSERT OR IGNORE INTO users (name, email, password, role)
                 VALUES (?, ?, ?, ?)
-            ''', user)
+            ''', sample_users)
         
         # Add sample slots if they don't exist
         sample_slots = [
@@ -92,19 +705,20 @@ class Database:
             ('Evening Session', '2025-08-16', '18:00-21:00', 10)
         ]
         
-        for slot in sample_slots:
-            cursor.execute('''
-                INSERT OR IGNORE INTO slots (name, date, time, max_capacity)
+        if not has_slots:
+            cursor.executemany('''
+                INSERT INTO slots (name, date, time, max_capacity)
                 VALUES (?, ?, ?, ?)
-            ''', slot)
+            ''', sample_slots)
         
         conn.commit()
         conn.close()
     
-    def initialize_database(self):
-        """Initialize database with tables and sample data"""
+    def initialize_database(self, seed=True):
+        """Initialize database with tables and, unless seed is False, sample data"""
         self.create_tables()
-        self.add_sample_data()
+        if seed:
+            self.add_sample_data()
     
     # User methods
     def create_user(self, name, email, password, role):
@@ -162,6 +776,143 @@ class Database:
             for user in users
         ]
     
+    def get_total_users(self):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT COUNT(*) FROM users')
+        total = cursor.fetchone()[0]
+        
+        conn.close()
+        return total
+    
+    # Session methods
+    def create_session(self, token, user_id, expires_at):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO sessions (token, user_id, expires_at)
+            VALUES (?, ?, ?)
+        ''', (token, user_id, expires_at))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_session(self, token):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT s.token, s.expires_at, u.id, u.name, u.email, u.role
+            FROM sessions s
+            JOIN users u ON u.id = s.user_id
+            WHERE s.token = ?
+        ''', (token,))
+        row = cursor.fetchone()
+        
+        conn.close()
+        
+        if row:
+            return {
+                'token': row[0],
+                'expires_at': row[1],
+                'user': {
+                    'id': row[2],
+                    'name': row[3],
+                    'email': row[4],
+                    'role': row[5]
+                }
+            }
+        return None
+    
+    def delete_session(self, token):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM sessions WHERE token = ?', (token,))
+        cursor.execute('INSERT INTO session_revocations (token) VALUES (?)', (token,))
+        
+        conn.commit()
+        conn.close()
+    
+    def expire_sessions(self, user_ids=None, role=None, expired_before=None):
+        """Delete sessions in bulk and return how many were removed.
+        
+        With no filters every session is removed. user_ids, role and
+        expired_before narrow the selection and can be combined.
+        """
+        conditions = []
+        params = []
+        if user_ids is not None:
+            conditions.append(f"user_id IN ({', '.join('?' for _ in user_ids)})")
+            params.extend(user_ids)
+        if role is not None:
+            conditions.append('user_id IN (SELECT id FROM users WHERE role = ?)')
+            params.append(role)
+        if expired_before is not None:
+            conditions.append('expires_at <= ?')
+            params.append(expired_before)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if conditions:
+            cursor.execute(f'INSERT INTO session_revocations (token) SELECT token FROM sessions {where}', params)
+        else:
+            cursor.execute('INSERT INTO session_revocations DEFAULT VALUES')
+        cursor.execute(f'DELETE FROM sessions {where}', params)
+        removed = cursor.rowcount
+        
+        conn.commit()
+        conn.close()
+        return removed
+    
+    def purge_sessions(self, now=None):
+        """Delete expired sessions and revocations older than the retention period.
+        
+        Expired sessions are refused everywhere already, so they are dropped
+        without logging revocations. Returns how many sessions were removed.
+        """
+        now = int(time.time()) if now is None else now
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM sessions WHERE expires_at <= ?', (now,))
+        removed = cursor.rowcount
+        cursor.execute(
+            'DELETE FROM session_revocations WHERE revoked_at < ?',
+            (now - SESSION_REVOCATION_RETENTION,)
+        )
+        
+        conn.commit()
+        conn.close()
+        return removed
+    
+    def get_session_revocations(self, after=None):
+        """Return (oldest, latest, revocations) from the revocation log.
+        
+        oldest and latest are the first and last versions still logged (None
+        when the log is empty) and revocations lists (version, token, user_id)
+        for every entry past after.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT MIN(version), MAX(version) FROM session_revocations')
+        oldest, latest = cursor.fetchone()
+        revocations = []
+        if after is not None and latest is not None and latest > after:
+            cursor.execute('''
+                SELECT version, token, user_id FROM session_revocations
+                WHERE version > ? ORDER BY version
+            ''', (after,))
+            revocations = cursor.fetchall()
+        
+        conn.close()
+        return oldest, latest, revocations
+    
     # Slot methods
     def get_available_slots(self):
         conn = self.get_connection()
@@ -231,29 +982,113 @@ class Database:
     
     # Booking methods
     def create_booking(self, user_id, slot_id):
+        """Book a slot, raising SlotFull if it has no places left and
+        BookingConflict if the user holds an overlapping one"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            INSERT INTO bookings (user_id, slot_id)
-            VALUES (?, ?)
-        ''', (user_id, slot_id))
+        try:
+            # Hold the write lock so two overlapping bookings cannot both pass
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('SELECT start_at, end_at FROM slots WHERE id = ?', (slot_id,))
+            interval = cursor.fetchone()
+            
+            if interval and interval[0] and interval[1]:
+                # Range scan on idx_slots_interval; slots are at most a day long,
+                # so nothing starting earlier than that can overlap. CROSS JOIN
+                # keeps SQLite from walking the user's bookings instead.
+                cursor.execute('''
+                    SELECT s.id, s.name, s.date, s.time
+                    FROM slots s
+                    CROSS JOIN bookings b ON b.slot_id = s.id AND b.user_id = ?
+                    WHERE s.start_at > datetime(?, '-1 day') AND s.start_at < ? AND s.end_at > ?
+                    LIMIT 1
+                ''', (user_id, interval[0], interval[1], interval[0]))
+                conflict = cursor.fetchone()
+                if conflict:
+                    raise BookingConflict({
+                        'id': conflict[0],
+                        'name': conflict[1],
+                        'date': conflict[2],
+                        'time': conflict[3]
+                    })
+            
+            # Take a place only if one is left, under the same write lock
+            cursor.execute('''
+                UPDATE slots 
+                SET booked_count = booked_count + 1
+                WHERE id = ? AND booked_count < max_capacity
+            ''', (slot_id,))
+            if cursor.rowcount == 0:
+                raise SlotFull()
+            
+            cursor.execute('''
+                INSERT INTO bookings (user_id, slot_id)
+                VALUES (?, ?)
+            ''', (user_id, slot_id))
+            
+            booking_id = cursor.lastrowid
+            
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return booking_id
+    
+    def get_schedule(self, user_id, start=None, end=None):
+        """A user's booked slots in time order, each with the bookings it overlaps"""
+        conditions, params = ['b.user_id = ?'], [user_id]
+        if start:
+            conditions.append('s.end_at > ?')
+            params.append(start)
+        if end:
+            conditions.append('s.start_at < ?')
+            params.append(end)
         
-        booking_id = cursor.lastrowid
+        conn = self.get_connection()
+        cursor = conn.cursor()
         
-        # Update slot booked count
-        cursor.execute('''
-            UPDATE slots 
-            SET booked_count = booked_count + 1
-            WHERE id = ?
-        ''', (slot_id,))
+        cursor.execute(f'''
+            SELECT b.id, s.id, s.name, s.date, s.time, s.start_at, s.end_at
+            FROM bookings b
+            JOIN slots s ON s.id = b.slot_id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY s.start_at IS NULL, s.start_at, s.end_at
+        ''', params)
+        rows = cursor.fetchall()
         
-        conn.commit()
         conn.close()
-        return booking_id
+        
+        schedule = [
+            {
+                'booking_id': row[0],
+                'slot_id': row[1],
+                'name': row[2],
+                'date': row[3],
+                'time': row[4],
+                'start_at': row[5],
+                'end_at': row[6],
+                'conflicts': []
+            }
+            for row in rows
+        ]
+        
+        # Sweep in start order, keeping the bookings that are still running
+        active = []
+        for entry in schedule:
+            if entry['start_at'] is None or entry['end_at'] is None:
+                continue
+            active = [other for other in active if other['end_at'] > entry['start_at']]
+            for other in active:
+                other['conflicts'].append(entry['booking_id'])
+                entry['conflicts'].append(other['booking_id'])
+            active.append(entry)
+        return schedule
     
     def get_all_bookings(self):
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         cursor = conn.cursor()
         
         cursor.execute('SELECT * FROM bookings ORDER BY booked_at DESC')
@@ -276,18 +1111,155 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            INSERT OR REPLACE INTO attendance (user_id, slot_id, date, status)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, slot_id, date, status))
+        try:
+            # Take the write lock up front so the status read below cannot
+            # change before the rollups are adjusted
+            cursor.execute('BEGIN IMMEDIATE')
+            
+            # Archived rows are no longer in attendance, so re-marking them
+            # here would count them twice in the rollups
+            cursor.execute('''
+                SELECT name FROM terms
+                WHERE status != 'open' AND ? BETWEEN start_date AND end_date
+            ''', (date,))
+            term = cursor.fetchone()
+            if term:
+                raise ValueError(f"Term {term[0]} is archived")
+            
+            cursor.execute('''
+                SELECT status FROM attendance
+                WHERE user_id = ? AND slot_id = ? AND date = ?
+            ''', (user_id, slot_id, date))
+            previous = cursor.fetchone()
+            
+            cursor.execute('''
+                INSERT OR REPLACE INTO attendance (user_id, slot_id, date, status)
+                VALUES (?, ?, ?, ?)
+            ''', (user_id, slot_id, date, status))
+            attendance_id = cursor.lastrowid
+            
+            if previous:
+                self._update_attendance_rollups(cursor, user_id, slot_id, date, previous[0], -1)
+            self._update_attendance_rollups(cursor, user_id, slot_id, date, status, 1)
+            
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return attendance_id
+    
+    @staticmethod
+    def week_start(date):
+        """Monday of the week containing a YYYY-MM-DD date"""
+        day = date_type.fromisoformat(date)
+        return (day - timedelta(days=day.weekday())).isoformat()
+    
+    def _update_attendance_rollups(self, cursor, user_id, slot_id, date, status, delta):
+        week = self.week_start(date)
+        cursor.executemany('''
+            INSERT INTO attendance_rollups (scope, scope_id, period, period_start, status, count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (scope, scope_id, period, period_start, status)
+            DO UPDATE SET count = count + excluded.count
+        ''', [
+            (scope, scope_id, period, start, status, delta)
+            for scope, scope_id in (('student', user_id), ('slot', slot_id), ('all', 0))
+            for period, start in (('day', date), ('week', week))
+        ])
+    
+    def rebuild_attendance_rollups(self):
+        """Recompute every attendance rollup, archived terms included, in one transaction"""
+        week_start = "date(date, '-' || ((CAST(strftime('%w', date) AS INTEGER) + 6) % 7) || ' days')"
+        
+        conn = self.get_history_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('DELETE FROM attendance_rollups')
+            for scope, scope_id in (('student', 'user_id'), ('slot', 'slot_id'), ('all', '0')):
+                for period, start in (('day', 'date'), ('week', week_start)):
+                    cursor.execute(f'''
+                        INSERT INTO attendance_rollups (scope, scope_id, period, period_start, status, count)
+                        SELECT '{scope}', {scope_id}, '{period}', {start}, status, COUNT(*)
+                        FROM attendance_history
+                        GROUP BY 2, 4, status
+                    ''')
+            cursor.execute('SELECT COUNT(*) FROM attendance_rollups')
+            rows = cursor.fetchone()[0]
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return rows
+    
+    def get_attendance_rollups(self, scope, period='week', scope_id=None, start=None, end=None,
+                               limit=100, offset=0, use_snapshot=True):
+        """Attendance counts and rates from the rollups, one entry per scope_id and period.
+        
+        Give scope_id for one student or slot over time, or start (and end)
+        for every student or slot in a period range. Newest periods first.
+        Reads the analytics snapshot unless use_snapshot is False.
+        """
+        conditions = ['scope = ?', 'period = ?']
+        params = [scope, period]
+        if scope_id is not None:
+            conditions.append('scope_id = ?')
+            params.append(scope_id)
+        if start is not None:
+            conditions.append('period_start >= ?')
+            params.append(start)
+        if end is not None:
+            conditions.append('period_start <= ?')
+            params.append(end)
+        where = ' AND '.join(conditions)
+        
+        conn = self.get_read_connection() if use_snapshot else self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            SELECT r.scope_id, r.period_start, r.status, r.count
+            FROM attendance_rollups r
+            JOIN (
+                SELECT DISTINCT scope_id, period_start FROM attendance_rollups
+                WHERE {where} AND count > 0
+                ORDER BY period_start DESC, scope_id
+                LIMIT ? OFFSET ?
+            ) page USING (scope_id, period_start)
+            WHERE r.scope = ? AND r.period = ? AND r.count > 0
+            ORDER BY r.period_start DESC, r.scope_id
+        ''', params + [limit, offset, scope, period])
+        rows = cursor.fetchall()
         
-        attendance_id = cursor.lastrowid
-        conn.commit()
         conn.close()
-        return attendance_id
+        
+        results = []
+        for scope_id_value, period_start, status, count in rows:
+            if not results or results[-1]['scope_id'] != scope_id_value or \
+                    results[-1]['period_start'] != period_start:
+                results.append({
+                    'scope_id': scope_id_value,
+                    'period_start': period_start,
+                    'counts': {},
+                    'total': 0,
+                    'attended': 0
+                })
+            entry = results[-1]
+            entry['counts'][status] = count
+            entry['total'] += count
+            if status in ATTENDED_STATUSES:
+                entry['attended'] += count
+        
+        for entry in results:
+            entry['rate'] = round(entry['attended'] / entry['total'], 4) if entry['total'] else None
+        return results
     
     def get_all_attendance(self):
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         cursor = conn.cursor()
         
         cursor.execute('SELECT * FROM attendance ORDER BY date DESC')
@@ -306,20 +1278,224 @@ class Database:
             for record in attendance
         ]
     
-    # Report methods
-    def get_reports(self):
+    # Term archive methods
+    def create_term(self, name, start_date, end_date):
+        """Add a term covering start_date to end_date inclusive (YYYY-MM-DD)"""
+        if start_date > end_date:
+            raise ValueError('Term start must not be after its end')
+        
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        # Get counts
-        cursor.execute('SELECT COUNT(*) FROM users')
-        total_users = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM slots')
-        total_slots = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT name FROM terms WHERE start_date <= ? AND end_date >= ?
+        ''', (end_date, start_date))
+        overlapping = cursor.fetchone()
+        if overlapping:
+            conn.close()
+            raise ValueError(f"Term overlaps {overlapping[0]}")
         
-        cursor.execute('SELECT COUNT(*) FROM bookings')
-        total_bookings = cursor.fetchone()[0]
+        cursor.execute('''
+            INSERT INTO terms (name, start_date, end_date) VALUES (?, ?, ?)
+        ''', (name, start_date, end_date))
+        
+        term_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return term_id
+    
+    def get_terms(self):
+        conn = self.get_connection()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM terms ORDER BY start_date DESC')
+        terms = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        return terms
+    
+    def get_history_connection(self):
+        """Live connection with every term archive attached, see _attach_archives"""
+        if getattr(self._local, 'transaction', None) is not None:
+            # read_transaction attached them before it began
+            return self._local.transaction
+        conn = self.get_connection()
+        self._attach_archives(conn)
+        return conn
+    
+    def _attach_archives(self, conn):
+        """Attach the archive to conn if it is missing and (re)create the history views.
+        
+        The temp views bookings_history and attendance_history are the hot
+        table, UNION ALL the shared archive once any term has been archived.
+        """
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM terms WHERE status != 'open')")
+        archived = cursor.fetchone()[0]
+        attached = {row[1] for row in cursor.execute('PRAGMA database_list').fetchall()}
+        if archived and 'archive' not in attached:
+            cursor.execute('ATTACH DATABASE ? AS archive', (self.archive_path,))
+        for table in ('bookings', 'attendance'):
+            selects = [f'SELECT * FROM main.{table}'] + ([f'SELECT * FROM archive.{table}'] if archived else [])
+            cursor.execute(f'DROP VIEW IF EXISTS temp.{table}_history')
+            cursor.execute(f'CREATE TEMP VIEW {table}_history AS ' + ' UNION ALL '.join(selects))
+    
+    def archive_term(self, name, batch_size=5000):
+        """Move a term's bookings and attendance into its archive database.
+        
+        Every term goes into the shared archive_path. Bookings belong to
+        the term of their slot's date. Rows move in batches of batch_size,
+        each in its own short transaction, so bookings and attendance
+        marking carry on while a term is archived.
+        A transaction spanning a WAL database and an attached one is not
+        atomic across both files, so a crash can leave a batch copied but
+        not deleted. Archive rows keep their id as primary key and copies
+        skip ids already there, so re-running after an interruption is
+        safe. Returns the rows moved per table.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT id, start_date, end_date FROM terms WHERE name = ?', (name,))
+        term = cursor.fetchone()
+        if not term:
+            conn.close()
+            raise ValueError(f"Unknown term {name}")
+        term_id, start_date, end_date = term
+        
+        os.makedirs(self.archive_dir, exist_ok=True)
+        cursor.execute('ATTACH DATABASE ? AS archive', (self.archive_path,))
+        for table in ('bookings', 'attendance'):
+            self._create_archive_table(cursor, 'archive', table)
+        cursor.execute('CREATE INDEX IF NOT EXISTS archive.idx_bookings_user_id ON bookings (user_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS archive.idx_attendance_user_id ON attendance (user_id, date)')
+        cursor.execute('''
+            UPDATE terms SET status = 'archiving', archive_path = ?
+            WHERE id = ? AND status = 'open'
+        ''', (self.archive_path, term_id))
+        conn.commit()
+        
+        in_term = {
+            'bookings': 'slot_id IN (SELECT id FROM main.slots WHERE date BETWEEN ? AND ?)',
+            'attendance': 'date BETWEEN ? AND ?'
+        }
+        moved = {}
+        try:
+            cursor.execute('CREATE TEMP TABLE archive_batch (id INTEGER PRIMARY KEY)')
+            for table, condition in in_term.items():
+                moved[table] = 0
+                while True:
+                    cursor.execute('BEGIN IMMEDIATE')
+                    cursor.execute('DELETE FROM temp.archive_batch')
+                    cursor.execute(f'''
+                        INSERT INTO temp.archive_batch
+                        SELECT id FROM main.{table} WHERE {condition} LIMIT ?
+                    ''', (start_date, end_date, batch_size))
+                    count = cursor.rowcount
+                    if count:
+                        cursor.execute(f'''
+                            INSERT OR IGNORE INTO archive.{table}
+                            SELECT * FROM main.{table} WHERE id IN temp.archive_batch
+                        ''')
+                        cursor.execute(f'DELETE FROM main.{table} WHERE id IN temp.archive_batch')
+                    conn.commit()
+                    if not count:
+                        break
+                    moved[table] += count
+            
+            cursor.execute('''
+                UPDATE terms SET status = 'archived', archived_at = CURRENT_TIMESTAMP WHERE id = ?
+            ''', (term_id,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return moved
+    
+    @staticmethod
+    def _create_archive_table(cursor, schema, table):
+        """Create schema.table with the columns of main.table, keyed on id"""
+        cursor.execute(f'PRAGMA main.table_info({table})')
+        columns = ', '.join(
+            f"{name} {column_type}{' PRIMARY KEY' if pk else ''}"
+            for _, name, column_type, _, _, pk in cursor.fetchall()
+        )
+        cursor.execute(f'CREATE TABLE IF NOT EXISTS {schema}.{table} ({columns})')
+    
+    def get_booking_history(self, user_id=None):
+        """Bookings from the current and archived terms, newest first"""
+        conn = self.get_history_connection()
+        cursor = conn.cursor()
+        
+        if user_id is None:
+            cursor.execute('SELECT * FROM bookings_history ORDER BY booked_at DESC')
+        else:
+            cursor.execute('SELECT * FROM bookings_history WHERE user_id = ? ORDER BY booked_at DESC', (user_id,))
+        bookings = cursor.fetchall()
+        
+        conn.close()
+        
+        return [
+            {
+                'id': booking[0],
+                'user_id': booking[1],
+                'slot_id': booking[2],
+                'booked_at': booking[3]
+            }
+            for booking in bookings
+        ]
+    
+    def get_attendance_history(self, user_id=None, start=None, end=None):
+        """Attendance from the current and archived terms, newest first"""
+        conditions, params = [], []
+        if user_id is not None:
+            conditions.append('user_id = ?')
+            params.append(user_id)
+        if start:
+            conditions.append('date >= ?')
+            params.append(start)
+        if end:
+            conditions.append('date <= ?')
+            params.append(end)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        conn = self.get_history_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'SELECT * FROM attendance_history {where} ORDER BY date DESC', params)
+        attendance = cursor.fetchall()
+        
+        conn.close()
+        
+        return [
+            {
+                'id': record[0],
+                'user_id': record[1],
+                'slot_id': record[2],
+                'date': record[3],
+                'status': record[4]
+            }
+            for record in attendance
+        ]
+    
+    # Report methods
+    def get_reports(self):
+        conn = self.get_read_connection()
+        cursor = conn.cursor()
+        
+        # Get counts
+        cursor.execute('SELECT COUNT(*) FROM users')
+        total_users = cursor.fetchone()[0]
+        
+        cursor.execute('SELECT COUNT(*) FROM slots')
+        total_slots = cursor.fetchone()[0]
+        
+        cursor.execute('SELECT COUNT(*) FROM bookings')
+        total_bookings = cursor.fetchone()[0]
         
         cursor.execute('SELECT COUNT(*) FROM attendance')
         total_attendance = cursor.fetchone()[0]
@@ -360,3 +1536,792 @@ class Database:
                 for record in recent_attendance
             ]
         }
+
+    # Logbook methods
+    def create_logbook_entry(self, student_id, week, entry):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO logbooks (student_id, week, entry)
+            VALUES (?, ?, ?)
+        ''', (student_id, week, entry))
+        
+        entry_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return entry_id
+    
+    def verify_logbook_entry(self, entry_id, supervisor_id):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE logbooks
+            SET verified_by = ?, verified_on = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (supervisor_id, entry_id))
+        
+        updated = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return updated > 0
+    
+    @staticmethod
+    def build_fts_query(text):
+        """Turn free text into an FTS5 query matching all of its words.
+        
+        Every word is quoted so user input can never be parsed as FTS5
+        syntax; a trailing * is kept as a prefix search.
+        """
+        terms = []
+        for word in text.split():
+            prefix = word.endswith('*')
+            word = word.rstrip('*').replace('"', '""')
+            if word:
+                terms.append(f'"{word}"' + ('*' if prefix else ''))
+        return ' '.join(terms)
+    
+    @staticmethod
+    def highlight_snippet(snippet):
+        """Escape a search snippet and wrap the matched terms in <mark>"""
+        return html.escape(snippet).replace('\x02', '<mark>').replace('\x03', '</mark>')
+    
+    def search_logbooks(self, text, student_id=None, week=None, verified=None, page=1, per_page=20,
+                        order='rank'):
+        """Full-text search over logbook entries.
+        
+        Results are ordered by bm25 relevance, or newest first with
+        order='recent'. Ranking scores every candidate, so only the newest
+        LOGBOOK_RANK_CANDIDATES matches are ranked and a term found in a
+        large share of all entries costs about as much as a rare one;
+        truncated is True when older matches were left out, which
+        order='recent' still reaches. Listing by recency walks the index in
+        rowid order and stops after one page. With a student_id only that
+        student's entries are candidates: the index is read over the range
+        of their rowids and nothing else is scored. One extra row is fetched
+        to report has_more instead of counting every match.
+        """
+        query = self.build_fts_query(text)
+        if not query:
+            return {'results': [], 'page': page, 'per_page': per_page, 'order': order, 'has_more': False,
+                    'truncated': False}
+        
+        conditions = ['logbooks_fts MATCH ?']
+        params = [query]
+        entry_conditions = []
+        entry_params = []
+        if student_id is not None:
+            # The unary + keeps the IN list out of the FTS lookup, which would
+            # otherwise redo bm25's whole-index statistics for every rowid
+            conditions.append('''logbooks_fts.rowid BETWEEN
+                (SELECT MIN(id) FROM logbooks WHERE student_id = ?) AND
+                (SELECT MAX(id) FROM logbooks WHERE student_id = ?)''')
+            conditions.append('+logbooks_fts.rowid IN (SELECT id FROM logbooks WHERE student_id = ?)')
+            params.extend([student_id] * 3)
+        if week is not None:
+            entry_conditions.append('l.week = ?')
+            entry_params.append(week)
+        if verified is not None:
+            entry_conditions.append('l.verified_by IS NOT NULL' if verified else 'l.verified_by IS NULL')
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        truncated = False
+        if order != 'recent' and student_id is None:
+            # Rank only the matches from the newest Nth one onwards. A match
+            # past the Nth means older ones are left out.
+            cursor.execute(f'''
+                SELECT logbooks_fts.rowid FROM logbooks_fts
+                {'JOIN logbooks l ON l.id = logbooks_fts.rowid' if entry_conditions else ''}
+                WHERE {' AND '.join(conditions + entry_conditions)}
+                ORDER BY logbooks_fts.rowid DESC
+                LIMIT 2 OFFSET ?
+            ''', params + entry_params + [self.LOGBOOK_RANK_CANDIDATES - 1])
+            cutoff = cursor.fetchall()
+            truncated = len(cutoff) == 2
+            if truncated:
+                conditions.append('logbooks_fts.rowid >= ?')
+                params.append(cutoff[0][0])
+        where = ' AND '.join(conditions + entry_conditions)
+        params = params + entry_params + [per_page + 1, (page - 1) * per_page]
+        
+        cursor.execute(f'''
+            SELECT l.id, l.student_id, l.week,
+                   snippet(logbooks_fts, 0, char(2), char(3), '...', 16),
+                   l.verified_by, l.verified_on, l.created_at, bm25(logbooks_fts) AS score
+            FROM logbooks_fts
+            JOIN logbooks l ON l.id = logbooks_fts.rowid
+            WHERE {where}
+            ORDER BY {'logbooks_fts.rowid DESC' if order == 'recent' else 'score'}
+            LIMIT ? OFFSET ?
+        ''', params)
+        rows = cursor.fetchall()
+        
+        conn.close()
+        
+        return {
+            'results': [
+                {
+                    'id': row[0],
+                    'student_id': row[1],
+                    'week': row[2],
+                    'snippet': self.highlight_snippet(row[3]),
+                    'verified_by': row[4],
+                    'verified_on': row[5],
+                    'created_at': row[6],
+                    'score': -row[7]
+                }
+                for row in rows[:per_page]
+            ],
+            'page': page,
+            'per_page': per_page,
+            'order': 'recent' if order == 'recent' else 'rank',
+            'has_more': len(rows) > per_page,
+            'truncated': truncated
+        }
+    
+    # Upload methods
+    def create_upload(self, digest, size, filename, content_type, uploaded_by):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO uploads (digest, size, filename, content_type, uploaded_by)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (digest, size, filename, content_type, uploaded_by))
+        
+        upload_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return upload_id
+    
+    def get_upload(self, digest, uploaded_by=None):
+        """Return the latest upload record for digest, optionally only one made by uploaded_by"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if uploaded_by is None:
+            cursor.execute('''
+                SELECT * FROM uploads WHERE digest = ? ORDER BY id DESC LIMIT 1
+            ''', (digest,))
+        else:
+            cursor.execute('''
+                SELECT * FROM uploads WHERE digest = ? AND uploaded_by = ? ORDER BY id DESC LIMIT 1
+            ''', (digest, uploaded_by))
+        upload = cursor.fetchone()
+        
+        conn.close()
+        
+        if upload:
+            return {
+                'id': upload[0],
+                'digest': upload[1],
+                'size': upload[2],
+                'filename': upload[3],
+                'content_type': upload[4],
+                'uploaded_by': upload[5],
+                'created_at': upload[6]
+            }
+        return None
+    
+    def create_final_report(self, student_id, report_file, logbook_file):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO final_reports (student_id, report_file, logbook_file)
+            VALUES (?, ?, ?)
+        ''', (student_id, report_file, logbook_file))
+        
+        report_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return report_id
+    
+    def create_return_form(self, student_id, company, location, supervisor_name,
+                           supervisor_email, supervisor_phone, insurance_form):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO return_forms (student_id, company, location, supervisor_name,
+                                      supervisor_email, supervisor_phone, insurance_form)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (student_id, company, location, supervisor_name,
+              supervisor_email, supervisor_phone, insurance_form))
+        
+        form_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return form_id
+    
+    # Notification methods
+    def create_notification(self, user_id, message):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO notifications (user_id, message)
+            VALUES (?, ?)
+        ''', (user_id, message))
+        
+        notification_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return notification_id
+    
+    def broadcast_notification(self, message, user_ids=None, role=None):
+        """Send message to every listed user, or to everyone with role.
+        
+        All rows go in with one statement inside one transaction. Returns the
+        number of notifications created.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if user_ids is not None:
+            cursor.executemany('''
+                INSERT INTO notifications (user_id, message)
+                VALUES (?, ?)
+            ''', ((user_id, message) for user_id in user_ids))
+        else:
+            cursor.execute('''
+                INSERT INTO notifications (user_id, message)
+                SELECT id, ? FROM users WHERE role = ?
+            ''', (message, role))
+        
+        created = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return created
+    
+    def get_notifications(self, user_id, before_id=None, limit=20, unread_only=False):
+        """Newest-first page of a user's notifications, continuing below before_id"""
+        conditions = ['user_id = ?']
+        params = [user_id]
+        if before_id is not None:
+            conditions.append('id < ?')
+            params.append(before_id)
+        if unread_only:
+            conditions.append('is_read = 0')
+        params.append(limit)
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            SELECT id, user_id, message, is_read, created_at FROM notifications
+            WHERE {' AND '.join(conditions)}
+            ORDER BY id DESC
+            LIMIT ?
+        ''', params)
+        notifications = cursor.fetchall()
+        
+        conn.close()
+        
+        return [
+            {
+                'id': notification[0],
+                'user_id': notification[1],
+                'message': notification[2],
+                'is_read': bool(notification[3]),
+                'created_at': notification[4]
+            }
+            for notification in notifications
+        ]
+    
+    def get_unread_count(self, user_id):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            'SELECT COUNT(*) FROM notifications WHERE user_id = ? AND is_read = 0',
+            (user_id,)
+        )
+        count = cursor.fetchone()[0]
+        
+        conn.close()
+        return count
+    
+    def mark_notification_read(self, notification_id, user_id):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE notifications SET is_read = 1
+            WHERE id = ? AND user_id = ?
+        ''', (notification_id, user_id))
+        
+        updated = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return updated > 0
+    
+    def mark_all_notifications_read(self, user_id, up_to_id=None):
+        """Mark a user's unread notifications read in one statement.
+        
+        up_to_id limits it to what the user has seen, so notifications that
+        arrive meanwhile stay unread.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if up_to_id is None:
+            cursor.execute('''
+                UPDATE notifications SET is_read = 1
+                WHERE user_id = ? AND is_read = 0
+            ''', (user_id,))
+        else:
+            cursor.execute('''
+                UPDATE notifications SET is_read = 1
+                WHERE user_id = ? AND is_read = 0 AND id <= ?
+            ''', (user_id, up_to_id))
+        
+        updated = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return updated
+    
+    # Assignment methods
+    def create_cluster(self, name, location, capacity, coordinator_id=None):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO clusters (name, location, capacity, coordinator_id)
+            VALUES (?, ?, ?, ?)
+        ''', (name, location, capacity, coordinator_id))
+        
+        cluster_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return cluster_id
+    
+    def set_supervisor_capacity(self, user_id, capacity, location=None):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO supervisor_capacity (user_id, location, capacity)
+            VALUES (?, ?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET location = excluded.location, capacity = excluded.capacity
+        ''', (user_id, location, capacity))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_students_for_assignment(self, kind, only_unassigned=True):
+        """Return (student_id, location) pairs, location from the latest return form.
+        
+        kind is 'clusters' or 'supervisors'; with only_unassigned, students
+        already placed for that kind are skipped.
+        """
+        unassigned = {
+            'clusters': 'NOT EXISTS (SELECT 1 FROM student_clusters sc WHERE sc.student_id = u.id)',
+            'supervisors': '''NOT EXISTS (SELECT 1 FROM supervisors s WHERE s.student_id = u.id
+                                          AND s.university_supervisor_id IS NOT NULL)'''
+        }[kind]
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            SELECT u.id, (SELECT location FROM return_forms rf
+                          WHERE rf.student_id = u.id ORDER BY rf.id DESC LIMIT 1)
+            FROM users u
+            WHERE u.role = 'student' {'AND ' + unassigned if only_unassigned else ''}
+        ''')
+        students = cursor.fetchall()
+        
+        conn.close()
+        return students
+    
+    def get_fallback_assignments(self, kind):
+        """Return (student_id, location, target_id) for students placed outside their location.
+        
+        kind is 'clusters' or 'supervisors'. location is the student's from
+        their latest return form and target_id the cluster or university
+        supervisor they are placed with, whose location differs.
+        """
+        placed = {
+            'clusters': '''
+                SELECT sc.student_id, sc.cluster_id AS target_id, c.location AS target_location
+                FROM student_clusters sc JOIN clusters c ON c.id = sc.cluster_id
+            ''',
+            'supervisors': '''
+                SELECT s.student_id, s.university_supervisor_id AS target_id, sc.location AS target_location
+                FROM supervisors s JOIN supervisor_capacity sc ON sc.user_id = s.university_supervisor_id
+            '''
+        }[kind]
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            SELECT student_id, location, target_id FROM (
+                SELECT p.student_id, p.target_id, p.target_location,
+                       (SELECT location FROM return_forms rf
+                        WHERE rf.student_id = p.student_id ORDER BY rf.id DESC LIMIT 1) AS location
+                FROM ({placed}) p
+            )
+            WHERE trim(location) != '' AND lower(trim(location)) != lower(trim(coalesce(target_location, '')))
+        ''')
+        students = cursor.fetchall()
+        
+        conn.close()
+        return students
+    
+    def get_cluster_targets(self, ignore_current_load=False):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT c.id, c.location, c.capacity,
+                   (SELECT COUNT(*) FROM student_clusters sc WHERE sc.cluster_id = c.id)
+            FROM clusters c
+        ''')
+        clusters = cursor.fetchall()
+        
+        conn.close()
+        
+        return [
+            {
+                'id': cluster[0],
+                'location': cluster[1],
+                'capacity': cluster[2],
+                'load': 0 if ignore_current_load else cluster[3]
+            }
+            for cluster in clusters
+        ]
+    
+    def get_supervisor_targets(self, ignore_current_load=False):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT sc.user_id, sc.location, sc.capacity,
+                   (SELECT COUNT(*) FROM supervisors s WHERE s.university_supervisor_id = sc.user_id)
+            FROM supervisor_capacity sc
+            JOIN users u ON u.id = sc.user_id
+        ''')
+        supervisors = cursor.fetchall()
+        
+        conn.close()
+        
+        return [
+            {
+                'id': supervisor[0],
+                'location': supervisor[1],
+                'capacity': supervisor[2],
+                'load': 0 if ignore_current_load else supervisor[3]
+            }
+            for supervisor in supervisors
+        ]
+    
+    def save_assignments(self, cluster_assignments, supervisor_assignments, replace_existing=False):
+        """Write {student_id: cluster_id} and {student_id: supervisor_id} in one transaction.
+        
+        With replace_existing, current cluster and university supervisor
+        assignments are cleared first; industry supervisors are kept.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            if replace_existing:
+                cursor.execute('DELETE FROM student_clusters')
+                cursor.execute('UPDATE supervisors SET university_supervisor_id = NULL')
+            
+            cursor.executemany('''
+                INSERT INTO student_clusters (student_id, cluster_id)
+                VALUES (?, ?)
+                ON CONFLICT (student_id) DO UPDATE SET
+                    cluster_id = excluded.cluster_id,
+                    assigned_at = CURRENT_TIMESTAMP
+            ''', cluster_assignments.items())
+            
+            cursor.executemany('''
+                INSERT INTO supervisors (student_id, university_supervisor_id)
+                VALUES (?, ?)
+                ON CONFLICT (student_id) DO UPDATE SET
+                    university_supervisor_id = excluded.university_supervisor_id,
+                    assigned_at = CURRENT_TIMESTAMP
+            ''', supervisor_assignments.items())
+            
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    # Job methods
+    def _job_from_row(self, job):
+        return {
+            'id': job[0],
+            'kind': job[1],
+            'params': json.loads(job[2]),
+            'cache_key': job[3],
+            'status': job[4],
+            'attempts': job[5],
+            'max_attempts': job[6],
+            'result': json.loads(job[7]) if job[7] else None,
+            'error': job[8],
+            'requested_by': job[9],
+            'available_at': job[10],
+            'started_at': job[11],
+            'finished_at': job[12],
+            'created_at': job[13]
+        }
+    
+    def enqueue_job(self, kind, params, cache_key, requested_by=None, max_attempts=3):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO jobs (kind, params, cache_key, requested_by, max_attempts, available_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (kind, json.dumps(params, sort_keys=True), cache_key, requested_by, max_attempts, time.time()))
+        
+        job_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return job_id
+    
+    def get_job(self, job_id):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+        job = cursor.fetchone()
+        
+        conn.close()
+        return self._job_from_row(job) if job else None
+    
+    def find_job_by_cache_key(self, cache_key):
+        """Latest finished job for cache_key, else one still queued or running"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT * FROM jobs
+            WHERE cache_key = ? AND status IN ('done', 'queued', 'running')
+            ORDER BY status = 'done' DESC, id DESC
+            LIMIT 1
+        ''', (cache_key,))
+        job = cursor.fetchone()
+        
+        conn.close()
+        return self._job_from_row(job) if job else None
+    
+    def claim_job(self, concurrency_limits, stale_after):
+        """Atomically take the oldest runnable job, honouring per-kind concurrency limits.
+        
+        Jobs left running for longer than stale_after seconds (their worker
+        died) are put back in the queue first, or failed once they are out
+        of attempts so a job that kills its worker is not retried forever.
+        """
+        now = time.time()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                UPDATE jobs SET
+                    status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+                    available_at = ?,
+                    error = CASE WHEN attempts < max_attempts THEN error ELSE 'Worker stopped while running the job' END,
+                    finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END
+                WHERE status = 'running' AND started_at < ?
+            ''', (now, now, now - stale_after))
+            
+            cursor.execute("SELECT kind, COUNT(*) FROM jobs WHERE status = 'running' GROUP BY kind")
+            running = dict(cursor.fetchall())
+            full_kinds = [kind for kind, limit in concurrency_limits.items() if running.get(kind, 0) >= limit]
+            
+            cursor.execute(f'''
+                SELECT * FROM jobs
+                WHERE status = 'queued' AND available_at <= ?
+                {f"AND kind NOT IN ({', '.join('?' for _ in full_kinds)})" if full_kinds else ''}
+                ORDER BY available_at, id
+                LIMIT 1
+            ''', [now] + full_kinds)
+            job = cursor.fetchone()
+            
+            if job:
+                cursor.execute('''
+                    UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?
+                    WHERE id = ?
+                ''', (now, job[0]))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        if job is None:
+            return None
+        job = self._job_from_row(job)
+        job['status'] = 'running'
+        job['attempts'] += 1
+        job['started_at'] = now
+        return job
+    
+    def complete_job(self, job_id, result):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE jobs SET status = 'done', result = ?, error = NULL, finished_at = ?
+            WHERE id = ?
+        ''', (json.dumps(result), time.time(), job_id))
+        
+        conn.commit()
+        conn.close()
+    
+    def fail_job(self, job_id, error, retry_delay):
+        """Record a failure; the job is retried after retry_delay unless out of attempts"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE jobs SET
+                status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+                available_at = ?,
+                error = ?,
+                finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END
+            WHERE id = ?
+        ''', (time.time() + retry_delay, error, time.time(), job_id))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_student_report_data(self, student_id):
+        """Everything that goes into a student's compiled report"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT id, name, email FROM users WHERE id = ?', (student_id,))
+        student = cursor.fetchone()
+        
+        cursor.execute('''
+            SELECT l.week, l.entry, l.created_at, l.verified_on, v.name
+            FROM logbooks l
+            LEFT JOIN users v ON v.id = l.verified_by
+            WHERE l.student_id = ?
+            ORDER BY l.week, l.id
+        ''', (student_id,))
+        logbooks = cursor.fetchall()
+        
+        cursor.execute('''
+            SELECT company, location, supervisor_name, supervisor_email
+            FROM return_forms WHERE student_id = ? ORDER BY id DESC LIMIT 1
+        ''', (student_id,))
+        placement = cursor.fetchone()
+        
+        conn.close()
+        
+        if student is None:
+            return None
+        return {
+            'student': {'id': student[0], 'name': student[1], 'email': student[2]},
+            'placement': {
+                'company': placement[0],
+                'location': placement[1],
+                'supervisor_name': placement[2],
+                'supervisor_email': placement[3]
+            } if placement else None,
+            'logbooks': [
+                {
+                    'week': logbook[0],
+                    'entry': logbook[1],
+                    'created_at': logbook[2],
+                    'verified_on': logbook[3],
+                    'verified_by': logbook[4]
+                }
+                for logbook in logbooks
+            ],
+            'attendance': self.get_attendance_rollups('student', 'week', scope_id=student_id, limit=1000,
+                                                      use_snapshot=False)
+        }
+    
+    # Admin view methods
+    def get_table_version(self, table):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT version FROM table_versions WHERE name = ?', (table,))
+        row = cursor.fetchone()
+        
+        conn.close()
+        return row[0] if row else 0
+    
+    def get_table_page(self, table, per_page=25, sort='id', order='asc', after=None, before=None):
+        """Return one page of a table for the admin view.
+        
+        Pages are keyset paginated: after and before are ids of the rows that
+        bound the neighbouring pages, and the page starts just past that row
+        in sort order, so deep pages cost the same as the first. Sorting is
+        limited to ADMIN_SORT_COLUMNS and anything else falls back to id. A
+        cursor whose row has since been deleted returns the first page.
+        """
+        columns = self.ADMIN_TABLES[table]
+        if sort not in self.ADMIN_SORT_COLUMNS[table]:
+            sort = 'id'
+        order = 'DESC' if str(order).lower() == 'desc' else 'ASC'
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT row_count FROM table_versions WHERE name = ?', (table,))
+        total = cursor.fetchone()[0]
+        
+        cursor_id = before if before is not None else after
+        backwards = before is not None
+        if cursor_id is not None:
+            cursor.execute(f'SELECT 1 FROM {table} WHERE id = ?', (cursor_id,))
+            if cursor.fetchone() is None:
+                cursor_id, backwards = None, False
+        
+        # The previous page is read in reverse order and flipped afterwards
+        scan = {'ASC': 'DESC', 'DESC': 'ASC'}[order] if backwards else order
+        where = ''
+        params = []
+        if cursor_id is not None:
+            where = (f"WHERE ({sort}, id) {'>' if scan == 'ASC' else '<'} "
+                     f"(SELECT {sort}, id FROM {table} WHERE id = ?)")
+            params.append(cursor_id)
+        
+        cursor.execute(f'''
+            SELECT {', '.join(columns)} FROM {table}
+            {where}
+            ORDER BY {sort} {scan}, id {scan}
+            LIMIT ?
+        ''', params + [per_page + 1])
+        rows = cursor.fetchall()
+        
+        conn.close()
+        
+        more = len(rows) > per_page
+        rows = rows[:per_page]
+        if backwards:
+            rows.reverse()
+        has_next = more if not backwards else True
+        has_prev = more if backwards else cursor_id is not None
+        
+        return {
+            'table': table,
+            'columns': columns,
+            'sort_columns': self.ADMIN_SORT_COLUMNS[table],
+            'rows': [dict(zip(columns, row)) for row in rows],
+            'total': total,
+            'per_page': per_page,
+            'sort': sort,
+            'order': order.lower(),
+            'next_after': rows[-1][0] if rows and has_next else None,
+            'prev_before': rows[0][0] if rows and has_prev else None
+        }
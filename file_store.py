@@ -0,0 +1,68 @@
+import hashlib
+import os
+import re
+import tempfile
+
+CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+
+_DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class FileStore:
+    """Content-addressed file storage on local disk.
+
+    Files are stored under root/<aa>/<bb>/<sha256>, so identical uploads
+    are kept once. Uploads are streamed through a temporary file in fixed
+    size chunks, so memory use does not depend on the file size.
+    """
+
+    def __init__(self, root='uploads'):
+        self.root = root
+        self.tmp_dir = os.path.join(root, 'tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path_for(self, digest):
+        if not _DIGEST_PATTERN.match(digest or ''):
+            raise ValueError('Invalid file digest')
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest):
+        try:
+            return os.path.isfile(self.path_for(digest))
+        except ValueError:
+            return False
+
+    def save_stream(self, stream, max_size=MAX_UPLOAD_SIZE):
+        """Store everything read from stream. Returns (digest, size)."""
+        sha256 = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_size:
+                        raise UploadTooLarge(f'File exceeds {max_size} bytes')
+                    sha256.update(chunk)
+                    tmp.write(chunk)
+            
+            digest = sha256.hexdigest()
+            path = self.path_for(digest)
+            if os.path.isfile(path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+            return digest, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,17 @@
+import os
+
+import jobs
+
+
+def on_starting(server):
+    # Background job workers run beside the web workers and share their
+    # database (DATABASE_PATH, default database.db)
+    server.job_pool = jobs.start_pool(
+        int(os.environ.get('JOB_WORKERS', 2)),
+        db_path=os.environ.get('DATABASE_PATH', 'database.db'),
+        snapshot_interval=int(os.environ.get('SNAPSHOT_INTERVAL', jobs.SNAPSHOT_INTERVAL))
+    )
+
+
+def on_exit(server):
+    jobs.stop_pool(*server.job_pool)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Background jobs: a SQLite-backed queue worked by a pool of processes.
+
+Jobs are submitted with submit_job, which reuses a finished or in-flight
+job whose cache key (kind, parameters and a hash of the input data) still
+matches, so repeated downloads of unchanged data are not recomputed.
+Workers claim jobs atomically, respect per-kind concurrency limits and
+retry failures with exponential backoff.
+
+The pool can also keep the analytics snapshot (Database.refresh_snapshot)
+fresh from a separate process.
+
+Run a pool next to the web server with: python jobs.py [--workers N]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import signal
+from datetime import datetime
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from database import Database
+from file_store import FileStore
+
+# Maximum jobs of each kind running at once across all workers
+CONCURRENCY_LIMITS = {
+    'compile_report': 2,
+    'logbook_document': 2
+}
+# Running jobs not finished after this many seconds are assumed lost
+STALE_AFTER = 10 * 60
+RETRY_BASE_DELAY = 5
+POLL_INTERVAL = 1.0
+# Longest a worker waits before retrying after a database error
+ERROR_BACKOFF_MAX = 60
+# Same database as the web app, which reads the same variable
+DATABASE_PATH = os.environ.get('DATABASE_PATH', 'database.db')
+SNAPSHOT_PATH = 'analytics.db'
+SNAPSHOT_INTERVAL = 5 * 60
+
+_templates = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')),
+    autoescape=select_autoescape(['html'])
+)
+
+
+def _render_student_document(db, store, params, title, filename, include_placement, include_attendance):
+    data = db.get_student_report_data(params['student_id'])
+    if data is None:
+        raise ValueError(f"Student {params['student_id']} not found")
+    
+    html = _templates.get_template('compiled_report.html').render(
+        title=title,
+        data=data,
+        generated_at=datetime.now().strftime('%Y-%m-%d %H:%M'),
+        include_placement=include_placement,
+        include_attendance=include_attendance
+    ).encode('utf-8')
+    digest, size = store.save_stream(io.BytesIO(html))
+    
+    return {
+        'digest': digest,
+        'size': size,
+        'filename': f"{filename}-{params['student_id']}.html",
+        'content_type': 'text/html'
+    }
+
+
+def compile_report(db, store, params):
+    return _render_student_document(db, store, params, 'Attachment Report', 'attachment-report', True, True)
+
+
+def logbook_document(db, store, params):
+    return _render_student_document(db, store, params, 'Logbook', 'logbook', False, False)
+
+
+JOB_HANDLERS = {
+    'compile_report': compile_report,
+    'logbook_document': logbook_document
+}
+
+# Input data each kind of job depends on; its hash is part of the cache key
+JOB_INPUTS = {
+    'compile_report': lambda db, params: db.get_student_report_data(params['student_id']),
+    'logbook_document': lambda db, params: db.get_student_report_data(params['student_id'])
+}
+
+
+def cache_key(db, kind, params):
+    inputs = JOB_INPUTS[kind](db, params)
+    payload = json.dumps([kind, params, inputs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def submit_job(db, store, kind, params, requested_by=None):
+    """Return (job, created). An existing job is reused while its inputs are unchanged."""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f'Unknown job kind: {kind}')
+    
+    key = cache_key(db, kind, params)
+    existing = db.find_job_by_cache_key(key)
+    if existing and (existing['status'] != 'done' or store.exists(existing['result']['digest'])):
+        return existing, False
+    
+    job_id = db.enqueue_job(kind, params, key, requested_by)
+    return db.get_job(job_id), True
+
+
+def run_job(db, store, job):
+    try:
+        result = JOB_HANDLERS[job['kind']](db, store, job['params'])
+    except Exception as e:
+        retry_delay = RETRY_BASE_DELAY * 2 ** (job['attempts'] - 1)
+        db.fail_job(job['id'], f'{type(e).__name__}: {e}', retry_delay)
+        return False
+    db.complete_job(job['id'], result)
+    return True
+
+
+def work(db_path, store_root, stop_event, poll_interval=POLL_INTERVAL):
+    """Worker loop: claim and run jobs until stop_event is set.
+    
+    Errors from the queue itself, such as a locked database, are logged and
+    retried with exponential backoff instead of killing the worker, as are
+    errors opening the database. A job whose completion could not be
+    recorded is requeued once stale.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    db = None
+    store = FileStore(store_root)
+    failures = 0
+    while not stop_event.is_set():
+        try:
+            if db is None:
+                db = Database(db_path, seed=False)
+            job = db.claim_job(CONCURRENCY_LIMITS, STALE_AFTER)
+            if job is not None:
+                run_job(db, store, job)
+        except Exception as e:
+            failures += 1
+            delay = min(ERROR_BACKOFF_MAX, poll_interval * 2 ** failures)
+            print(f"Job worker error, retrying in {delay:.1f}s: {type(e).__name__}: {e}")
+            stop_event.wait(delay)
+            continue
+        failures = 0
+        if job is None:
+            stop_event.wait(poll_interval)
+
+
+def refresh_snapshots(db_path, snapshot_path, interval, stop_event):
+    """Refresh the analytics snapshot every interval seconds until stop_event is set"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    db = Database(db_path, snapshot_path=snapshot_path, seed=False)
+    while not stop_event.is_set():
+        age = db.snapshot_age()
+        if age is None or age >= interval:
+            try:
+                db.refresh_snapshot()
+            except Exception as e:
+                print(f"Snapshot refresh failed: {e}")
+            age = 0
+        stop_event.wait(interval - age)
+
+
+def start_pool(workers=2, db_path=DATABASE_PATH, store_root='uploads',
+               snapshot_path=SNAPSHOT_PATH, snapshot_interval=SNAPSHOT_INTERVAL):
+    """Start the job workers, plus a snapshot refresher when snapshot_interval is set"""
+    stop_event = multiprocessing.Event()
+    processes = [
+        multiprocessing.Process(target=work, args=(db_path, store_root, stop_event),
+                                name=f'job-worker-{i}', daemon=True)
+        for i in range(workers)
+    ]
+    if snapshot_path and snapshot_interval:
+        processes.append(multiprocessing.Process(
+            target=refresh_snapshots, args=(db_path, snapshot_path, snapshot_interval, stop_event),
+            name='snapshot-refresher', daemon=True
+        ))
+    for process in processes:
+        process.start()
+    return stop_event, processes
+
+
+def stop_pool(stop_event, processes, timeout=30):
+    stop_event.set()
+    for process in processes:
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run background job workers')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--db', default=DATABASE_PATH)
+    parser.add_argument('--store', default='uploads')
+    parser.add_argument('--snapshot-interval', type=int, default=SNAPSHOT_INTERVAL,
+                        help='seconds between analytics snapshot refreshes, 0 to disable')
+    args = parser.parse_args()
+    
+    stop_event, processes = start_pool(args.workers, args.db, args.store,
+                                       snapshot_interval=args.snapshot_interval)
+    print(f"Started {args.workers} job workers, press Ctrl+C to stop")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        stop_pool(stop_event, processes)
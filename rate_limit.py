@@ -0,0 +1,115 @@
+import math
+import sqlite3
+import threading
+import time
+
+# Token bucket limits as (capacity, tokens refilled per second), keyed by
+# endpoint and then by role. 'anonymous' applies to requests without a
+# session, '*' to any role not listed and, at the top level, to endpoints
+# not listed. A limit of None disables limiting. 'login' is counted per
+# address and email, and 'login_address' per address across all emails.
+RATE_LIMITS = {
+    'login': {'*': (5, 5 / 60)},
+    'login_address': {'*': (30, 30 / 60)},
+    'register': {'*': (5, 5 / 60)},
+    'book_slot': {
+        'student': (3, 1 / 5),
+        'admin': (60, 5),
+        'coordinator': (60, 5),
+        '*': (3, 1 / 5)
+    },
+    'static': {'*': None},
+    '*': {'*': (120, 20)}
+}
+
+# Buckets untouched for this long are full again and can be dropped
+BUCKET_IDLE_SECONDS = 60 * 60
+PURGE_EVERY = 10000
+
+
+class RateLimiter:
+    """Token bucket rate limiter stored in SQLite, shared by all workers.
+
+    Each thread keeps its own connection to a WAL-mode database with
+    synchronous=OFF. Buckets are throwaway state, so losing the last few
+    updates in a crash only means a few requests are not counted.
+    """
+
+    def __init__(self, db_path='ratelimit.db', limits=None):
+        self.db_path = db_path
+        self.limits = RATE_LIMITS if limits is None else limits
+        self._local = threading.local()
+        self._calls = 0
+
+    def get_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=1, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                ) WITHOUT ROWID
+            ''')
+            self._local.conn = conn
+        return conn
+
+    def limit_for(self, endpoint, role):
+        endpoint_limits = self.limits.get(endpoint, self.limits.get('*', {}))
+        return endpoint_limits.get(role or 'anonymous', endpoint_limits.get('*'))
+
+    def consume(self, key, capacity, rate, cost=1):
+        """Take cost tokens from the bucket. Returns 0 if allowed, else seconds to wait."""
+        now = time.time()
+        conn = self.get_connection()
+        
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT tokens, updated_at FROM buckets WHERE key = ?', (key,)
+            ).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+            
+            retry_after = 0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                retry_after = (cost - tokens) / rate
+            
+            conn.execute('''
+                INSERT INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at
+            ''', (key, tokens, now))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        
+        self._calls += 1
+        if self._calls % PURGE_EVERY == 0:
+            self.purge_idle()
+        return retry_after
+
+    def check(self, endpoint, role, identity):
+        """Return None if the request may proceed, else the Retry-After in whole seconds.
+
+        Limiter errors such as a locked database let the request through
+        rather than failing it.
+        """
+        limit = self.limit_for(endpoint, role)
+        if limit is None:
+            return None
+        capacity, rate = limit
+        
+        try:
+            retry_after = self.consume(f'{endpoint}:{identity}', capacity, rate)
+        except sqlite3.Error:
+            return None
+        return max(1, math.ceil(retry_after)) if retry_after else None
+
+    def purge_idle(self, idle_seconds=BUCKET_IDLE_SECONDS):
+        conn = self.get_connection()
+        conn.execute('DELETE FROM buckets WHERE updated_at < ?', (time.time() - idle_seconds,))
@@ -0,0 +1,100 @@
+import secrets
+import time
+
+from cache import LRUCache
+
+SESSION_TTL = 7 * 24 * 60 * 60
+# How often each store deletes expired sessions and old revocations
+PURGE_INTERVAL = 60 * 60
+
+
+class SessionStore:
+    """Server-side sessions in SQLite with an in-memory LRU in front.
+
+    Resolving a cached token costs a dictionary lookup. At most once every
+    revalidate_interval seconds the store reads the revocation log past the
+    last entry it saw and drops just the revoked tokens, or the sessions of
+    changed users, so revocations take effect everywhere within that
+    interval without emptying every worker's cache.
+
+    Logins also purge expired sessions and old revocations from the
+    database, at most once every purge_interval seconds.
+    """
+
+    def __init__(self, db, max_entries=10000, ttl=SESSION_TTL, revalidate_interval=1.0,
+                 purge_interval=PURGE_INTERVAL):
+        self.db = db
+        self.ttl = ttl
+        self.revalidate_interval = revalidate_interval
+        self.purge_interval = purge_interval
+        self.cache = LRUCache(max_entries=max_entries)
+        self._version = None
+        self._checked_at = 0.0
+        self._purged_at = None
+
+    def create(self, user):
+        now = time.monotonic()
+        if self._purged_at is None or now - self._purged_at >= self.purge_interval:
+            self._purged_at = now
+            self.db.purge_sessions()
+        
+        token = secrets.token_urlsafe(32)
+        expires_at = int(time.time()) + self.ttl
+        self.db.create_session(token, user['id'], expires_at)
+        self.cache.set(token, {
+            'token': token,
+            'expires_at': expires_at,
+            'user': {
+                'id': user['id'],
+                'name': user['name'],
+                'email': user['email'],
+                'role': user['role']
+            }
+        })
+        return token
+
+    def get(self, token):
+        """Return the session for token, or None if it is unknown or expired"""
+        if not token:
+            return None
+        self._revalidate()
+        
+        entry = self.cache.get(token)
+        if entry is None:
+            entry = self.db.get_session(token)
+            if entry is None:
+                return None
+            self.cache.set(token, entry)
+        
+        if entry['expires_at'] <= time.time():
+            self.cache.delete(token)
+            return None
+        return entry
+
+    def delete(self, token):
+        self.db.delete_session(token)
+        self.cache.delete(token)
+
+    def expire(self, user_ids=None, role=None, expired_before=None):
+        removed = self.db.expire_sessions(user_ids=user_ids, role=role, expired_before=expired_before)
+        self._revalidate(force=True)
+        return removed
+
+    def _revalidate(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.revalidate_interval:
+            return
+        self._checked_at = now
+        
+        oldest, latest, revocations = self.db.get_session_revocations(after=self._version)
+        if self._version is None or (oldest is not None and oldest > self._version + 1):
+            # First look at the log, or entries we never saw were pruned from it
+            self.cache.clear()
+        for _, token, user_id in revocations:
+            if token is not None:
+                self.cache.delete(token)
+            elif user_id is not None:
+                self.cache.delete_matching(lambda entry: entry['user']['id'] == user_id)
+            else:
+                self.cache.clear()
+        self._version = latest if latest is not None else (self._version or 0)
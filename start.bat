@@ -31,10 +31,13 @@ python -c "from database import Database; db = Database(); db.create_tables(); d
 
 echo 🎉 Setup complete! Starting the server...
 echo 🌐 Server will be available at: http://localhost:5000
-echo 📊 Admin view: http://localhost:5000/admin-view?email=admin@example.com
+echo 📊 Admin view: http://localhost:5000/admin-view (log in as an admin first)
 echo 🔄 Press Ctrl+C to stop the server
 echo.
 
+REM Start the background job workers (report compilation) in their own window
+start "AMS job workers" python jobs.py
+
 REM Start the Flask application
 python app.py
 
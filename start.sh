@@ -37,9 +37,14 @@ python3 -c "from database import Database; db = Database(); db.create_tables();
 
 echo "🎉 Setup complete! Starting the server..."
 echo "🌐 Server will be available at: http://localhost:5000"
-echo "📊 Admin view: http://localhost:5000/admin-view?email=admin@example.com"
+echo "📊 Admin view: http://localhost:5000/admin-view (log in as an admin first)"
 echo "🔄 Press Ctrl+C to stop the server"
 echo ""
 
+# Start the background job workers (report compilation), stopped with the server
+python3 jobs.py &
+JOBS_PID=$!
+trap "kill $JOBS_PID" EXIT
+
 # Start the Flask application
 python3 app.py
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the paginated, cached admin view
+"""
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client(db):
+    app_module.admin_view_cache.clear()
+    client = app_module.app.test_client()
+    client.post('/api/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+    return client
+
+
+def test_admin_view_requires_admin(client):
+    client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+    assert client.get('/admin-view').status_code == 403
+    
+    client.post('/api/logout')
+    assert client.get('/admin-view').status_code == 401
+
+
+def test_admin_view_escapes_values(client):
+    app_module.db.create_user('<script>alert(1)</script>', 'x@example.com', 'hash', 'student')
+    
+    response = client.get('/admin-view')
+    
+    assert response.status_code == 200
+    assert b'<script>alert(1)</script>' not in response.data
+    assert b'&lt;script&gt;' in response.data
+
+
+def test_admin_view_paginates_and_sorts(client):
+    for i in range(30):
+        app_module.db.create_user(f'User {i:02d}', f'user{i:02d}@example.com', 'hash', 'student')
+    
+    response = client.get('/admin-view?per_page=10&users_sort=email&users_order=desc')
+    body = response.data.decode()
+    
+    assert 'Users (34 total)' in body
+    assert 'user29@example.com' in body
+    assert 'user00@example.com' not in body
+
+
+def test_admin_table_keyset_pages(db):
+    for i in range(30):
+        db.create_user(f'User {i:02d}', f'user{i:02d}@example.com', 'hash', 'student')
+    
+    emails = []
+    page = db.get_table_page('users', per_page=10, sort='email', order='desc')
+    assert page['prev_before'] is None
+    while True:
+        emails += [row['email'] for row in page['rows']]
+        if page['next_after'] is None:
+            break
+        page = db.get_table_page('users', per_page=10, sort='email', order='desc', after=page['next_after'])
+    
+    assert emails == sorted(emails, reverse=True)
+    assert len(emails) == page['total'] == 34
+    
+    previous = db.get_table_page('users', per_page=10, sort='email', order='desc', before=page['prev_before'])
+    assert [row['email'] for row in previous['rows']] == emails[20:30]
+    assert previous['next_after'] == previous['rows'][-1]['id']
+
+
+def test_admin_table_sorts_only_on_indexed_columns(db):
+    assert db.get_table_page('users', sort='name')['sort'] == 'id'
+    assert db.get_table_page('users', sort='created_at')['sort'] == 'created_at'
+
+
+def test_admin_table_row_count_is_maintained(db):
+    user_id = db.create_user('Counted', 'counted@example.com', 'hash', 'student')
+    assert db.get_table_page('users')['total'] == 5
+    
+    conn = db.get_connection()
+    conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
+    conn.commit()
+    conn.close()
+    assert db.get_table_page('users')['total'] == 4
+
+
+def test_admin_view_cache_invalidated_on_write(client):
+    url = '/admin-view'
+    client.get(url)
+    cached_entries = len(app_module.admin_view_cache)
+    
+    client.get(url)
+    assert len(app_module.admin_view_cache) == cached_entries
+    
+    app_module.db.create_user('Fresh User', 'fresh@example.com', 'hash', 'student')
+    response = client.get(url)
+    
+    assert b'fresh@example.com' in response.data
+    assert len(app_module.admin_view_cache) == cached_entries + 1
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for term archival of bookings and attendance
+"""
+
+import os
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def two_terms(db):
+    # Sample slots 1 and 2 are on 2025-08-15, slot 3 on 2025-08-16
+    db.create_term('2025 T2', '2025-05-01', '2025-08-15')
+    db.create_term('2025 T3', '2025-08-16', '2025-11-30')
+    db.create_booking(1, 1)
+    db.create_booking(1, 3)
+    db.mark_attendance(1, 1, '2025-08-11', 'present')
+    db.mark_attendance(1, 2, '2025-08-15', 'absent')
+    db.mark_attendance(1, 3, '2025-08-18', 'present')
+    return db
+
+
+def test_create_term_rejects_overlap(db):
+    db.create_term('2025 T2', '2025-05-01', '2025-08-15')
+    with pytest.raises(ValueError):
+        db.create_term('Overlap', '2025-08-15', '2025-09-01')
+    with pytest.raises(ValueError):
+        db.create_term('Backwards', '2025-12-01', '2025-09-01')
+
+
+def test_archive_moves_term_rows_in_batches(two_terms):
+    db = two_terms
+    moved = db.archive_term('2025 T2', batch_size=1)
+    assert moved == {'bookings': 1, 'attendance': 2}
+
+    assert [b['slot_id'] for b in db.get_all_bookings()] == [3]
+    assert [a['date'] for a in db.get_all_attendance()] == ['2025-08-18']
+    term = next(t for t in db.get_terms() if t['name'] == '2025 T2')
+    assert term['status'] == 'archived'
+    assert os.path.exists(term['archive_path'])
+
+    # Re-running moves nothing and keeps the term archived
+    assert db.archive_term('2025 T2') == {'bookings': 0, 'attendance': 0}
+
+
+def test_rerun_after_partial_batch_keeps_one_copy(two_terms):
+    db = two_terms
+    db.archive_term('2025 T2')
+    # A crash between the archive and live commits leaves a batch in both
+    conn = db.get_connection()
+    conn.execute('ATTACH DATABASE ? AS archive', (db.get_terms()[1]['archive_path'],))
+    conn.execute('INSERT INTO main.attendance SELECT * FROM archive.attendance')
+    conn.execute("UPDATE terms SET status = 'archiving' WHERE name = '2025 T2'")
+    conn.commit()
+    conn.close()
+
+    assert db.archive_term('2025 T2') == {'bookings': 0, 'attendance': 2}
+    assert len(db.get_attendance_history(1)) == 3
+
+
+def test_history_unions_hot_and_archived_rows(two_terms):
+    db = two_terms
+    db.archive_term('2025 T2')
+
+    assert [a['date'] for a in db.get_attendance_history(1)] == ['2025-08-18', '2025-08-15', '2025-08-11']
+    assert [a['date'] for a in db.get_attendance_history(start='2025-08-12', end='2025-08-16')] == ['2025-08-15']
+    assert sorted(b['slot_id'] for b in db.get_booking_history(1)) == [1, 3]
+
+
+def test_archived_term_is_read_only_and_rollups_survive_rebuild(two_terms):
+    db = two_terms
+    before = db.get_attendance_rollups('student', 'week', scope_id=1)
+    db.archive_term('2025 T2')
+
+    with pytest.raises(ValueError):
+        db.mark_attendance(1, 1, '2025-08-11', 'absent')
+
+    db.rebuild_attendance_rollups()
+    assert db.get_attendance_rollups('student', 'week', scope_id=1) == before
+
+
+def test_history_endpoints(two_terms):
+    db = two_terms
+    db.archive_term('2025 T2')
+    client = app_module.app.test_client()
+
+    client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+    response = client.get('/api/attendance/history?user_id=4')
+    assert response.status_code == 200
+    assert len(response.get_json()['attendance']) == 3
+    assert client.post('/api/terms', json={'name': 'T4'}).status_code == 403
+
+    client.post('/api/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+    response = client.post('/api/terms', json={'name': '2026 T1', 'start_date': '2026-01-01', 'end_date': '2026-04-30'})
+    assert response.status_code == 201
+    response = client.post('/api/terms', json={'name': 'Clash', 'start_date': '2026-04-01', 'end_date': '2026-05-30'})
+    assert response.status_code == 400
+    assert [t['name'] for t in client.get('/api/terms').get_json()['terms']] == ['2026 T1', '2025 T3', '2025 T2']
+
+
+def test_terms_share_one_archive(two_terms):
+    db = two_terms
+    db.archive_term('2025 T2')
+    db.archive_term('2025 T3')
+
+    assert {t['archive_path'] for t in db.get_terms()} == {db.archive_path}
+    assert os.listdir(db.archive_dir) == ['archive.db']
+    assert len(db.get_attendance_history(1)) == 3
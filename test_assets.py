@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for hashed static URLs, precompressed assets and response compression
+"""
+
+import gzip
+import re
+
+import app as app_module
+import assets
+
+
+def test_static_urls_are_hashed_and_immutable(client):
+    html = client.get('/student').data.decode()
+    url = re.search(r'href="(/static/css/styles\.css\?v=[0-9a-f]+)"', html).group(1)
+    
+    response = client.get(url)
+    
+    assert response.status_code == 200
+    assert response.cache_control.max_age == assets.STATIC_MAX_AGE
+    assert response.cache_control.immutable
+    response.close()
+
+
+def test_stale_hash_is_not_cached_forever(client):
+    response = client.get('/static/css/styles.css?v=stale')
+    
+    assert response.status_code == 200
+    assert not response.cache_control.immutable
+    response.close()
+
+
+def test_only_files_in_static_folder_are_hashed(client):
+    hashed = dict(assets._asset_hashes)
+
+    response = client.get('/static/..%2F..%2Fapp.py?v=1')
+    assert response.status_code == 404
+    response.close()
+    for i in range(5):
+        client.get(f'/static/css/missing-{i}.css?v=1').close()
+
+    assert assets._asset_hashes == hashed
+    assert assets.asset_hash(app_module.app.static_folder, '../app.py') is None
+
+
+def test_precompressed_variant_served(client):
+    assets.precompress_static(app_module.app.static_folder)
+    
+    response = client.get('/static/css/theme-styles.css', headers={'Accept-Encoding': 'gzip'})
+    body = response.get_data()
+    response.close()
+    
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.mimetype == 'text/css'
+    with open(f'{app_module.app.static_folder}/css/theme-styles.css', 'rb') as f:
+        assert gzip.decompress(body) == f.read()
+
+
+def test_large_json_compressed_on_the_fly(client):
+    for i in range(50):
+        app_module.db.create_user(f'User {i}', f'user{i}@example.com', 'hash', 'student')
+    
+    plain = client.get('/api/test-db')
+    compressed = client.get('/api/test-db', headers={'Accept-Encoding': 'gzip'})
+    
+    assert 'Content-Encoding' not in plain.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+
+
+def test_small_json_left_uncompressed(client):
+    response = client.post('/api/login', json={}, headers={'Accept-Encoding': 'gzip'})
+    
+    assert 'Content-Encoding' not in response.headers
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for the cluster and supervisor assignment engine
+"""
+
+import itertools
+from collections import Counter
+
+import app as app_module
+from assignment import assign, run_assignment
+
+
+_student_numbers = itertools.count()
+
+
+def add_students(db, locations):
+    ids = []
+    for i, location in zip(_student_numbers, locations):
+        student_id = db.create_user(f'Student {i}', f'student{i}@example.com', 'hash', 'student')
+        if location:
+            db.create_return_form(student_id, 'Acme', location, 'Boss', 'boss@acme.com', None, None)
+        ids.append(student_id)
+    return ids
+
+
+def test_assign_prefers_location_and_balances():
+    students = [(i, 'Nairobi') for i in range(6)] + [(10, 'Mombasa')]
+    targets = [
+        {'id': 'a', 'location': 'nairobi', 'capacity': 4, 'load': 0},
+        {'id': 'b', 'location': 'Nairobi ', 'capacity': 4, 'load': 0},
+        {'id': 'c', 'location': 'Mombasa', 'capacity': 2, 'load': 0}
+    ]
+    
+    result = assign(students, targets)
+    loads = Counter(result['assignments'].values())
+    
+    assert result['assignments'][10] == 'c'
+    assert loads['a'] == loads['b'] == 3
+    assert result['local'] == 7 and result['fallback'] == 0
+
+
+def test_assign_respects_capacity_and_falls_back():
+    students = [(i, 'Kisumu') for i in range(5)]
+    targets = [
+        {'id': 'a', 'location': 'Kisumu', 'capacity': 2, 'load': 1},
+        {'id': 'b', 'location': 'Nakuru', 'capacity': 2, 'load': 0}
+    ]
+    
+    result = assign(students, targets)
+    loads = Counter(result['assignments'].values())
+    
+    assert loads == {'a': 1, 'b': 2}
+    assert result['local'] == 1 and result['fallback'] == 2 and result['unassigned'] == 2
+
+
+def test_scarce_locations_placed_first():
+    # Mombasa students can only stay local if they are placed before the
+    # Nairobi overflow takes the Mombasa slot
+    students = [(1, 'Nairobi'), (2, 'Nairobi'), (3, 'Mombasa')]
+    targets = [
+        {'id': 'n', 'location': 'Nairobi', 'capacity': 1, 'load': 0},
+        {'id': 'm', 'location': 'Mombasa', 'capacity': 2, 'load': 0}
+    ]
+    
+    result = assign(students, targets)
+    
+    assert result['assignments'][3] == 'm'
+    assert result['local'] == 2
+
+
+def test_fallback_waits_for_local_students():
+    # X has no targets; its students must not take B or C places first
+    students = ([(i, 'X') for i in range(10)] + [(i, 'B') for i in range(10, 20)]
+                + [(i, 'C') for i in range(20, 30)] + [(30, None)])
+    targets = [
+        {'id': 'b', 'location': 'B', 'capacity': 10, 'load': 0},
+        {'id': 'c', 'location': 'C', 'capacity': 10, 'load': 0}
+    ]
+    
+    result = assign(students, targets)
+    
+    assert all(result['assignments'][i] == 'b' for i in range(10, 20))
+    assert all(result['assignments'][i] == 'c' for i in range(20, 30))
+    assert result['local'] == 20 and result['fallback'] == 0 and result['unassigned'] == 11
+
+
+def test_fallbacks_move_local_when_there_is_room():
+    # 1 and 2 sit on Nairobi as fallbacks; Mombasa has room for one of them
+    students = [(1, 'Mombasa'), (2, 'Mombasa'), (3, 'Kisumu')]
+    targets = [
+        {'id': 'n', 'location': 'Nairobi', 'capacity': 2, 'load': 2},
+        {'id': 'm', 'location': 'Mombasa', 'capacity': 1, 'load': 0}
+    ]
+    
+    result = assign(students, targets, current={1: 'n', 2: 'n'})
+    
+    # 1 moves home, 2 stays put and 3 takes the place 1 left
+    assert result['assignments'] == {1: 'm', 3: 'n'}
+    assert result['repaired'] == 1 and result['fallback'] == 1 and result['unassigned'] == 0
+
+
+def test_run_assignment_is_incremental(db):
+    db.create_cluster('Coast', 'Mombasa', 10)
+    db.create_cluster('Central', 'Nairobi', 10)
+    db.set_supervisor_capacity(2, 20, 'Nairobi')
+    first = add_students(db, ['Nairobi', 'Mombasa'])
+    
+    summary = run_assignment(db)
+    assert summary['clusters']['assigned'] == 3
+    assert summary['supervisors']['assigned'] == 3
+    
+    add_students(db, ['Nairobi'] * 2)
+    summary = run_assignment(db)
+    assert summary['clusters']['assigned'] == 2
+    
+    conn = db.get_connection()
+    assert conn.execute('SELECT COUNT(*) FROM student_clusters').fetchone()[0] == 5
+    assert conn.execute(
+        'SELECT c.location FROM student_clusters sc JOIN clusters c ON c.id = sc.cluster_id WHERE sc.student_id = ?',
+        (first[1],)
+    ).fetchone()[0] == 'Mombasa'
+    conn.close()
+
+
+def test_incremental_run_repairs_fallbacks(db):
+    db.create_cluster('Central', 'Nairobi', 10)
+    early, = add_students(db, [None])
+    stuck, = add_students(db, ['Kisumu'])
+    run_assignment(db)
+    
+    # The return form arrives and a cluster opens in the student's town
+    db.create_return_form(early, 'Acme', 'Mombasa', 'Boss', 'boss@acme.com', None, None)
+    db.create_cluster('Coast', 'Mombasa', 10)
+    summary = run_assignment(db)['clusters']
+    assert summary['repaired'] == 1 and summary['assigned'] == 0 and summary['unassigned'] == 0
+    
+    conn = db.get_connection()
+    locations = dict(conn.execute(
+        'SELECT sc.student_id, c.location FROM student_clusters sc JOIN clusters c ON c.id = sc.cluster_id'
+    ).fetchall())
+    conn.close()
+    assert locations[early] == 'Mombasa'
+    assert locations[stuck] == 'Nairobi'
+    assert run_assignment(db)['clusters']['repaired'] == 0
+
+
+def test_rebalance_keeps_industry_supervisor(db):
+    db.set_supervisor_capacity(2, 5, 'Nairobi')
+    student = add_students(db, ['Nairobi'])[0]
+    conn = db.get_connection()
+    conn.execute('INSERT INTO supervisors (student_id, industry_supervisor_id) VALUES (?, 3)', (student,))
+    conn.commit()
+    
+    run_assignment(db, rebalance=True)
+    
+    row = conn.execute('SELECT university_supervisor_id, industry_supervisor_id FROM supervisors WHERE student_id = ?',
+                       (student,)).fetchone()
+    conn.close()
+    assert row == (2, 3)
+
+
+def test_assignment_endpoint_requires_coordinator(db):
+    client = app_module.app.test_client()
+    client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+    assert client.post('/api/assignments/run').status_code == 403
+    
+    client.post('/api/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+    assert client.post('/api/clusters', json={'name': 'Central', 'location': 'Nairobi', 'capacity': 5}).status_code == 201
+    response = client.post('/api/assignments/run', json={})
+    assert response.get_json()['summary']['clusters']['assigned'] == 1
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the incrementally maintained attendance rollups
+"""
+
+import app as app_module
+
+
+def rollups(db, scope, period, **kwargs):
+    return {(r['scope_id'], r['period_start']): r for r in db.get_attendance_rollups(scope, period, **kwargs)}
+
+
+def test_mark_attendance_updates_rollups(db):
+    # 2025-08-11 is a Monday
+    db.mark_attendance(1, 1, '2025-08-11', 'present')
+    db.mark_attendance(1, 2, '2025-08-13', 'absent')
+    db.mark_attendance(2, 1, '2025-08-11', 'late')
+    
+    weekly = rollups(db, 'student', 'week')
+    assert weekly[(1, '2025-08-11')]['counts'] == {'present': 1, 'absent': 1}
+    assert weekly[(1, '2025-08-11')]['rate'] == 0.5
+    assert weekly[(2, '2025-08-11')]['rate'] == 1.0
+    
+    daily_slot = rollups(db, 'slot', 'day')
+    assert daily_slot[(1, '2025-08-11')]['total'] == 2
+    assert rollups(db, 'all', 'week')[(0, '2025-08-11')]['total'] == 3
+
+
+def test_remarking_moves_counts_between_statuses(db):
+    db.mark_attendance(1, 1, '2025-08-14', 'absent')
+    db.mark_attendance(1, 1, '2025-08-14', 'present')
+    
+    weekly = rollups(db, 'student', 'week')
+    
+    assert weekly[(1, '2025-08-11')]['counts'] == {'present': 1}
+    assert weekly[(1, '2025-08-11')]['total'] == 1
+
+
+def test_rebuild_matches_incremental(db):
+    marks = [
+        (1, 1, '2025-08-10', 'present'), (1, 1, '2025-08-11', 'absent'),
+        (2, 1, '2025-08-17', 'late'), (2, 3, '2025-08-18', 'present'),
+        (1, 1, '2025-08-11', 'present')
+    ]
+    for mark in marks:
+        db.mark_attendance(*mark)
+    
+    incremental = {
+        (scope, period): rollups(db, scope, period)
+        for scope in ('student', 'slot', 'all') for period in ('day', 'week')
+    }
+    db.rebuild_attendance_rollups()
+    rebuilt = {
+        (scope, period): rollups(db, scope, period)
+        for scope in ('student', 'slot', 'all') for period in ('day', 'week')
+    }
+    
+    assert rebuilt == incremental
+    assert (1, '2025-08-04') in rebuilt[('student', 'week')]
+
+
+def test_period_range_and_paging(db):
+    for user_id in range(1, 6):
+        db.mark_attendance(user_id, 1, '2025-08-11', 'present')
+    db.mark_attendance(1, 1, '2025-08-18', 'present')
+    
+    page = db.get_attendance_rollups('student', 'week', start='2025-08-11', end='2025-08-11', limit=2, offset=2)
+    
+    assert [r['scope_id'] for r in page] == [3, 4]
+
+
+def test_analytics_endpoints(db):
+    supervisor = app_module.app.test_client()
+    supervisor.post('/api/login', json={'email': 'bob@industry.com', 'password': 'password123'})
+    assert supervisor.post('/api/attendance', json={'user_id': 1, 'slot_id': 1, 'date': '15/08/2025'}).status_code == 400
+    supervisor.post('/api/attendance', json={'user_id': 1, 'slot_id': 1, 'date': '2025-08-15'})
+    
+    summary = supervisor.get('/api/analytics/attendance?period=day').get_json()
+    assert summary['results'][0]['period_start'] == '2025-08-15'
+    
+    student = app_module.app.test_client()
+    student.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+    assert student.get('/api/analytics/attendance/students/2').status_code == 403
+    own = student.get('/api/analytics/attendance/students').get_json()
+    assert own['results'][0]['scope_id'] == 1
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch endpoint and Database.read_transaction
+"""
+
+import gzip
+import json
+import sqlite3
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def db(file_db):
+    # Writes from a second connection must not wait on the read transaction
+    return file_db
+
+
+def insert_attendance(db, date):
+    conn = sqlite3.connect(db.db_path)
+    conn.execute("INSERT INTO attendance (user_id, slot_id, date, status) VALUES (1, 1, ?, 'present')", (date,))
+    conn.commit()
+    conn.close()
+
+
+def test_read_transaction_sees_one_state(db):
+    insert_attendance(db, '2025-08-11')
+    with db.read_transaction():
+        assert len(db.get_all_attendance()) == 1
+        insert_attendance(db, '2025-08-12')
+        assert len(db.get_all_attendance()) == 1
+        assert len(db.get_attendance_history(1)) == 1
+    assert len(db.get_all_attendance()) == 2
+
+
+def test_read_transaction_reuses_pooled_connection(db):
+    with db.read_transaction():
+        first = db.get_connection()
+    with db.read_transaction():
+        assert db.get_connection()._conn is first._conn
+    assert not isinstance(db.get_connection(), type(first))
+
+
+def test_batch_matches_standalone_requests(db, login):
+    db.create_booking(1, 1)
+    db.mark_attendance(1, 1, '2025-08-11', 'present')
+    client = login()
+    paths = ['/api/slots', '/api/reports', '/api/bookings/history', '/api/attendance/history',
+             '/api/attendance/history?start=2025-08-12']
+
+    response = client.post('/api/batch', json={'requests': [{'path': path} for path in paths]})
+    assert response.status_code == 200
+    responses = response.get_json()['responses']
+    assert [r['path'] for r in responses] == paths
+    for path, result in zip(paths, responses):
+        standalone = client.get(path)
+        assert result['status'] == standalone.status_code == 200
+        assert result['body'] == standalone.get_json()
+
+
+def test_batch_bodies_are_not_compressed(db, login):
+    conn = db.get_connection()
+    conn.executemany('INSERT INTO slots (name, date, time, max_capacity) VALUES (?, ?, ?, 10)',
+                     [(f'Session {i}', '2025-09-01', '09:00-10:00') for i in range(40)])
+    conn.commit()
+    conn.close()
+    client = login()
+
+    response = client.post('/api/batch', json={'requests': [{'path': '/api/slots'}]},
+                           headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    result = json.loads(gzip.decompress(response.data))['responses'][0]
+    assert result['status'] == 200
+    assert len(result['body']) == 43
+
+
+def test_read_transaction_keeps_snapshot_reads_on_snapshot(db):
+    insert_attendance(db, '2025-08-11')
+    db.refresh_snapshot()
+    insert_attendance(db, '2025-08-12')
+    
+    assert len(db.get_all_attendance()) == 1
+    with db.read_transaction():
+        assert len(db.get_all_attendance()) == 1
+        db.refresh_snapshot()
+        assert len(db.get_all_attendance()) == 1
+        assert len(db.get_attendance_history(1)) == 2
+    assert len(db.get_all_attendance()) == 2
+
+
+def test_batch_sub_requests_keep_auth(db, login):
+    response = login().post('/api/batch', json={'requests': [{'path': '/api/terms'}, {'path': '/api/slots'}]})
+    assert [r['status'] for r in response.get_json()['responses']] == [403, 200]
+
+    response = app_module.app.test_client().post('/api/batch', json={'requests': [{'path': '/api/bookings/history'}]})
+    assert response.get_json()['responses'][0]['status'] == 401
+
+
+@pytest.mark.parametrize('requests', [
+    [],
+    [{'path': '/api/book', 'method': 'POST'}],
+    [{'path': '/student'}],
+    [{'path': '/api/batch'}],
+    ['/api/slots'],
+    [{'path': '/api/slots'}] * (app_module.MAX_BATCH_REQUESTS + 1),
+])
+def test_batch_rejects_invalid_requests(db, requests, login):
+    assert login().post('/api/batch', json={'requests': requests}).status_code == 400
@@ -6,70 +6,67 @@ Test database functionality independently
 from database import Database
 import hashlib
 
-def test_database():
-    print("Testing Database Functionality...")
-    print("=" * 40)
-    
-    # Create database instance
-    db = Database()
-    
-    # Initialize database
-    print("Initializing database...")
-    db.initialize_database()
-    
+def test_database(db):
     # Test user creation
-    print("\nTesting user creation...")
     test_name = "Test User"
     test_email = "test@example.com"
     test_password = "testpass123"
     test_role = "student"
-    
+
     # Hash password
     hashed_password = hashlib.sha256(test_password.encode()).hexdigest()
-    print(f"Original password: {test_password}")
-    print(f"Hashed password: {hashed_password}")
-    
-    try:
-        # Create user
-        user_id = db.create_user(test_name, test_email, hashed_password, test_role)
-        print(f"✓ User created successfully with ID: {user_id}")
-        
-        # Try to retrieve user
-        user = db.get_user_by_email(test_email)
-        if user:
-            print(f"✓ User retrieved successfully:")
-            print(f"  ID: {user['id']}")
-            print(f"  Name: {user['name']}")
-            print(f"  Email: {user['email']}")
-            print(f"  Role: {user['role']}")
-            print(f"  Stored password hash: {user['password']}")
-            print(f"  Password match: {user['password'] == hashed_password}")
-        else:
-            print("✗ Failed to retrieve user")
-            
-        # Test login simulation
-        print(f"\nTesting login simulation...")
-        login_password = "testpass123"
-        login_hash = hashlib.sha256(login_password.encode()).hexdigest()
-        print(f"Login password: {login_password}")
-        print(f"Login hash: {login_hash}")
-        print(f"Hash match: {login_hash == hashed_password}")
-        
-        if login_hash == hashed_password:
-            print("✓ Login would succeed!")
-        else:
-            print("✗ Login would fail!")
-            
-    except Exception as e:
-        print(f"✗ Error: {e}")
-    
-    # Show all users
-    print(f"\nAll users in database:")
+
+    # Create user
+    user_id = db.create_user(test_name, test_email, hashed_password, test_role)
+    assert user_id
+
+    # Retrieve user
+    user = db.get_user_by_email(test_email)
+    assert user is not None
+    assert user['id'] == user_id
+    assert user['name'] == test_name
+    assert user['email'] == test_email
+    assert user['role'] == test_role
+    assert user['password'] == hashed_password
+
+    # Test login simulation
+    login_hash = hashlib.sha256("testpass123".encode()).hexdigest()
+    assert login_hash == hashed_password
+    assert hashlib.sha256("wrongpass".encode()).hexdigest() != hashed_password
+
+    # The new user joins the sample users
     users = db.get_all_users()
-    for user in users:
-        print(f"  - {user['name']} ({user['email']}) - {user['role']}")
+    assert test_email in [u['email'] for u in users]
+    assert db.get_total_users() == len(users) == 5
+
+def test_in_memory_databases_are_private():
+    first = Database(':memory:')
+    second = Database(':memory:')
+
+    first.create_user("Only Here", "only@example.com", "x", "student")
+
+    assert first.get_user_by_email("only@example.com")
+    assert second.get_user_by_email("only@example.com") is None
+    assert first.get_total_users() == second.get_total_users() + 1
+
+def test_template_copy_is_independent(template_db, tmp_path):
+    copy = Database(str(tmp_path / 'copy.db'), template=template_db)
+    copy.create_user("Copied", "copied@example.com", "x", "student")
+
+    assert Database(':memory:', template=template_db).get_user_by_email("copied@example.com") is None
+    assert copy.get_slot_by_id(1)['time'] == '09:00-12:00'
+
+def test_reopening_does_not_reseed(tmp_path):
+    path = str(tmp_path / 'reopened.db')
+    for _ in range(4):
+        db = Database(path)
+    
+    assert len(db.get_all_slots()) == 3
+    assert db.get_total_users() == 4
     
-    print(f"\nTotal users: {db.get_total_users()}")
+    assert Database(str(tmp_path / 'unseeded.db'), seed=False).get_total_users() == 0
 
 if __name__ == "__main__":
-    test_database()
+    test_database(Database(':memory:'))
+    test_in_memory_databases_are_private()
+    print("Database tests passed")
@@ -3,110 +3,69 @@
 Simple test script to verify Flask backend functionality
 """
 
-import requests
-import json
-
-BASE_URL = "http://localhost:5000"
-
-def test_frontend_routes():
+def test_frontend_routes(client):
     """Test all frontend routes"""
-    print("Testing Frontend Routes...")
-    
     routes = [
         "/",
-        "/login", 
+        "/login",
         "/register",
         "/student",
         "/supervisor",
         "/industry",
         "/admin"
     ]
-    
+
     for route in routes:
-        try:
-            response = requests.get(f"{BASE_URL}{route}")
-            print(f"✓ {route}: {response.status_code}")
-        except requests.exceptions.ConnectionError:
-            print(f"✗ {route}: Connection failed (Flask not running)")
-        except Exception as e:
-            print(f"✗ {route}: Error - {e}")
+        response = client.get(route)
+        assert response.status_code == 200, route
 
-def test_api_routes():
+def test_api_routes(client):
     """Test API endpoints"""
-    print("\nTesting API Routes...")
-    
     # Test registration
     test_user = {
         "name": "Test User",
-        "email": "test@example.com", 
+        "email": "test@example.com",
         "password": "testpass123",
         "role": "student"
     }
-    
-    try:
-        response = requests.post(f"{BASE_URL}/api/register", json=test_user)
-        print(f"✓ /api/register: {response.status_code}")
-        if response.status_code == 201:
-            print(f"  Response: {response.json()}")
-    except Exception as e:
-        print(f"✗ /api/register: Error - {e}")
-    
+
+    response = client.post("/api/register", json=test_user)
+    assert response.status_code == 201
+    assert response.get_json()['user_id']
+
     # Test login
     login_data = {
         "email": "john@student.com",
         "password": "password123"
     }
-    
-    try:
-        response = requests.post(f"{BASE_URL}/api/login", json=login_data)
-        print(f"✓ /api/login: {response.status_code}")
-        if response.status_code == 200:
-            print(f"  Response: {response.json()}")
-    except Exception as e:
-        print(f"✗ /api/login: Error - {e}")
-    
+
+    response = client.post("/api/login", json=login_data)
+    assert response.status_code == 200
+    assert response.get_json()['user']['email'] == login_data['email']
+
     # Test other API endpoints
     api_routes = [
         "/api/slots",
-        "/api/reports",
-        "/api/admin-view"
+        "/api/reports"
     ]
-    
+
     for route in api_routes:
-        try:
-            response = requests.get(f"{BASE_URL}{route}")
-            print(f"✓ {route}: {response.status_code}")
-        except Exception as e:
-            print(f"✗ {route}: Error - {e}")
+        response = client.get(route)
+        assert response.status_code == 200, route
+
+    # The admin view is for admins only
+    assert client.get("/admin-view").status_code == 403
 
-def test_static_files():
+def test_static_files(client):
     """Test if static files are accessible"""
-    print("\nTesting Static Files...")
-    
     static_files = [
         "/static/css/theme-styles.css",
         "/static/css/dashboard-styles.css",
         "/static/css/login-styles.css",
         "/static/js/theme-utils.js"
     ]
-    
-    for file_path in static_files:
-        try:
-            response = requests.get(f"{BASE_URL}{file_path}")
-            print(f"✓ {file_path}: {response.status_code}")
-        except Exception as e:
-            print(f"✗ {file_path}: Error - {e}")
 
-if __name__ == "__main__":
-    print("Flask Backend Test Suite")
-    print("=" * 40)
-    
-    test_frontend_routes()
-    test_api_routes()
-    test_static_files()
-    
-    print("\nTest completed!")
-    print("\nTo run the Flask app:")
-    print("1. Activate virtual environment: venv\\Scripts\\activate")
-    print("2. Run: python app.py")
-    print("3. Open browser to: http://localhost:5000")
+    for file_path in static_files:
+        response = client.get(file_path)
+        assert response.status_code == 200, file_path
+        response.close()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for the background job queue and report compilation
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import app as app_module
+import jobs
+from database import Database
+from file_store import FileStore
+
+
+@pytest.fixture
+def db(file_db, tmp_path, monkeypatch):
+    # On disk so the worker pool processes can open it
+    monkeypatch.setattr(app_module, 'file_store', FileStore(str(tmp_path / 'uploads')))
+    return file_db
+
+
+@pytest.fixture
+def student(db):
+    client = app_module.app.test_client()
+    client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+    return client
+
+
+def work_once(db):
+    job = db.claim_job(jobs.CONCURRENCY_LIMITS, jobs.STALE_AFTER)
+    return jobs.run_job(db, app_module.file_store, job)
+
+
+def test_report_compiled_and_downloaded(db, student):
+    db.create_logbook_entry(1, 1, 'Set up <the> build server')
+    
+    response = student.post('/api/jobs', json={'kind': 'compile_report'})
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    assert student.get(f'/api/jobs/{job_id}/result').status_code == 409
+    
+    assert work_once(db)
+    status = student.get(f'/api/jobs/{job_id}').get_json()
+    assert status['status'] == 'done'
+    
+    result = student.get(status['result_url'])
+    assert result.status_code == 200
+    assert b'Set up &lt;the&gt; build server' in result.data
+    result.close()
+
+
+def test_unchanged_inputs_reuse_result(db, student):
+    first = student.post('/api/jobs', json={'kind': 'logbook_document'}).get_json()
+    assert student.post('/api/jobs', json={'kind': 'logbook_document'}).get_json()['job_id'] == first['job_id']
+    work_once(db)
+    
+    cached = student.post('/api/jobs', json={'kind': 'logbook_document'})
+    assert cached.status_code == 200
+    assert cached.get_json()['job_id'] == first['job_id']
+    
+    db.create_logbook_entry(1, 2, 'New week')
+    fresh = student.post('/api/jobs', json={'kind': 'logbook_document'})
+    assert fresh.status_code == 202
+    assert fresh.get_json()['job_id'] != first['job_id']
+
+
+def test_students_cannot_compile_for_others(db, student):
+    assert student.post('/api/jobs', json={'kind': 'compile_report', 'student_id': 2}).status_code == 403
+    assert student.post('/api/jobs', json={'kind': 'rm -rf'}).status_code == 400
+
+
+def test_failures_retry_then_fail(db, monkeypatch):
+    monkeypatch.setattr(jobs, 'RETRY_BASE_DELAY', 0)
+    job_id = db.enqueue_job('compile_report', {'student_id': 999}, 'key', max_attempts=2)
+    
+    assert not work_once(db)
+    assert db.get_job(job_id)['status'] == 'queued'
+    assert not work_once(db)
+    
+    job = db.get_job(job_id)
+    assert job['status'] == 'failed'
+    assert job['attempts'] == 2
+    assert 'not found' in job['error']
+
+
+def test_concurrency_limit_and_stale_recovery(db):
+    db.enqueue_job('compile_report', {'student_id': 1}, 'a')
+    db.enqueue_job('compile_report', {'student_id': 1}, 'b')
+    limits = {'compile_report': 1}
+    
+    assert db.claim_job(limits, stale_after=60) is not None
+    assert db.claim_job(limits, stale_after=60) is None
+    # A worker that died mid-job: its job is requeued once stale
+    assert db.claim_job(limits, stale_after=-1) is not None
+
+
+def test_stale_job_fails_once_out_of_attempts(db):
+    job_id = db.enqueue_job('compile_report', {'student_id': 1}, 'key', max_attempts=2)
+    limits = {'compile_report': 1}
+    
+    assert db.claim_job(limits, stale_after=60)['attempts'] == 1
+    # Its worker dies each time, e.g. killed for running out of memory
+    assert db.claim_job(limits, stale_after=-1)['attempts'] == 2
+    assert db.claim_job(limits, stale_after=-1) is None
+    
+    job = db.get_job(job_id)
+    assert job['status'] == 'failed'
+    assert job['attempts'] == 2
+    assert job['error']
+
+
+def test_worker_survives_database_errors(db, monkeypatch, capsys):
+    stop_event = threading.Event()
+    calls = []
+    
+    def claim_job(self, limits, stale_after):
+        calls.append(stale_after)
+        if len(calls) <= 2:
+            raise sqlite3.OperationalError('database is locked')
+        stop_event.set()
+        return None
+    monkeypatch.setattr(Database, 'claim_job', claim_job)
+    
+    jobs.work(db.db_path, app_module.file_store.root, stop_event, poll_interval=0.001)
+    
+    assert len(calls) == 3
+    assert capsys.readouterr().out.count('database is locked') == 2
+
+
+def test_worker_pool_processes_jobs(db):
+    job, _ = jobs.submit_job(db, app_module.file_store, 'compile_report', {'student_id': 1})
+    stop_event, processes = jobs.start_pool(1, db.db_path, app_module.file_store.root, snapshot_interval=0)
+    try:
+        deadline = time.time() + 15
+        while db.get_job(job['id'])['status'] != 'done' and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        jobs.stop_pool(stop_event, processes)
+    
+    assert db.get_job(job['id'])['status'] == 'done'
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for logbook entries and full-text search
+"""
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def supervisor(db):
+    client = app_module.app.test_client()
+    client.post('/api/login', json={'email': 'jane@supervisor.com', 'password': 'password123'})
+    return client
+
+
+def test_search_ranks_and_highlights(db):
+    db.create_logbook_entry(1, 1, 'Configured the network switches and routers')
+    db.create_logbook_entry(1, 2, 'Network network network troubleshooting all day')
+    db.create_logbook_entry(1, 3, 'Wrote documentation for the payroll module')
+    
+    results = db.search_logbooks('network')['results']
+    
+    assert [r['week'] for r in results] == [2, 1]
+    assert '<mark>Network</mark>' in results[0]['snippet']
+
+
+def test_search_filters(db):
+    first = db.create_logbook_entry(1, 1, 'Database migration work')
+    db.create_logbook_entry(1, 2, 'Database backup work')
+    db.create_logbook_entry(2, 1, 'Database tuning work')
+    db.verify_logbook_entry(first, 2)
+    
+    assert len(db.search_logbooks('database', student_id=1)['results']) == 2
+    assert len(db.search_logbooks('database', week=1)['results']) == 2
+    assert [r['id'] for r in db.search_logbooks('database', verified=True)['results']] == [first]
+    assert len(db.search_logbooks('database', verified=False)['results']) == 2
+
+
+def test_rank_limited_to_newest_candidates(db, monkeypatch):
+    monkeypatch.setattr(db, 'LOGBOOK_RANK_CANDIDATES', 2)
+    db.create_logbook_entry(1, 1, 'Server server server server')
+    db.create_logbook_entry(1, 2, 'Restarted the server once')
+    db.create_logbook_entry(2, 3, 'Server and network checks')
+    
+    ranked = db.search_logbooks('server')
+    assert sorted(r['week'] for r in ranked['results']) == [2, 3]
+    assert ranked['truncated'] and not ranked['has_more']
+    assert len(db.search_logbooks('server', order='recent')['results']) == 3
+    assert not db.search_logbooks('server', order='recent')['truncated']
+    assert not db.search_logbooks('network')['truncated']
+    assert [r['week'] for r in db.search_logbooks('server', week=1)['results']] == [1]
+    assert [r['week'] for r in db.search_logbooks('server', student_id=1)['results']] == [1, 2]
+    assert [r['week'] for r in db.search_logbooks('server', student_id=1, week=2)['results']] == [2]
+    assert db.search_logbooks('server', student_id=3)['results'] == []
+
+
+def test_search_paginates(db):
+    for week in range(1, 6):
+        db.create_logbook_entry(1, week, f'Weekly server maintenance {week}')
+    
+    first = db.search_logbooks('server', per_page=2, page=1)
+    last = db.search_logbooks('server', per_page=2, page=3)
+    
+    assert len(first['results']) == 2 and first['has_more']
+    assert len(last['results']) == 1 and not last['has_more']
+
+
+def test_index_follows_updates_and_deletes(db):
+    entry_id = db.create_logbook_entry(1, 1, 'Installed printers')
+    conn = db.get_connection()
+    conn.execute("UPDATE logbooks SET entry = 'Installed scanners' WHERE id = ?", (entry_id,))
+    conn.commit()
+    conn.close()
+    
+    assert db.search_logbooks('printers')['results'] == []
+    assert len(db.search_logbooks('scanners')['results']) == 1
+
+
+def test_search_input_is_not_fts_syntax(db):
+    db.create_logbook_entry(1, 1, 'Fixed the "login" page <b>bug</b>')
+    
+    results = db.search_logbooks('"login" page: (bug')['results']
+    
+    assert len(results) == 1
+    assert '<b>' not in results[0]['snippet']
+    assert db.search_logbooks('logi*')['results']
+
+
+def test_search_endpoint_requires_supervisor(db, supervisor):
+    student = app_module.app.test_client()
+    student.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+    assert student.post('/api/logbooks', json={'week': 1, 'entry': 'Set up the firewall'}).status_code == 201
+    assert student.get('/api/logbooks/search?q=firewall').status_code == 403
+    
+    response = supervisor.get('/api/logbooks/search?q=firewall&verified=false')
+    
+    assert response.status_code == 200
+    assert response.get_json()['results'][0]['week'] == 1
+    entry_id = response.get_json()['results'][0]['id']
+    assert supervisor.post(f'/api/logbooks/{entry_id}/verify').status_code == 200
+    assert supervisor.get('/api/logbooks/search?q=firewall&verified=false').get_json()['results'] == []
+
+
+def test_search_by_recency(db):
+    for week in range(1, 4):
+        db.create_logbook_entry(1, week, 'Routine backup checks' + ' backup' * week)
+    
+    results = db.search_logbooks('backup', order='recent')['results']
+    
+    assert [r['week'] for r in results] == [3, 2, 1]
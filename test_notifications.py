@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for notifications, broadcasts and unread counts
+"""
+
+
+def test_broadcast_to_users_and_role(db):
+    student_ids = [db.create_user(f'S{i}', f's{i}@student.com', 'hash', 'student') for i in range(5)]
+    
+    assert db.broadcast_notification('Logbooks due', user_ids=student_ids[:3]) == 3
+    assert db.broadcast_notification('Term starts', role='student') == 6
+    
+    assert db.get_unread_count(student_ids[0]) == 2
+    assert db.get_unread_count(student_ids[4]) == 1
+
+
+def test_keyset_pagination_newest_first(db):
+    for i in range(5):
+        db.create_notification(1, f'Message {i}')
+    
+    first = db.get_notifications(1, limit=2)
+    second = db.get_notifications(1, before_id=first[-1]['id'], limit=2)
+    third = db.get_notifications(1, before_id=second[-1]['id'], limit=2)
+    
+    assert [n['message'] for n in first + second + third] == [f'Message {i}' for i in range(4, -1, -1)]
+
+
+def test_mark_all_read_respects_up_to_id(db):
+    ids = [db.create_notification(1, f'Message {i}') for i in range(3)]
+    
+    assert db.mark_all_notifications_read(1, up_to_id=ids[1]) == 2
+    assert db.get_unread_count(1) == 1
+    assert db.mark_all_notifications_read(1) == 1
+    assert db.get_unread_count(1) == 0
+
+
+def test_unread_count_uses_partial_index(db):
+    conn = db.get_connection()
+    plan = conn.execute(
+        'EXPLAIN QUERY PLAN SELECT COUNT(*) FROM notifications WHERE user_id = ? AND is_read = 0', (1,)
+    ).fetchall()
+    conn.close()
+    
+    assert 'idx_notifications_unread' in str(plan)
+
+
+def test_notification_endpoints(db, login):
+    coordinator = login('admin@example.com', 'admin123')
+    student = login('john@student.com')
+    
+    assert student.post('/api/notifications/broadcast', json={'message': 'Hi', 'role': 'student'}).status_code == 403
+    response = coordinator.post('/api/notifications/broadcast', json={'message': 'Submit reports', 'role': 'student'})
+    assert response.get_json()['recipients'] == 1
+    
+    listing = student.get('/api/notifications').get_json()
+    assert listing['unread_count'] == 1
+    assert listing['notifications'][0]['message'] == 'Submit reports'
+    
+    notification_id = listing['notifications'][0]['id']
+    assert coordinator.post(f'/api/notifications/{notification_id}/read').status_code == 404
+    assert student.post(f'/api/notifications/{notification_id}/read').status_code == 200
+    assert student.get('/api/notifications/unread-count').get_json()['unread_count'] == 0
+
+
+def test_broadcast_validates_recipients(db, login):
+    supervisor = login('jane@supervisor.com')
+    
+    assert supervisor.post('/api/notifications/broadcast', json={'message': 'Hi', 'role': 'student'}).status_code == 403
+    for user_ids in ('1,2', [1, '2'], [True], {'id': 1}):
+        response = supervisor.post('/api/notifications/broadcast', json={'message': 'Hi', 'user_ids': user_ids})
+        assert response.status_code == 400
+    response = supervisor.post('/api/notifications/broadcast', json={'message': 'Hi', 'user_ids': [1]})
+    assert response.get_json()['recipients'] == 1
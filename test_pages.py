@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached, ETag-validated frontend pages
+"""
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client():
+    app_module.page_cache.clear()
+    return app_module.app.test_client()
+
+
+@pytest.mark.parametrize('route', ['/', '/login', '/register', '/student', '/supervisor', '/industry', '/admin'])
+def test_pages_served_with_etag(client, route):
+    response = client.get(route)
+    
+    assert response.status_code == 200
+    assert response.headers['ETag']
+    assert response.cache_control.no_cache
+
+
+def test_dashboard_rendered_once(client, monkeypatch):
+    client.get('/student')
+    
+    def fail(*args, **kwargs):
+        raise AssertionError('dashboard re-rendered')
+    monkeypatch.setattr(app_module, 'render_template', fail)
+    
+    assert client.get('/supervisor').status_code == 200
+    assert client.get('/admin').status_code == 200
+
+
+def test_matching_etag_returns_not_modified(client):
+    etag = client.get('/student').headers['ETag']
+    
+    response = client.get('/student', headers={'If-None-Match': etag})
+    
+    assert response.status_code == 304
+    assert response.data == b''
+
+
+def test_compressed_page_keeps_weak_etag(client):
+    response = client.get('/student', headers={'Accept-Encoding': 'gzip'})
+    etag = response.headers['ETag']
+    
+    again = client.get('/student', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    
+    assert again.status_code == 304
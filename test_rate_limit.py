@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the token bucket rate limiter
+"""
+
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+import app as app_module
+from rate_limit import RateLimiter
+
+
+def test_login_limited_with_retry_after(client):
+    credentials = {'email': 'john@student.com', 'password': 'wrong'}
+    statuses = [client.post('/api/login', json=credentials).status_code for _ in range(6)]
+    
+    assert statuses == [401] * 5 + [429]
+    response = client.post('/api/login', json=credentials)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_login_limited_per_email_and_address(client, rate_limiter):
+    rate_limiter.limits = dict(rate_limiter.limits, login_address={'*': (6, 0.001)})
+    
+    def attempt(email, address):
+        return client.post('/api/login', json={'email': email, 'password': 'wrong'},
+                           environ_base={'REMOTE_ADDR': address}).status_code
+    
+    assert [attempt('john@student.com', '10.0.0.1') for _ in range(6)] == [401] * 5 + [429]
+    assert attempt('JOHN@student.com', '10.0.0.1') == 429
+    assert attempt('john@student.com', '10.0.0.2') == 401
+    assert [attempt(f'user{i}@example.com', '10.0.0.3') for i in range(7)] == [401] * 6 + [429]
+
+
+def test_forwarded_address_used_only_behind_trusted_proxies(client, rate_limiter):
+    rate_limiter.limits = {'*': {'*': (1, 0.001)}}
+    
+    def status(forwarded_for):
+        return client.get('/api/slots', headers={'X-Forwarded-For': forwarded_for}).status_code
+    
+    assert [status('1.1.1.1'), status('2.2.2.2')] == [200, 429]
+    
+    wsgi_app = app_module.app.wsgi_app
+    app_module.app.wsgi_app = ProxyFix(wsgi_app, x_for=1)
+    try:
+        assert [status('3.3.3.3'), status('4.4.4.4'), status('4.4.4.4')] == [200, 200, 429]
+    finally:
+        app_module.app.wsgi_app = wsgi_app
+
+
+def test_booking_limited_per_user(client, rate_limiter):
+    client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+    
+    statuses = [client.post('/api/book', json={'slot_id': slot_id}).status_code for slot_id in (1, 2, 3, 1)]
+    
+    assert statuses == [201, 201, 201, 429]
+
+
+def test_admin_role_gets_larger_bucket(client):
+    client.post('/api/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+    
+    statuses = [client.post('/api/book', json={'slot_id': 1, 'user_id': 1}).status_code for _ in range(4)]
+    
+    assert 429 not in statuses
+
+
+def test_static_files_not_limited(client, rate_limiter):
+    rate_limiter.limits = {'*': {'*': (1, 0.001)}, 'static': {'*': None}}
+    
+    for _ in range(3):
+        response = client.get('/static/css/styles.css')
+        assert response.status_code == 200
+        response.close()
+
+
+def test_buckets_shared_between_limiters(tmp_path):
+    path = str(tmp_path / 'shared.db')
+    worker_a = RateLimiter(path)
+    worker_b = RateLimiter(path)
+    
+    assert worker_a.consume('k', capacity=2, rate=0.001) == 0
+    assert worker_b.consume('k', capacity=2, rate=0.001) == 0
+    assert worker_a.consume('k', capacity=2, rate=0.001) > 0
+
+
+def test_purge_idle_buckets(rate_limiter):
+    rate_limiter.consume('k', capacity=1, rate=1)
+    rate_limiter.purge_idle(idle_seconds=-1)
+    
+    count = rate_limiter.get_connection().execute('SELECT COUNT(*) FROM buckets').fetchone()[0]
+    assert count == 0
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Tests for slot intervals, overlapping booking rejection and the schedule
+"""
+
+import multiprocessing
+import sqlite3
+import threading
+
+import pytest
+
+import app as app_module
+from database import Database, BookingConflict, SlotFull, SLOT_INTERVAL_VERSION
+
+
+def add_slot(db, date, time, name='Session'):
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute('INSERT INTO slots (name, date, time, max_capacity) VALUES (?, ?, ?, 10)', (name, date, time))
+    slot_id = cursor.lastrowid
+    conn.commit()
+    conn.close()
+    return slot_id
+
+
+def interval(db, slot_id):
+    conn = db.get_connection()
+    row = conn.execute('SELECT start_at, end_at FROM slots WHERE id = ?', (slot_id,)).fetchone()
+    conn.close()
+    return row
+
+
+def test_intervals_are_parsed_and_kept_in_step(db):
+    slot_id = add_slot(db, '2025-09-01', '09:00 - 12:30')
+    assert interval(db, slot_id) == ('2025-09-01 09:00:00', '2025-09-01 12:30:00')
+
+    assert interval(db, add_slot(db, '2025-09-01', '22:00-02:00')) == ('2025-09-01 22:00:00', '2025-09-02 02:00:00')
+    assert interval(db, add_slot(db, '2025-09-01', 'all day')) == (None, None)
+
+    conn = db.get_connection()
+    conn.execute("UPDATE slots SET time = '13:00-14:00' WHERE id = ?", (slot_id,))
+    conn.commit()
+    conn.close()
+    assert interval(db, slot_id) == ('2025-09-01 13:00:00', '2025-09-01 14:00:00')
+
+
+def test_unpadded_and_hand_typed_times_are_parsed(db):
+    assert interval(db, add_slot(db, '2025-09-01', '9:00-12:00')) == ('2025-09-01 09:00:00', '2025-09-01 12:00:00')
+    assert interval(db, add_slot(db, '2025-09-01', '9-5:30pm')) == ('2025-09-01 09:00:00', '2025-09-01 17:30:00')
+    assert interval(db, add_slot(db, '2025-09-01', '8.30am - 1 PM')) == ('2025-09-01 08:30:00', '2025-09-01 13:00:00')
+
+    # Both columns or neither, so a half-parsed slot never dodges the overlap check
+    assert interval(db, add_slot(db, '2025-09-01', '9:00-noon')) == (None, None)
+    assert interval(db, add_slot(db, '2025-09-01', '09:00-25:00')) == (None, None)
+
+    padded = add_slot(db, '2025-09-01', '09:00-12:00', 'Padded')
+    db.create_booking(1, padded)
+    with pytest.raises(BookingConflict) as error:
+        db.create_booking(1, add_slot(db, '2025-09-01', '9:30-10:30'))
+    assert error.value.slot['name'] == 'Padded'
+
+
+def test_migration_backfills_existing_slots(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE slots (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, date TEXT NOT NULL,
+                            time TEXT NOT NULL, max_capacity INTEGER NOT NULL, booked_count INTEGER DEFAULT 0)
+    ''')
+    conn.execute("INSERT INTO slots (name, date, time, max_capacity) VALUES ('Old', '2025-01-06', '08:00-10:00', 5)")
+    conn.commit()
+    conn.close()
+
+    db = Database(path)
+    assert interval(db, 1) == ('2025-01-06 08:00:00', '2025-01-06 10:00:00')
+
+
+def test_reopening_upgrades_older_interval_triggers(tmp_path):
+    path = str(tmp_path / 'upgrade.db')
+    db = Database(path)
+    slot_id = add_slot(db, '2025-01-06', '9:00-12:00')
+    # As left behind by an older parser version
+    conn = db.get_connection()
+    for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name GLOB 'slots_interval_*'").fetchall():
+        conn.execute(f'DROP TRIGGER {name}')
+    conn.execute('CREATE TRIGGER slots_interval_insert_v1 AFTER INSERT ON slots BEGIN SELECT 1; END')
+    conn.execute("UPDATE slots SET start_at = NULL WHERE id = ?", (slot_id,))
+    conn.commit()
+    conn.close()
+
+    db = Database(path)
+    assert interval(db, slot_id) == ('2025-01-06 09:00:00', '2025-01-06 12:00:00')
+    assert interval(db, add_slot(db, '2025-01-06', '1pm-2pm')) == ('2025-01-06 13:00:00', '2025-01-06 14:00:00')
+    conn = db.get_connection()
+    triggers = conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name GLOB 'slots_interval_*'").fetchall()
+    conn.close()
+    assert sorted(name for name, in triggers) == [f'slots_interval_insert_v{SLOT_INTERVAL_VERSION}',
+                                                  f'slots_interval_update_v{SLOT_INTERVAL_VERSION}']
+
+
+def _open(path, barrier, errors):
+    barrier.wait()
+    try:
+        Database(path, seed=False)
+    except Exception as e:
+        errors.put(repr(e))
+
+
+def test_processes_can_open_the_database_together(tmp_path):
+    path = str(tmp_path / 'shared.db')
+    Database(path)
+    errors = multiprocessing.Queue()
+    for _ in range(5):
+        barrier = multiprocessing.Barrier(6)
+        processes = [multiprocessing.Process(target=_open, args=(path, barrier, errors)) for _ in range(6)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    assert errors.empty()
+
+    db = Database(path)
+    assert interval(db, add_slot(db, '2025-01-06', '9-10')) == ('2025-01-06 09:00:00', '2025-01-06 10:00:00')
+
+
+def test_overlapping_booking_is_rejected(db):
+    morning = add_slot(db, '2025-09-01', '09:00-12:00', 'Morning')
+    late_morning = add_slot(db, '2025-09-01', '11:00-13:00')
+    afternoon = add_slot(db, '2025-09-01', '12:00-15:00')
+    overnight = add_slot(db, '2025-08-31', '23:00-09:30')
+
+    db.create_booking(1, morning)
+    with pytest.raises(BookingConflict) as error:
+        db.create_booking(1, late_morning)
+    assert error.value.slot['name'] == 'Morning'
+    with pytest.raises(BookingConflict):
+        db.create_booking(1, morning)
+    with pytest.raises(BookingConflict):
+        db.create_booking(1, overnight)
+
+    # Touching slots and other students are fine
+    db.create_booking(1, afternoon)
+    db.create_booking(2, late_morning)
+    assert db.get_slot_by_id(late_morning)['booked_count'] == 1
+
+
+def test_full_slot_rejected_inside_the_booking(db):
+    slot_id = add_slot(db, '2025-09-01', '09:00-12:00')
+    conn = db.get_connection()
+    conn.execute('UPDATE slots SET max_capacity = 1 WHERE id = ?', (slot_id,))
+    conn.commit()
+    conn.close()
+    
+    db.create_booking(1, slot_id)
+    with pytest.raises(SlotFull):
+        db.create_booking(2, slot_id)
+    assert db.get_slot_by_id(slot_id)['booked_count'] == 1
+    assert [b['user_id'] for b in db.get_all_bookings() if b['slot_id'] == slot_id] == [1]
+
+
+def test_concurrent_bookings_never_overbook(file_db):
+    db = file_db
+    slot_id = add_slot(db, '2025-09-01', '09:00-12:00')
+    conn = db.get_connection()
+    conn.execute('UPDATE slots SET max_capacity = 3 WHERE id = ?', (slot_id,))
+    conn.commit()
+    conn.close()
+    users = [db.create_user(f'Racer {i}', f'racer{i}@example.com', 'x', 'student') for i in range(8)]
+    barrier = threading.Barrier(len(users))
+    outcomes = []
+    
+    def book(user_id):
+        barrier.wait()
+        try:
+            db.create_booking(user_id, slot_id)
+            outcomes.append('booked')
+        except SlotFull:
+            outcomes.append('full')
+    
+    threads = [threading.Thread(target=book, args=(user_id,)) for user_id in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert sorted(outcomes) == ['booked'] * 3 + ['full'] * 5
+    assert db.get_slot_by_id(slot_id)['booked_count'] == 3
+
+
+def test_schedule_flags_conflicts(db):
+    first = add_slot(db, '2025-09-01', '09:00-12:00')
+    second = add_slot(db, '2025-09-01', '10:00-11:00')
+    third = add_slot(db, '2025-09-01', '11:30-13:00')
+    later = add_slot(db, '2025-09-02', '09:00-12:00')
+    # Bookings made before overlap checks existed
+    conn = db.get_connection()
+    conn.executemany('INSERT INTO bookings (user_id, slot_id) VALUES (1, ?)', [(first,), (second,), (third,), (later,)])
+    conn.commit()
+    conn.close()
+
+    schedule = db.get_schedule(1)
+    assert [entry['slot_id'] for entry in schedule] == [first, second, third, later]
+    ids = {entry['slot_id']: entry['booking_id'] for entry in schedule}
+    conflicts = {entry['slot_id']: sorted(entry['conflicts']) for entry in schedule}
+    assert conflicts[first] == sorted([ids[second], ids[third]])
+    assert conflicts[second] == [ids[first]]
+    assert conflicts[later] == []
+
+    assert [entry['slot_id'] for entry in db.get_schedule(1, start='2025-09-02 00:00:00')] == [later]
+
+
+def test_book_and_schedule_endpoints(db):
+    morning = add_slot(db, '2025-09-01', '09:00-12:00')
+    overlap = add_slot(db, '2025-09-01', '10:00-11:00')
+    client = app_module.app.test_client()
+    client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+
+    assert client.post('/api/book', json={'slot_id': morning}).status_code == 201
+    response = client.post('/api/book', json={'slot_id': overlap})
+    assert response.status_code == 409
+    assert response.get_json()['conflict']['id'] == morning
+    
+    conn = db.get_connection()
+    conn.execute('UPDATE slots SET max_capacity = booked_count WHERE id = ?', (morning,))
+    conn.commit()
+    conn.close()
+    client.post('/api/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+    response = client.post('/api/book', json={'slot_id': morning, 'user_id': 3})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Slot is full'
+    client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+
+    response = client.get('/api/schedule?user_id=2')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [entry['slot_id'] for entry in body['schedule']] == [morning]
+    assert body['conflicts'] == 0
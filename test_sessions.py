@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Tests for the server-side session store and the login_required decorator
+"""
+
+import pytest
+
+import app as app_module
+from session_store import SessionStore
+
+
+def test_book_requires_login(client):
+    response = client.post('/api/book', json={'user_id': 1, 'slot_id': 1})
+    
+    assert response.status_code == 401
+
+
+def test_book_uses_session_user_not_body(client, db, login):
+    login('john@student.com', client=client)
+    other = db.create_user('Other', 'other@student.com', 'hash', 'student')
+    
+    response = client.post('/api/book', json={'user_id': other, 'slot_id': 1})
+    
+    assert response.status_code == 201
+    assert db.get_all_bookings()[0]['user_id'] == db.get_user_by_email('john@student.com')['id']
+
+
+def test_bearer_token_accepted(db):
+    client = app_module.app.test_client()
+    response = client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+    token = response.get_json()['session_token']
+    
+    fresh_client = app_module.app.test_client()
+    response = fresh_client.post('/api/book', json={'slot_id': 1},
+                                 headers={'Authorization': f'Bearer {token}'})
+    
+    assert response.status_code == 201
+
+
+def test_attendance_restricted_to_supervisors(client, login):
+    login('john@student.com', client=client)
+    payload = {'user_id': 1, 'slot_id': 1, 'date': '2025-08-15'}
+    assert client.post('/api/attendance', json=payload).status_code == 403
+    
+    login('bob@industry.com', client=client)
+    assert client.post('/api/attendance', json=payload).status_code == 201
+
+
+def test_cached_session_skips_database(client, monkeypatch):
+    response = client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+    token = response.get_json()['session_token']
+    store = app_module.session_store
+    store.get(token)
+    
+    def fail(*args, **kwargs):
+        raise AssertionError('session resolved from the database')
+    monkeypatch.setattr(store.db, 'get_session', fail)
+    monkeypatch.setattr(store.db, 'get_user_by_email', fail)
+    
+    assert store.get(token)['user']['email'] == 'john@student.com'
+
+
+def test_bulk_expiry_by_role(db):
+    store = SessionStore(db)
+    student = db.get_user_by_email('john@student.com')
+    admin = db.get_user_by_email('admin@example.com')
+    student_token = store.create(student)
+    admin_token = store.create(admin)
+    
+    assert store.expire(role='student') == 1
+    
+    assert store.get(student_token) is None
+    assert store.get(admin_token) is not None
+
+
+def test_expire_endpoint_requires_a_filter(client, db, login):
+    SessionStore(db).create(db.get_user_by_email('john@student.com'))
+    login('admin@example.com', 'admin123', client=client)
+    
+    assert client.post('/api/sessions/expire', json={}).status_code == 400
+    assert client.post('/api/sessions/expire', json={'user_ids': '1'}).status_code == 400
+    
+    response = client.post('/api/sessions/expire', json={'user_ids': [1]})
+    assert response.get_json()['expired'] == 1
+    
+    response = client.post('/api/sessions/expire', json={'all': True})
+    assert response.get_json()['expired'] == 1
+    assert client.get('/api/terms').status_code == 401
+
+
+def test_register_privileged_roles_need_admin(client, login):
+    new_admin = {'name': 'Eve', 'email': 'eve@example.com', 'password': 'pw', 'role': 'admin'}
+    assert client.post('/api/register', json=new_admin).status_code == 403
+    assert client.post('/api/register', json=dict(new_admin, role='root')).status_code == 400
+    
+    login('jane@supervisor.com', client=client)
+    assert client.post('/api/register', json=new_admin).status_code == 403
+    
+    login('admin@example.com', 'admin123', client=client)
+    assert client.post('/api/register', json=new_admin).status_code == 201
+
+
+def test_revocation_seen_by_other_workers(db):
+    worker_a = SessionStore(db, revalidate_interval=0)
+    worker_b = SessionStore(db, revalidate_interval=0)
+    token = worker_a.create(db.get_user_by_email('john@student.com'))
+    assert worker_b.get(token) is not None
+    
+    worker_a.delete(token)
+    
+    assert worker_b.get(token) is None
+
+
+def test_revocation_drops_only_that_token(db, monkeypatch):
+    worker_a = SessionStore(db, revalidate_interval=0)
+    worker_b = SessionStore(db, revalidate_interval=0)
+    john = db.get_user_by_email('john@student.com')
+    revoked = worker_a.create(john)
+    kept = worker_a.create(john)
+    other = worker_a.create(db.get_user_by_email('bob@industry.com'))
+    for token in (revoked, kept, other):
+        assert worker_b.get(token) is not None
+    
+    worker_a.delete(revoked)
+    conn = db.get_connection()
+    conn.execute("UPDATE users SET name = 'Robert' WHERE email = 'bob@industry.com'")
+    conn.commit()
+    conn.close()
+    
+    assert worker_b.get(revoked) is None
+    assert worker_b.get(other)['user']['name'] == 'Robert'
+    monkeypatch.setattr(db, 'get_session', lambda token: pytest.fail('kept session reloaded'))
+    assert worker_b.get(kept) is not None
+
+
+def test_pruned_revocations_clear_the_cache(db):
+    worker_a = SessionStore(db, revalidate_interval=0)
+    worker_b = SessionStore(db, revalidate_interval=0)
+    token = worker_a.create(db.get_user_by_email('john@student.com'))
+    assert worker_b.get(token) is not None
+    
+    worker_a.delete(worker_a.create(db.get_user_by_email('bob@industry.com')))
+    conn = db.get_connection()
+    conn.execute('DELETE FROM session_revocations')
+    conn.commit()
+    conn.close()
+    worker_a.delete(token)
+    
+    assert worker_b.get(token) is None
+
+
+def test_expired_session_rejected(db):
+    store = SessionStore(db, ttl=-1)
+    token = store.create(db.get_user_by_email('john@student.com'))
+    
+    assert store.get(token) is None
+
+
+def test_logins_purge_expired_sessions_and_old_revocations(db):
+    conn = db.get_connection()
+    conn.execute("INSERT INTO sessions (token, user_id, expires_at) VALUES ('old', 1, 1)")
+    conn.execute("INSERT INTO session_revocations (token, revoked_at) VALUES ('gone', 1)")
+    conn.execute("INSERT INTO session_revocations (token) VALUES ('recent')")
+    conn.commit()
+    conn.close()
+    store = SessionStore(db)
+    
+    token = store.create(db.get_user_by_email('john@student.com'))
+    
+    conn = db.get_connection()
+    assert [row[0] for row in conn.execute('SELECT token FROM sessions')] == [token]
+    assert [row[0] for row in conn.execute('SELECT token FROM session_revocations')] == ['recent']
+    conn.close()
+    assert store.get(token) is not None
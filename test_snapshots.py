@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the read-only analytics snapshot
+"""
+
+import os
+import sqlite3
+import time
+
+import pytest
+
+import app as app_module
+
+
+def test_reads_fall_back_to_live_database_without_snapshot(db):
+    assert db.snapshot_age() is None
+    db.mark_attendance(1, 1, '2025-08-11', 'present')
+    assert len(db.get_all_attendance()) == 1
+
+
+def test_snapshot_is_stale_until_refreshed(db):
+    db.mark_attendance(1, 1, '2025-08-11', 'present')
+    db.refresh_snapshot()
+    assert db.snapshot_age() < 5
+
+    db.mark_attendance(1, 2, '2025-08-12', 'absent')
+    assert len(db.get_all_attendance()) == 1
+    assert db.get_attendance_rollups('student', 'week')[0]['total'] == 1
+    # Report data is per request and must not be stale
+    assert db.get_student_report_data(1)['attendance'][0]['total'] == 2
+
+    db.refresh_snapshot()
+    assert len(db.get_all_attendance()) == 2
+    assert db.get_attendance_rollups('student', 'week')[0]['total'] == 2
+
+
+def test_stale_snapshot_falls_back_to_live_database(db):
+    db.refresh_snapshot()
+    db.mark_attendance(1, 1, '2025-08-11', 'present')
+    assert len(db.get_all_attendance()) == 0
+    
+    db.snapshot_max_age = 60
+    old = time.time() - 61
+    os.utime(db.snapshot_path, (old, old))
+    assert len(db.get_all_attendance()) == 1
+
+
+def test_snapshot_is_read_only(db):
+    db.refresh_snapshot()
+    conn = db.get_read_connection()
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM attendance")
+    conn.close()
+
+
+def test_refresh_endpoint_requires_admin(db):
+    client = app_module.app.test_client()
+    assert client.post('/api/snapshots/refresh').status_code == 401
+
+    client.post('/api/login', json={'email': 'john@student.com', 'password': 'password123'})
+    assert client.post('/api/snapshots/refresh').status_code == 403
+
+    client.post('/api/login', json={'email': 'admin@example.com', 'password': 'admin123'})
+    response = client.post('/api/snapshots/refresh')
+    assert response.status_code == 200
+    assert db.snapshot_age() is not None
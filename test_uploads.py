@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for streamed, content-addressed uploads
+"""
+
+import hashlib
+import io
+import os
+
+import pytest
+
+import app as app_module
+import file_store as file_store_module
+from file_store import FileStore, UploadTooLarge
+
+
+@pytest.fixture
+def store(db, tmp_path, monkeypatch):
+    store = FileStore(str(tmp_path / 'uploads'))
+    monkeypatch.setattr(app_module, 'file_store', store)
+    return store
+
+
+def stored_files(store):
+    return [name for _, _, files in os.walk(store.root) for name in files]
+
+
+def test_raw_upload_is_content_addressed_and_deduplicated(store, login):
+    client = login('john@student.com')
+    body = b'final report ' * 10000
+    
+    first = client.post('/api/uploads', data=body, content_type='application/pdf',
+                        headers={'X-Filename': 'report.pdf'}).get_json()
+    second = client.post('/api/uploads', data=body, content_type='application/pdf').get_json()
+    
+    assert first['digest'] == second['digest'] == hashlib.sha256(body).hexdigest()
+    assert first['size'] == len(body)
+    assert stored_files(store) == [first['digest']]
+
+
+def test_multipart_upload(store, login):
+    client = login('john@student.com')
+    
+    response = client.post('/api/uploads', data={'file': (io.BytesIO(b'insurance'), 'insurance.pdf')},
+                           content_type='multipart/form-data')
+    
+    assert response.status_code == 201
+    assert response.get_json()['digest'] == hashlib.sha256(b'insurance').hexdigest()
+
+
+def test_download_supports_ranges(store, login):
+    client = login('john@student.com')
+    body = bytes(range(256)) * 100
+    digest = client.post('/api/uploads', data=body, headers={'X-Filename': 'logbook.pdf'}).get_json()['digest']
+    
+    full = client.get(f'/api/uploads/{digest}')
+    partial = client.get(f'/api/uploads/{digest}', headers={'Range': 'bytes=100-199'})
+    
+    assert full.data == body
+    assert 'logbook.pdf' in full.headers['Content-Disposition']
+    assert partial.status_code == 206
+    assert partial.data == body[100:200]
+    full.close()
+    partial.close()
+
+
+def test_students_cannot_download_others_files(store, login):
+    digest = login('john@student.com').post('/api/uploads', data=b'private').get_json()['digest']
+    app_module.app.test_client().post('/api/register', json={
+        'name': 'Mary', 'email': 'mary@student.com', 'password': 'password123', 'role': 'student'
+    })
+    
+    assert login('mary@student.com').get(f'/api/uploads/{digest}').status_code == 404
+    response = login('jane@supervisor.com').get(f'/api/uploads/{digest}')
+    assert response.status_code == 200
+    response.close()
+
+
+def test_final_report_requires_own_uploads(store, login):
+    client = login('john@student.com')
+    report = client.post('/api/uploads', data=b'report').get_json()['digest']
+    logbook = client.post('/api/uploads', data=b'logbook').get_json()['digest']
+    
+    assert client.post('/api/final-reports', json={'report_file': report, 'logbook_file': '0' * 64}).status_code == 400
+    assert client.post('/api/final-reports', json={'report_file': report, 'logbook_file': logbook}).status_code == 201
+
+
+def test_return_form_with_insurance_upload(store, login):
+    client = login('john@student.com')
+    insurance = client.post('/api/uploads', data=b'insurance').get_json()['digest']
+    
+    response = client.post('/api/return-forms', json={
+        'company': 'Acme', 'location': 'Nairobi', 'supervisor_name': 'Bob',
+        'supervisor_email': 'bob@acme.com', 'insurance_form': insurance
+    })
+    
+    assert response.status_code == 201
+
+
+def test_save_stream_reads_in_chunks(store):
+    class Stream:
+        def __init__(self, size):
+            self.remaining = size
+            self.reads = []
+        
+        def read(self, n):
+            self.reads.append(n)
+            chunk = b'x' * min(n, self.remaining)
+            self.remaining -= len(chunk)
+            return chunk
+    
+    stream = Stream(10 * file_store_module.CHUNK_SIZE + 5)
+    digest, size = store.save_stream(stream)
+    
+    assert size == 10 * file_store_module.CHUNK_SIZE + 5
+    assert set(stream.reads) == {file_store_module.CHUNK_SIZE}
+
+
+def test_oversized_upload_leaves_nothing_behind(store):
+    with pytest.raises(UploadTooLarge):
+        store.save_stream(io.BytesIO(b'x' * 1000), max_size=100)
+    
+    assert stored_files(store) == []